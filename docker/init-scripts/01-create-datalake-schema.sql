@@ -14,7 +14,10 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- Datos crudos de homicidios desde la API
 -- ============================================================================
 CREATE TABLE IF NOT EXISTS raw_homicidios (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    -- Secuencia de ingesta densa (la asigna DataLakeLoader); marca de agua
+    -- de la carga incremental y source_id de fact_homicidios en el DWH
+    ingest_seq BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     fecha_hecho DATE,
     cod_depto INTEGER,
     departamento VARCHAR(100),
@@ -28,6 +31,7 @@ CREATE TABLE IF NOT EXISTS raw_homicidios (
 );
 
 COMMENT ON TABLE raw_homicidios IS 'Datos crudos de homicidios desde API Datos Abiertos';
+COMMENT ON COLUMN raw_homicidios.ingest_seq IS 'Secuencia de ingesta; el DWH lee los rangos (checkpoint, MAX]';
 
 -- Índices para optimizar consultas
 CREATE INDEX idx_raw_homicidios_fecha ON raw_homicidios(fecha_hecho);
@@ -7,6 +7,8 @@
 
 -- Crear extensiones necesarias
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Acceso al Data Lake desde el DWH (ETL set-based, ver dwh_fdw_loader.py)
+CREATE EXTENSION IF NOT EXISTS postgres_fdw;
 
 -- ============================================================================
 -- DIMENSIÓN: dim_fecha
@@ -113,23 +115,26 @@ CREATE TABLE IF NOT EXISTS fact_homicidios (
     cantidad INTEGER NOT NULL DEFAULT 1,
     
     -- Metadatos
-    source_id BIGINT,  -- ID del registro en Data Lake
+    source_id BIGINT,  -- raw_homicidios.ingest_seq del Data Lake
     loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
-    CONSTRAINT chk_fact_cantidad CHECK (cantidad > 0)
+    CONSTRAINT chk_fact_cantidad CHECK (cantidad > 0),
+    -- Un hecho por fila del Data Lake: recargas y rangos solapados no duplican
+    CONSTRAINT uq_fact_source_id UNIQUE (source_id)
 );
 
--- Índices para optimizar queries
+-- fecha_key: B-tree. El orden físico por fecha no está garantizado: la carga
+-- paralela (--workers) intercala particiones y la incremental agrega fechas
+-- atrasadas al final, así que un BRIN degradaría a leer casi toda la tabla.
+-- loaded_at sí crece con el orden de inserción: BRIN basta para filtrar las
+-- cargas recientes a una fracción del tamaño de un B-tree
 CREATE INDEX idx_fact_fecha ON fact_homicidios(fecha_key);
-CREATE INDEX idx_fact_depto ON fact_homicidios(cod_depto);
-CREATE INDEX idx_fact_mpio ON fact_homicidios(cod_mpio);
-CREATE INDEX idx_fact_sexo ON fact_homicidios(sexo_key);
-CREATE INDEX idx_fact_zona ON fact_homicidios(zona);
-CREATE INDEX idx_fact_loaded_at ON fact_homicidios(loaded_at);
+CREATE INDEX idx_fact_loaded_at_brin ON fact_homicidios USING brin (loaded_at);
 
--- Índices compuestos para queries comunes
-CREATE INDEX idx_fact_fecha_depto ON fact_homicidios(fecha_key, cod_depto);
-CREATE INDEX idx_fact_fecha_mpio ON fact_homicidios(fecha_key, cod_mpio);
+-- Índices cubrientes para agrupar por departamento / municipio (y filtrar por
+-- fecha dentro de ellos) con index-only scans, sin leer el heap por cantidad
+CREATE INDEX idx_fact_depto_fecha ON fact_homicidios(cod_depto, fecha_key) INCLUDE (cantidad);
+CREATE INDEX idx_fact_mpio_fecha ON fact_homicidios(cod_mpio, fecha_key) INCLUDE (sexo_key, cantidad);
 
 COMMENT ON TABLE fact_homicidios IS 'Tabla de hechos con eventos de homicidios';
 
@@ -143,6 +148,7 @@ CREATE TABLE IF NOT EXISTS etl_log (
     records_processed INTEGER NOT NULL,
     records_inserted INTEGER NOT NULL,
     records_updated INTEGER NOT NULL,
+    records_unchanged INTEGER DEFAULT 0,  -- Filas de dimensiones sin cambios (no reescritas)
     records_failed INTEGER DEFAULT 0,
     started_at TIMESTAMP NOT NULL,
     completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -156,6 +162,96 @@ CREATE INDEX idx_etl_log_process ON etl_log(process_name, completed_at DESC);
 
 COMMENT ON TABLE etl_log IS 'Log de auditoría de procesos ETL';
 
+-- ============================================================================
+-- Tabla: etl_checkpoint
+-- Última posición del Data Lake procesada por el ETL (marca de agua)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS etl_checkpoint (
+    source_name VARCHAR(100) PRIMARY KEY,
+    last_ingest_seq BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE etl_checkpoint IS 'Último ingest_seq del Data Lake cargado en el DWH, por tabla origen';
+
+-- ============================================================================
+-- Tabla: fact_rejects
+-- Filas de raw_homicidios que no se cargaron a fact_homicidios (llave de
+-- dimensión no resuelta), para revisarlas y reprocesarlas
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS fact_rejects (
+    source_id BIGINT PRIMARY KEY,  -- raw_homicidios.ingest_seq del Data Lake
+    reason VARCHAR(30) NOT NULL,
+    valor TEXT,  -- Valor de la llave natural no encontrada
+    attempts INTEGER NOT NULL DEFAULT 1,
+    rejected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT chk_reject_reason CHECK (reason IN ('fecha_desconocida', 'sexo_desconocido'))
+);
+
+CREATE INDEX idx_fact_rejects_rejected_at ON fact_rejects(rejected_at);
+
+COMMENT ON TABLE fact_rejects IS 'Homicidios rechazados por la carga de hechos, con el motivo';
+
+-- ============================================================================
+-- Tablas agregadas (agg_homicidios_*)
+-- Totales por grupo mantenidos por el ETL (src/data_warehouse/aggregates.py);
+-- las vistas v_homicidios_* leen de aquí en vez de agregar fact_homicidios
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_mes (
+    año SMALLINT NOT NULL,
+    mes SMALLINT NOT NULL,
+    nombre_mes VARCHAR(20) NOT NULL,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL,
+    PRIMARY KEY (año, mes)
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_departamento (
+    cod_depto INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_municipio (
+    cod_mpio INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_sexo (
+    sexo_key INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+-- Último homicidio_key sumado a cada tabla agregada
+CREATE TABLE IF NOT EXISTS agg_checkpoint (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_homicidio_key BIGINT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE agg_checkpoint IS 'Posición de fact_homicidios ya agregada por tabla agg_homicidios_*';
+
+-- ============================================================================
+-- Tabla: agg_diario_municipio
+-- Panel diario denso municipio × sexo (src/data_warehouse/daily_panel.py):
+-- una fila por cada municipio, sexo y fecha de las dimensiones, con 0 en los
+-- días sin homicidios. La llave primaria sirve los rangos por municipio
+-- (cod_mpio [, sexo_key] y rango de fechas).
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_diario_municipio (
+    cod_mpio INTEGER NOT NULL,
+    sexo_key INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    total_homicidios INTEGER NOT NULL DEFAULT 0,
+    total_victimas INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (cod_mpio, sexo_key, fecha)
+);
+
+COMMENT ON TABLE agg_diario_municipio IS 'Serie diaria densa de homicidios por municipio y sexo (incluye ceros)';
+
 -- ============================================================================
 -- Datos iniciales / Seeds
 -- ============================================================================
@@ -180,27 +276,24 @@ ON CONFLICT DO NOTHING;
 -- Vista: homicidios_por_mes
 CREATE OR REPLACE VIEW v_homicidios_por_mes AS
 SELECT 
-    f.año,
-    f.mes,
-    f.nombre_mes,
-    COUNT(*) as total_homicidios,
-    SUM(h.cantidad) as total_victimas
-FROM fact_homicidios h
-JOIN dim_fecha f ON h.fecha_key = f.fecha_key
-GROUP BY f.año, f.mes, f.nombre_mes
-ORDER BY f.año, f.mes;
+    a.año,
+    a.mes,
+    a.nombre_mes,
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_mes a
+ORDER BY a.año, a.mes;
 
 -- Vista: homicidios_por_departamento
 CREATE OR REPLACE VIEW v_homicidios_por_departamento AS
 SELECT 
     d.cod_depto,
     d.nom_depto,
-    COUNT(*) as total_homicidios,
-    SUM(h.cantidad) as total_victimas
-FROM fact_homicidios h
-JOIN dim_departamento d ON h.cod_depto = d.cod_depto
-GROUP BY d.cod_depto, d.nom_depto
-ORDER BY total_homicidios DESC;
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_departamento a
+JOIN dim_departamento d ON a.cod_depto = d.cod_depto
+ORDER BY a.total_homicidios DESC;
 
 -- Vista: homicidios_por_municipio
 CREATE OR REPLACE VIEW v_homicidios_por_municipio AS
@@ -208,24 +301,22 @@ SELECT
     m.cod_mpio,
     m.nom_mpio,
     d.nom_depto,
-    COUNT(*) as total_homicidios,
-    SUM(h.cantidad) as total_victimas
-FROM fact_homicidios h
-JOIN dim_municipio m ON h.cod_mpio = m.cod_mpio
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_municipio a
+JOIN dim_municipio m ON a.cod_mpio = m.cod_mpio
 JOIN dim_departamento d ON m.cod_depto = d.cod_depto
-GROUP BY m.cod_mpio, m.nom_mpio, d.nom_depto
-ORDER BY total_homicidios DESC;
+ORDER BY a.total_homicidios DESC;
 
 -- Vista: homicidios_por_sexo
 CREATE OR REPLACE VIEW v_homicidios_por_sexo AS
 SELECT 
     s.sexo,
-    COUNT(*) as total_homicidios,
-    SUM(h.cantidad) as total_victimas
-FROM fact_homicidios h
-JOIN dim_sexo s ON h.sexo_key = s.sexo_key
-GROUP BY s.sexo
-ORDER BY total_homicidios DESC;
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_sexo a
+JOIN dim_sexo s ON a.sexo_key = s.sexo_key
+ORDER BY a.total_homicidios DESC;
 
 -- ============================================================================
 -- Fin del script de inicialización del Data Warehouse
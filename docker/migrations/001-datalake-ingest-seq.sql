@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Migración 001 (Data Lake): raw_homicidios.ingest_seq
+-- ============================================================================
+-- Agrega la secuencia de ingesta que usa el DWH como marca de agua de la
+-- carga incremental. Las filas existentes se numeran por orden de carga.
+--
+-- Ejecutar una vez sobre instalaciones creadas antes de este cambio:
+--   docker exec -i ml-homicidios-datalake psql -U datalake_user -d homicidios_datalake \
+--     < docker/migrations/001-datalake-ingest-seq.sql
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE raw_homicidios ADD COLUMN IF NOT EXISTS ingest_seq BIGINT;
+
+UPDATE raw_homicidios r
+SET ingest_seq = n.seq
+FROM (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY loaded_at, id) AS seq
+    FROM raw_homicidios
+) n
+WHERE r.id = n.id
+  AND r.ingest_seq IS NULL;
+
+ALTER TABLE raw_homicidios ALTER COLUMN ingest_seq SET NOT NULL;
+ALTER TABLE raw_homicidios ALTER COLUMN ingest_seq ADD GENERATED BY DEFAULT AS IDENTITY;
+
+SELECT setval(
+    pg_get_serial_sequence('raw_homicidios', 'ingest_seq'),
+    COALESCE(MAX(ingest_seq), 0) + 1,
+    false
+)
+FROM raw_homicidios;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_raw_homicidios_ingest_seq ON raw_homicidios(ingest_seq);
+
+COMMENT ON COLUMN raw_homicidios.ingest_seq IS 'Secuencia de ingesta; el DWH lee los rangos (checkpoint, MAX]';
+
+COMMIT;
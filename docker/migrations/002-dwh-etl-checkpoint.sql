@@ -0,0 +1,19 @@
+-- ============================================================================
+-- Migración 002 (Data Warehouse): tabla etl_checkpoint
+-- ============================================================================
+-- Guarda el último raw_homicidios.ingest_seq cargado en fact_homicidios.
+-- Sin fila de checkpoint, la primera carga incremental la deriva de
+-- MAX(fact_homicidios.loaded_at) (criterio anterior) y la guarda.
+--
+-- Ejecutar una vez, después de 001-datalake-ingest-seq.sql:
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/002-dwh-etl-checkpoint.sql
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS etl_checkpoint (
+    source_name VARCHAR(100) PRIMARY KEY,
+    last_ingest_seq BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE etl_checkpoint IS 'Último ingest_seq del Data Lake cargado en el DWH, por tabla origen';
@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Migración 003 (Data Lake): ingest_seq como llave primaria de raw_homicidios
+-- ============================================================================
+-- La llave primaria pasa del UUID aleatorio (inserciones dispersas en el
+-- índice) a ingest_seq (inserciones secuenciales, 8 bytes). El UUID se
+-- conserva como columna. Requiere 001-datalake-ingest-seq.sql.
+--
+--   docker exec -i ml-homicidios-datalake psql -U datalake_user -d homicidios_datalake \
+--     < docker/migrations/003-datalake-ingest-seq-pk.sql
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE raw_homicidios DROP CONSTRAINT IF EXISTS raw_homicidios_pkey;
+ALTER TABLE raw_homicidios ADD CONSTRAINT raw_homicidios_pkey PRIMARY KEY (ingest_seq);
+ALTER TABLE raw_homicidios ALTER COLUMN id SET NOT NULL;
+
+DROP INDEX IF EXISTS idx_raw_homicidios_ingest_seq;
+
+COMMIT;
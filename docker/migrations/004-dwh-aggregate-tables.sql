@@ -0,0 +1,105 @@
+-- ============================================================================
+-- Migración 004 (Data Warehouse): tablas agregadas para las vistas v_homicidios_*
+-- ============================================================================
+-- Crea las tablas agg_homicidios_* y agg_checkpoint y redefine las vistas
+-- para leer de ellas. Las tablas quedan vacías hasta la siguiente carga del
+-- ETL (sin checkpoint, el primer refresco las recalcula completas), o:
+--   python -c "from src.data_warehouse.dwh_etl_loader import DWHETLLoader; DWHETLLoader().aggregates.refresh(full=True)"
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/004-dwh-aggregate-tables.sql
+-- ============================================================================
+
+BEGIN;
+
+-- ============================================================================
+-- Tablas agregadas (agg_homicidios_*)
+-- Totales por grupo mantenidos por el ETL (src/data_warehouse/aggregates.py);
+-- las vistas v_homicidios_* leen de aquí en vez de agregar fact_homicidios
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_mes (
+    año SMALLINT NOT NULL,
+    mes SMALLINT NOT NULL,
+    nombre_mes VARCHAR(20) NOT NULL,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL,
+    PRIMARY KEY (año, mes)
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_departamento (
+    cod_depto INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_municipio (
+    cod_mpio INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_homicidios_por_sexo (
+    sexo_key INTEGER PRIMARY KEY,
+    total_homicidios BIGINT NOT NULL,
+    total_victimas BIGINT NOT NULL
+);
+
+-- Último homicidio_key sumado a cada tabla agregada
+CREATE TABLE IF NOT EXISTS agg_checkpoint (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_homicidio_key BIGINT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE agg_checkpoint IS 'Posición de fact_homicidios ya agregada por tabla agg_homicidios_*';
+
+-- ============================================================================
+-- Vistas (mismas columnas, ahora sobre las tablas agregadas)
+-- ============================================================================
+
+-- Vista: homicidios_por_mes
+CREATE OR REPLACE VIEW v_homicidios_por_mes AS
+SELECT 
+    a.año,
+    a.mes,
+    a.nombre_mes,
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_mes a
+ORDER BY a.año, a.mes;
+
+-- Vista: homicidios_por_departamento
+CREATE OR REPLACE VIEW v_homicidios_por_departamento AS
+SELECT 
+    d.cod_depto,
+    d.nom_depto,
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_departamento a
+JOIN dim_departamento d ON a.cod_depto = d.cod_depto
+ORDER BY a.total_homicidios DESC;
+
+-- Vista: homicidios_por_municipio
+CREATE OR REPLACE VIEW v_homicidios_por_municipio AS
+SELECT 
+    m.cod_mpio,
+    m.nom_mpio,
+    d.nom_depto,
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_municipio a
+JOIN dim_municipio m ON a.cod_mpio = m.cod_mpio
+JOIN dim_departamento d ON m.cod_depto = d.cod_depto
+ORDER BY a.total_homicidios DESC;
+
+-- Vista: homicidios_por_sexo
+CREATE OR REPLACE VIEW v_homicidios_por_sexo AS
+SELECT 
+    s.sexo,
+    a.total_homicidios,
+    a.total_victimas
+FROM agg_homicidios_por_sexo a
+JOIN dim_sexo s ON a.sexo_key = s.sexo_key
+ORDER BY a.total_homicidios DESC;
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Migración 005 (Data Warehouse): panel diario agg_diario_municipio
+-- ============================================================================
+-- Requiere 004-dwh-aggregate-tables.sql (agg_checkpoint). El panel se llena
+-- en la siguiente carga del ETL (sin checkpoint, se calcula completo).
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/005-dwh-daily-panel.sql
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS agg_diario_municipio (
+    cod_mpio INTEGER NOT NULL,
+    sexo_key INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    total_homicidios INTEGER NOT NULL DEFAULT 0,
+    total_victimas INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (cod_mpio, sexo_key, fecha)
+);
+
+COMMENT ON TABLE agg_diario_municipio IS 'Serie diaria densa de homicidios por municipio y sexo (incluye ceros)';
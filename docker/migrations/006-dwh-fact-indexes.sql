@@ -0,0 +1,38 @@
+-- ============================================================================
+-- Migración 006 (Data Warehouse): índices de fact_homicidios
+-- ============================================================================
+-- Reemplaza los ocho índices B-tree de fact_homicidios (varios redundantes:
+-- idx_fact_fecha es prefijo de idx_fact_fecha_depto; sexo y zona tienen muy
+-- pocos valores) por:
+--   - BRIN sobre fecha_key y loaded_at (columnas en orden de carga)
+--   - B-tree cubrientes (cod_depto, fecha_key) y (cod_mpio, fecha_key) que
+--     incluyen cantidad, para agrupar sin leer el heap
+--
+-- Medir antes y después con scripts/benchmark_indexes.py. Los índices se
+-- crean con CONCURRENTLY para no bloquear la carga: ejecutar fuera de una
+-- transacción (psql sin -1).
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/006-dwh-fact-indexes.sql
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_fecha_brin
+    ON fact_homicidios USING brin (fecha_key) WITH (pages_per_range = 32);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_loaded_at_brin
+    ON fact_homicidios USING brin (loaded_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_depto_fecha
+    ON fact_homicidios (cod_depto, fecha_key) INCLUDE (cantidad);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_mpio_fecha
+    ON fact_homicidios (cod_mpio, fecha_key) INCLUDE (sexo_key, cantidad);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_fecha;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_depto;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_mpio;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_sexo;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_zona;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_loaded_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_fecha_depto;
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_fecha_mpio;
+
+-- Marcar páginas visibles para que los index-only scans no lean el heap
+VACUUM (ANALYZE) fact_homicidios;
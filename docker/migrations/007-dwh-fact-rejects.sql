@@ -0,0 +1,25 @@
+-- ============================================================================
+-- Migración 007 (Data Warehouse): tabla fact_rejects
+-- ============================================================================
+-- Filas de raw_homicidios que la carga de hechos no pudo cargar (fecha o sexo
+-- sin llave en las dimensiones). Cada carga incremental las reintenta después
+-- de actualizar las dimensiones; etl_log.records_failed cuenta las rechazadas
+-- en cada ejecución.
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/007-dwh-fact-rejects.sql
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS fact_rejects (
+    source_id BIGINT PRIMARY KEY,  -- raw_homicidios.ingest_seq del Data Lake
+    reason VARCHAR(30) NOT NULL,
+    valor TEXT,  -- Valor de la llave natural no encontrada
+    attempts INTEGER NOT NULL DEFAULT 1,
+    rejected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT chk_reject_reason CHECK (reason IN ('fecha_desconocida', 'sexo_desconocido'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_fact_rejects_rejected_at ON fact_rejects(rejected_at);
+
+COMMENT ON TABLE fact_rejects IS 'Homicidios rechazados por la carga de hechos, con el motivo';
@@ -0,0 +1,33 @@
+-- ============================================================================
+-- Migración 008 (Data Warehouse): source_id único en fact_homicidios
+-- ============================================================================
+-- Elimina los hechos duplicados por recargas (mismo source_id, se conserva
+-- el de menor homicidio_key) y crea la constraint uq_fact_source_id, que la
+-- carga usa como ON CONFLICT (source_id) DO NOTHING.
+--
+-- Las tablas agregadas y el panel diario incluían los duplicados: se borra
+-- agg_checkpoint para que el siguiente refresco las recalcule completas, o
+-- de inmediato:
+--   python -c "from src.data_warehouse.dwh_etl_loader import DWHETLLoader; l = DWHETLLoader(); l.aggregates.refresh(full=True); l.daily_panel.refresh(full=True)"
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/008-dwh-fact-source-id-unique.sql
+-- ============================================================================
+
+BEGIN;
+
+-- Sin cargas concurrentes mientras se deduplica
+LOCK TABLE fact_homicidios IN SHARE ROW EXCLUSIVE MODE;
+
+DELETE FROM fact_homicidios f
+USING fact_homicidios d
+WHERE f.source_id = d.source_id
+  AND f.homicidio_key > d.homicidio_key;
+
+ALTER TABLE fact_homicidios ADD CONSTRAINT uq_fact_source_id UNIQUE (source_id);
+
+DELETE FROM agg_checkpoint;
+
+COMMIT;
+
+ANALYZE fact_homicidios;
@@ -0,0 +1,11 @@
+-- ============================================================================
+-- Migración 009 (Data Warehouse): etl_log.records_unchanged
+-- ============================================================================
+-- Los upserts de dimensiones solo reescriben filas nuevas o con cambios;
+-- etl_log separa insertadas, actualizadas y sin cambios.
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/009-dwh-etl-log-unchanged.sql
+-- ============================================================================
+
+ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS records_unchanged INTEGER DEFAULT 0;
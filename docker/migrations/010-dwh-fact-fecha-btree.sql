@@ -0,0 +1,22 @@
+-- ============================================================================
+-- Migración 010 (Data Warehouse): B-tree sobre fact_homicidios.fecha_key
+-- ============================================================================
+-- La migración 006 indexó fecha_key con BRIN asumiendo que los hechos quedan
+-- en el disco en orden de fecha. No es así: la carga paralela (--workers)
+-- intercala las particiones y la incremental agrega fechas atrasadas al
+-- final de la tabla, con lo que cada rango de páginas cubre casi todas las
+-- fechas y el BRIN deja de descartar páginas. Se vuelve a un B-tree, que no
+-- depende del orden físico. loaded_at mantiene su BRIN (crece con cada carga).
+--
+-- Ejecutar fuera de una transacción (psql sin -1):
+--
+--   docker exec -i ml-homicidios-datawarehouse psql -U dw_user -d homicidios_dw \
+--     < docker/migrations/010-dwh-fact-fecha-btree.sql
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_fecha
+    ON fact_homicidios (fecha_key);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_fecha_brin;
+
+ANALYZE fact_homicidios;
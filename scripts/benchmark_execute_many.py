@@ -0,0 +1,172 @@
+"""
+Benchmark de estrategias de inserción por lotes.
+
+Compara, sobre una tabla temporal con la forma de fact_homicidios:
+- executemany de psycopg2 (comportamiento anterior: una sentencia por fila)
+- sentencia preparada + EXECUTE agrupados (execute_prepared)
+- INSERT VALUES multi-fila por página (execute_many con ON CONFLICT)
+- COPY FROM STDIN (execute_many sin cláusulas adicionales)
+
+Reporta viajes de ida y vuelta al servidor (sentencias enviadas), latencia
+total y filas por segundo.
+
+Uso:
+    python scripts/benchmark_execute_many.py --rows 20000 --page-size 1000
+    python scripts/benchmark_execute_many.py --target datalake
+"""
+
+import sys
+import time
+import argparse
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psycopg2.extensions
+
+from src.data_ingestion.batch_execution import copy_rows, execute_values_batched, parse_insert
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.data_ingestion.prepared_statements import PreparedStatementCache
+from src.data_warehouse.dwh_connection import DWHConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BENCH_TABLE = "bench_execute_many"
+COLUMNS = "fecha_key, cod_depto, cod_mpio, sexo_key, zona, cantidad, source_id"
+INSERT_PLAIN = f"INSERT INTO {BENCH_TABLE} ({COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s)"
+INSERT_CONFLICT = INSERT_PLAIN + " ON CONFLICT DO NOTHING"
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """Cursor que cuenta las sentencias enviadas al servidor."""
+
+    round_trips = 0
+
+    def execute(self, query, vars=None):
+        self.round_trips += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        self.round_trips += len(vars_list)
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        self.round_trips += 1
+        return super().copy_expert(sql, file, size)
+
+
+def generar_filas(n: int):
+    """Generar filas sintéticas con la forma de fact_homicidios."""
+    rnd = random.Random(42)
+    return [
+        (
+            rnd.randint(1, 7000),
+            rnd.randint(1, 99),
+            rnd.randint(1000, 99999),
+            rnd.randint(1, 3),
+            rnd.choice(["URBANA", "RURAL", None]),
+            1,
+            i
+        )
+        for i in range(n)
+    ]
+
+
+def ejecutar_estrategias(db: DatabaseConnection, rows, page_size: int):
+    """Ejecutar cada estrategia sobre la tabla de benchmark y medir."""
+    statement_conflict = parse_insert(INSERT_CONFLICT)
+    statement_plain = parse_insert(INSERT_PLAIN)
+
+    estrategias = [
+        ("executemany (antes)", lambda cur: cur.executemany(INSERT_PLAIN, rows)),
+        ("prepared + EXECUTE batch", lambda cur: PreparedStatementCache().execute_batch(
+            cur, INSERT_PLAIN, rows, page_size=page_size)),
+        ("VALUES multi-fila", lambda cur: execute_values_batched(
+            cur, statement_conflict, rows, page_size)),
+        ("COPY", lambda cur: copy_rows(
+            cur, statement_plain.table, statement_plain.columns, rows)),
+    ]
+
+    resultados = []
+
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE UNLOGGED TABLE IF NOT EXISTS {BENCH_TABLE} (
+                    fecha_key INTEGER, cod_depto INTEGER, cod_mpio INTEGER,
+                    sexo_key INTEGER, zona VARCHAR(50), cantidad INTEGER,
+                    source_id BIGINT
+                )
+            """)
+        conn.commit()
+
+        try:
+            for nombre, estrategia in estrategias:
+                with conn.cursor() as cur:
+                    cur.execute(f"TRUNCATE {BENCH_TABLE}")
+                conn.commit()
+
+                cur = conn.cursor(cursor_factory=CountingCursor)
+                inicio = time.perf_counter()
+                estrategia(cur)
+                conn.commit()
+                duracion = time.perf_counter() - inicio
+                viajes = cur.round_trips
+                cur.close()
+
+                resultados.append((nombre, viajes, duracion))
+        finally:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+            conn.commit()
+
+    return resultados
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de inserción por lotes (executemany vs VALUES vs COPY)"
+    )
+
+    parser.add_argument("--rows", type=int, default=20000, help="Filas a insertar (default: 20000)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Filas por página (default: 1000)")
+    parser.add_argument(
+        "--target",
+        choices=["dwh", "datalake"],
+        default="dwh",
+        help="Base de datos donde ejecutar (default: dwh)"
+    )
+
+    args = parser.parse_args()
+
+    db = DWHConnection() if args.target == "dwh" else DatabaseConnection()
+    rows = generar_filas(args.rows)
+
+    logger.info("=" * 70)
+    logger.info(f"BENCHMARK execute_many: {args.rows:,} filas, page_size={args.page_size} ({args.target})")
+    logger.info("=" * 70)
+
+    try:
+        resultados = ejecutar_estrategias(db, rows, args.page_size)
+    finally:
+        db.close_all_connections()
+
+    base = resultados[0][2]
+    logger.info(f"{'Estrategia':28} | {'Viajes':>8} | {'Latencia':>10} | {'Filas/s':>10} | {'Speedup':>7}")
+    logger.info("-" * 75)
+    for nombre, viajes, duracion in resultados:
+        logger.info(
+            f"{nombre:28} | {viajes:8,} | {duracion:9.3f}s | "
+            f"{args.rows / duracion:10,.0f} | {base / duracion:6.1f}x"
+        )
+    logger.info("=" * 70)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
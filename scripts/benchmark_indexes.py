@@ -0,0 +1,248 @@
+"""
+Benchmark de conjuntos de índices para fact_homicidios.
+
+Compara, sobre una tabla de benchmark con la forma de fact_homicidios y
+filas sintéticas en orden de fecha (como las deja la carga inicial):
+- antes: los ocho B-tree originales (fecha, depto, mpio, sexo, zona,
+  loaded_at, fecha+depto, fecha+mpio)
+- despues: B-tree sobre fecha_key, BRIN sobre loaded_at y B-tree cubrientes
+  (cod_depto, fecha_key) y (cod_mpio, fecha_key) con INCLUDE cantidad
+
+Para cada conjunto reporta tiempo de creación y tamaño de los índices,
+throughput de inserción (VALUES con ON CONFLICT como la carga incremental, y
+COPY como la carga bulk) y latencia (mediana) de las consultas que agrupan
+los hechos: refresco completo de los agregados, filtros por rango de fechas,
+serie de un municipio y hechos recientes por loaded_at.
+
+Uso:
+    python scripts/benchmark_indexes.py --rows 1000000 --insert-rows 20000
+"""
+
+import sys
+import time
+import argparse
+import random
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_ingestion.batch_execution import copy_rows, execute_values_batched, parse_insert
+from src.data_warehouse.dwh_connection import DWHConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BENCH_TABLE = "bench_fact_indexes"
+DIAS = 7000
+COLUMNS = ("fecha_key", "cod_depto", "cod_mpio", "sexo_key", "zona", "cantidad", "source_id", "loaded_at")
+INSERT_CONFLICT = (
+    f"INSERT INTO {BENCH_TABLE} ({', '.join(COLUMNS)}) "
+    f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING"
+)
+
+INDEX_SETS = {
+    'antes': [
+        f"CREATE INDEX ON {BENCH_TABLE} (fecha_key)",
+        f"CREATE INDEX ON {BENCH_TABLE} (cod_depto)",
+        f"CREATE INDEX ON {BENCH_TABLE} (cod_mpio)",
+        f"CREATE INDEX ON {BENCH_TABLE} (sexo_key)",
+        f"CREATE INDEX ON {BENCH_TABLE} (zona)",
+        f"CREATE INDEX ON {BENCH_TABLE} (loaded_at)",
+        f"CREATE INDEX ON {BENCH_TABLE} (fecha_key, cod_depto)",
+        f"CREATE INDEX ON {BENCH_TABLE} (fecha_key, cod_mpio)",
+    ],
+    'despues': [
+        f"CREATE INDEX ON {BENCH_TABLE} (fecha_key)",
+        f"CREATE INDEX ON {BENCH_TABLE} USING brin (loaded_at)",
+        f"CREATE INDEX ON {BENCH_TABLE} (cod_depto, fecha_key) INCLUDE (cantidad)",
+        f"CREATE INDEX ON {BENCH_TABLE} (cod_mpio, fecha_key) INCLUDE (sexo_key, cantidad)",
+    ],
+}
+
+QUERIES = {
+    'agg por departamento': f"""
+        SELECT cod_depto, COUNT(*), SUM(cantidad) FROM {BENCH_TABLE} GROUP BY cod_depto
+    """,
+    'agg por municipio': f"""
+        SELECT cod_mpio, COUNT(*), SUM(cantidad) FROM {BENCH_TABLE} GROUP BY cod_mpio
+    """,
+    'mes por departamento': f"""
+        SELECT cod_depto, COUNT(*), SUM(cantidad) FROM {BENCH_TABLE}
+        WHERE fecha_key BETWEEN {DIAS // 2} AND {DIAS // 2 + 30}
+        GROUP BY cod_depto
+    """,
+    'año de un departamento': f"""
+        SELECT fecha_key, SUM(cantidad) FROM {BENCH_TABLE}
+        WHERE cod_depto = 5 AND fecha_key BETWEEN {DIAS - 365} AND {DIAS}
+        GROUP BY fecha_key
+    """,
+    'serie de un municipio': f"""
+        SELECT sexo_key, fecha_key, COUNT(*), SUM(cantidad) FROM {BENCH_TABLE}
+        WHERE cod_mpio = 5001
+        GROUP BY sexo_key, fecha_key
+    """,
+    'recientes por loaded_at': f"""
+        SELECT COUNT(*) FROM {BENCH_TABLE}
+        WHERE loaded_at >= (SELECT TIMESTAMP '2000-01-01' + {DIAS - 7} * INTERVAL '1 day')
+    """,
+}
+
+
+def generar_filas(n: int, desde_fecha: int, seed: int):
+    """Generar filas sintéticas de fechas posteriores (como una carga incremental)."""
+    rnd = random.Random(seed)
+    base = datetime(2000, 1, 1)
+    return [
+        (
+            desde_fecha + i * 30 // n,
+            rnd.randint(1, 33),
+            rnd.choice((5001, 11001, 76001)) if rnd.random() < 0.3 else rnd.randint(1000, 99999),
+            rnd.randint(1, 3),
+            rnd.choice(["URBANA", "RURAL", None]),
+            rnd.randint(1, 3),
+            None,
+            base + timedelta(days=desde_fecha + i * 30 // n),
+        )
+        for i in range(n)
+    ]
+
+
+def crear_tabla(conn, rows: int):
+    """Crear la tabla de benchmark con `rows` hechos en orden de fecha."""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cur.execute(f"""
+            CREATE TABLE {BENCH_TABLE} (
+                homicidio_key BIGSERIAL PRIMARY KEY,
+                fecha_key INTEGER NOT NULL, cod_depto INTEGER NOT NULL,
+                cod_mpio INTEGER NOT NULL, sexo_key INTEGER NOT NULL,
+                zona VARCHAR(50), cantidad INTEGER NOT NULL DEFAULT 1,
+                source_id BIGINT, loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute("SELECT setseed(0.42)")
+        cur.execute(f"""
+            INSERT INTO {BENCH_TABLE} ({', '.join(COLUMNS)})
+            SELECT
+                1 + (i * {DIAS}::bigint / %(rows)s)::int,
+                1 + (random() * 32)::int,
+                CASE WHEN random() < 0.3 THEN (ARRAY[5001, 11001, 76001])[1 + (random() * 2)::int]
+                     ELSE 1000 + (random() * 98999)::int END,
+                1 + (random() * 2)::int,
+                (ARRAY['URBANA', 'RURAL', NULL])[1 + (random() * 2)::int],
+                1 + (random() * 2)::int,
+                i,
+                TIMESTAMP '2000-01-01' + (i * {DIAS}::bigint / %(rows)s) * INTERVAL '1 day'
+            FROM generate_series(1, %(rows)s) AS i
+        """, {'rows': rows})
+    conn.commit()
+
+
+def vacuum_analyze(conn):
+    """VACUUM ANALYZE (fuera de transacción) para habilitar index-only scans."""
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"VACUUM (ANALYZE) {BENCH_TABLE}")
+    finally:
+        conn.autocommit = False
+
+
+def medir_conjunto(conn, nombre: str, rows: int, insert_rows: int, repeticiones: int):
+    """Crear la tabla con un conjunto de índices y medir inserción y consultas."""
+    resultado = {}
+    crear_tabla(conn, rows)
+
+    inicio = time.perf_counter()
+    with conn.cursor() as cur:
+        for definition in INDEX_SETS[nombre]:
+            cur.execute(definition)
+    conn.commit()
+    resultado['creación índices (s)'] = time.perf_counter() - inicio
+
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT pg_indexes_size('{BENCH_TABLE}') - pg_relation_size('{BENCH_TABLE}_pkey')")
+        resultado['tamaño índices (MB)'] = cur.fetchone()[0] / (1024 * 1024)
+    conn.commit()
+    vacuum_analyze(conn)
+
+    # Inserción: mismas filas para ambos conjuntos (semilla fija)
+    statement = parse_insert(INSERT_CONFLICT)
+    for estrategia, seed in (("VALUES", 1), ("COPY", 2)):
+        filas = generar_filas(insert_rows, DIAS + 1, seed)
+        with conn.cursor() as cur:
+            inicio = time.perf_counter()
+            if estrategia == "VALUES":
+                execute_values_batched(cur, statement, filas, 1000)
+            else:
+                copy_rows(cur, BENCH_TABLE, COLUMNS, filas)
+            conn.commit()
+        resultado[f"insert {estrategia} (filas/s)"] = insert_rows / (time.perf_counter() - inicio)
+
+    vacuum_analyze(conn)
+
+    with conn.cursor() as cur:
+        for consulta, sql in QUERIES.items():
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                cur.execute(sql)
+                cur.fetchall()
+                tiempos.append(time.perf_counter() - inicio)
+            resultado[f"{consulta} (ms)"] = statistics.median(tiempos) * 1000
+    conn.commit()
+
+    return resultado
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de índices de fact_homicidios (B-tree originales vs reducidos + cubrientes)"
+    )
+
+    parser.add_argument("--rows", type=int, default=1000000, help="Hechos en la tabla (default: 1000000)")
+    parser.add_argument("--insert-rows", type=int, default=20000, help="Filas a insertar (default: 20000)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Ejecuciones por consulta (default: 5)")
+
+    args = parser.parse_args()
+
+    db = DWHConnection()
+
+    logger.info("=" * 70)
+    logger.info(f"BENCHMARK índices fact_homicidios: {args.rows:,} hechos, {args.insert_rows:,} inserciones")
+    logger.info("=" * 70)
+
+    resultados = {}
+    try:
+        with db.get_connection() as conn:
+            try:
+                for nombre in INDEX_SETS:
+                    logger.info(f"Midiendo conjunto '{nombre}' ({len(INDEX_SETS[nombre])} índices)...")
+                    resultados[nombre] = medir_conjunto(
+                        conn, nombre, args.rows, args.insert_rows, args.repeticiones
+                    )
+            finally:
+                with conn.cursor() as cur:
+                    cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+                conn.commit()
+    finally:
+        db.close_all_connections()
+
+    antes, despues = resultados['antes'], resultados['despues']
+    logger.info(f"{'Métrica':36} | {'Antes':>10} | {'Después':>10} | {'Cambio':>7}")
+    logger.info("-" * 73)
+    for metrica in antes:
+        logger.info(
+            f"{metrica:36} | {antes[metrica]:10,.2f} | {despues[metrica]:10,.2f} | "
+            f"{despues[metrica] / antes[metrica]:6.2f}x"
+        )
+    logger.info("=" * 70)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
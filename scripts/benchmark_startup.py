@@ -0,0 +1,135 @@
+"""
+Benchmark de arranque de los scripts de cron.
+
+Cada entrada del crontab arranca un intérprete nuevo, así que el costo de
+importar los módulos del proyecto se paga en cada ejecución. Este script
+importa cada script N veces con `python -X importtime` en un proceso limpio
+y reporta el tiempo de importación (mediana), el tiempo total del proceso
+y los paquetes más pesados.
+
+Uso:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 10 --scripts health_check catchup_check
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_SCRIPTS = ["health_check", "catchup_check", "catchup_check_dwh", "load_datawarehouse"]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Parsear la salida de -X importtime.
+
+    Returns:
+        Diccionario {módulo: tiempo acumulado en µs} (nivel superior de la
+        última importación de cada módulo)
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, cum, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        cumulative[name] = int(cum)
+    return cumulative
+
+
+def medir_script(script: str) -> Tuple[float, float, Dict[str, int]]:
+    """
+    Importar un script en un intérprete nuevo con -X importtime.
+
+    Returns:
+        Tupla (ms de importación del script, ms del proceso completo,
+        tiempos acumulados por módulo en µs)
+    """
+    code = (
+        "import sys; "
+        f"sys.path[:0] = [{str(PROJECT_ROOT)!r}, {str(PROJECT_ROOT / 'scripts')!r}]; "
+        f"import {script}"
+    )
+
+    inicio = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT
+    )
+    total_ms = (time.perf_counter() - inicio) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Error importando {script}: {result.stderr.strip().splitlines()[-1]}")
+
+    modules = parse_importtime(result.stderr)
+    return modules.get(script, 0) / 1000, total_ms, modules
+
+
+def heaviest_modules(modules: Dict[str, int], script: str, top: int = 5) -> List[Tuple[str, int]]:
+    """Paquetes externos con mayor tiempo acumulado (sin el proyecto ni el script)."""
+    roots: Dict[str, int] = {}
+    for name, cum in modules.items():
+        root = name.split(".")[0]
+        if root in ("src", "site", "encodings", script):
+            continue
+        roots[root] = max(roots.get(root, 0), cum)
+    return sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de arranque (python -X importtime) de los scripts de cron"
+    )
+
+    parser.add_argument("--runs", type=int, default=5, help="Ejecuciones por script (default: 5)")
+    parser.add_argument(
+        "--scripts",
+        nargs="+",
+        default=DEFAULT_SCRIPTS,
+        help="Scripts de scripts/ a medir (sin .py)"
+    )
+
+    args = parser.parse_args()
+
+    logger.info("=" * 70)
+    logger.info(f"BENCHMARK DE ARRANQUE ({args.runs} ejecuciones por script)")
+    logger.info("=" * 70)
+    logger.info(f"{'Script':22} | {'Import (mediana)':>16} | {'Proceso (mediana)':>17} | Pydantic cargado")
+    logger.info("-" * 80)
+
+    for script in args.scripts:
+        import_times, total_times = [], []
+        modules: Dict[str, int] = {}
+
+        for _ in range(args.runs):
+            import_ms, total_ms, modules = medir_script(script)
+            import_times.append(import_ms)
+            total_times.append(total_ms)
+
+        settings_loaded = "pydantic_settings" in modules
+        logger.info(
+            f"{script:22} | {statistics.median(import_times):13.1f} ms | "
+            f"{statistics.median(total_times):14.1f} ms | {'sí' if settings_loaded else 'no'}"
+        )
+        pesados = ", ".join(f"{name} {cum / 1000:.1f}ms" for name, cum in heaviest_modules(modules, script))
+        logger.info(f"{'':22}   ↳ {pesados}")
+
+    logger.info("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,7 @@ def verificar_cargas_pendientes_dwh() -> bool:
                 process_name
             FROM etl_log
             WHERE status = 'success'
+              AND process_name NOT LIKE '%:%'  -- Pasos del DAG ('incremental_load:dim_sexo')
             GROUP BY process_name
             ORDER BY MAX(completed_at) DESC
             LIMIT 1
@@ -10,7 +10,9 @@ from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.data_ingestion.query_instrumentation import query_stats
 from src.data_warehouse.dwh_etl_loader import DWHETLLoader
+from src.data_warehouse.dwh_fdw_loader import DWHFdwLoader
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -34,21 +36,71 @@ def main():
         help="Ejecutar carga incremental (solo registros nuevos)"
     )
     
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Reconstruir todo en un esquema sombra (modo bulk) e intercambiarlo con las tablas vivas"
+    )
+    
+    parser.add_argument(
+        "--fdw",
+        action="store_true",
+        help="Transformar dentro de PostgreSQL (postgres_fdw, INSERT ... SELECT) sin pasar filas por Python"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Procesos para cargar fact_homicidios en --initial o --rebuild (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--partition",
+        choices=["year", "month"],
+        default="year",
+        help="Partición de raw_homicidios por fecha_hecho para --workers (default: year)"
+    )
+    
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="En --initial: cargar hechos sin índices secundarios ni FKs y reconstruirlos al final"
+    )
+    
     args = parser.parse_args()
     
     # Validar argumentos
-    if not args.initial and not args.incremental:
-        parser.error("Debes especificar --initial o --incremental")
+    modes = [args.initial, args.incremental, args.rebuild]
+    
+    if not any(modes):
+        parser.error("Debes especificar --initial, --incremental o --rebuild")
+    
+    if sum(modes) > 1:
+        parser.error("Usa solo uno de --initial, --incremental o --rebuild")
     
-    if args.initial and args.incremental:
-        parser.error("No puedes usar --initial y --incremental al mismo tiempo")
+    if args.workers < 1:
+        parser.error("--workers debe ser mayor o igual a 1")
+    
+    if args.workers > 1 and not (args.initial or args.rebuild):
+        parser.error("--workers solo aplica a --initial o --rebuild")
+    
+    if args.bulk and not args.initial:
+        parser.error("--bulk solo aplica a --initial (--rebuild siempre carga en modo bulk)")
+    
+    if args.workers > 1 and args.fdw:
+        parser.error("--workers no aplica a --fdw (la carga es una sola sentencia)")
     
     # Crear loader
     logger.info("=" * 70)
     logger.info("INICIANDO ETL DEL DATA WAREHOUSE")
     logger.info("=" * 70)
     
-    loader = DWHETLLoader()
+    if args.fdw:
+        logger.info("Modo set-based: Data Lake adjunto vía postgres_fdw")
+        loader = DWHFdwLoader()
+    else:
+        loader = DWHETLLoader()
     
     # Verificar conexiones
     logger.info("Verificando conexiones...")
@@ -67,7 +119,16 @@ def main():
         # Ejecutar carga según argumentos
         if args.initial:
             logger.info("🔄 Ejecutando CARGA INICIAL...")
-            results = loader.load_all_initial()
+            if args.workers > 1:
+                logger.info(f"Hechos en paralelo: {args.workers} workers, partición por {args.partition}")
+            if args.bulk:
+                logger.info("Modo bulk: índices y llaves foráneas de fact_homicidios se reconstruyen al final")
+            
+            results = loader.load_all_initial(
+                workers=args.workers,
+                partition=args.partition,
+                bulk=args.bulk
+            )
             
             logger.info("=" * 70)
             logger.info("RESUMEN DE CARGA INICIAL:")
@@ -75,6 +136,19 @@ def main():
                 logger.info(f"  {table}: {count:,} registros")
             logger.info("=" * 70)
         
+        elif args.rebuild:
+            logger.info("🔄 Ejecutando RECONSTRUCCIÓN BLUE/GREEN...")
+            if args.workers > 1:
+                logger.info(f"Hechos en paralelo: {args.workers} workers, partición por {args.partition}")
+            
+            results = loader.rebuild(workers=args.workers, partition=args.partition)
+            
+            logger.info("=" * 70)
+            logger.info("RESUMEN DE RECONSTRUCCIÓN:")
+            for table, count in results.items():
+                logger.info(f"  {table}: {count:,} registros")
+            logger.info("=" * 70)
+        
         elif args.incremental:
             logger.info("🔄 Ejecutando CARGA INCREMENTAL...")
             results = loader.load_incremental()
@@ -95,6 +169,9 @@ def main():
         sys.exit(1)
     
     finally:
+        # Resumen de queries de la ejecución (tiempo por sentencia)
+        query_stats.log_summary(log=logger)
+        
         # Cerrar conexiones
         loader.close()
 
@@ -0,0 +1,413 @@
+"""
+Acceso asíncrono a PostgreSQL (asyncpg) para el ETL.
+
+Contraparte asyncio de DatabaseConnection / DWHConnection: pool asíncrono y
+métodos execute / fetch / execute_many / copy_records / iter_query para
+solapar muchas consultas pequeñas (upserts de dimensiones, logs, checks) en
+un solo event loop.
+
+Acepta el mismo SQL con placeholders %s que usan los loaders síncronos (y,
+como psycopg2, solo desescapa %% cuando la sentencia lleva parámetros).
+asyncpg es estricto con los tipos: los parámetros deben ser objetos Python
+del tipo de la columna (date, int, Decimal...), no strings.
+
+Lo usa AsyncDimensionLoader (src/data_warehouse/async_dimension_loader.py).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from src.config.settings import settings
+from src.data_ingestion.batch_execution import parse_insert
+from src.data_ingestion.prepared_statements import to_server_placeholders
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=256)
+def _convert(query: str, has_params: bool = True) -> str:
+    """
+    Convertir SQL con %s a $n (cacheado por texto SQL).
+
+    Sin parámetros el SQL se envía tal cual, igual que psycopg2: un '%%'
+    literal (p. ej. en LIKE) no se desescapa.
+    """
+    if not has_params:
+        return query
+    return to_server_placeholders(query)[0]
+
+
+class AsyncDatabaseConnection:
+    """Gestor asíncrono de conexiones a PostgreSQL con pool de asyncpg."""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        database: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        max_inactive_lifetime: float = 1800.0,
+        command_timeout: Optional[float] = None,
+        server_settings: Optional[Dict[str, str]] = None
+    ):
+        """
+        Inicializar gestor de conexiones (el pool se crea al primer uso).
+
+        Args:
+            host: Host de PostgreSQL (usa settings del Data Lake si es None)
+            port: Puerto de PostgreSQL
+            database: Nombre de la base de datos
+            user: Usuario
+            password: Contraseña
+            min_connections: Mínimo de conexiones en el pool
+            max_connections: Máximo de conexiones en el pool
+            max_inactive_lifetime: Segundos antes de cerrar una conexión inactiva
+            command_timeout: Timeout por sentencia en segundos (None = sin límite)
+            server_settings: Parámetros de sesión de PostgreSQL (p. ej. search_path)
+        """
+        self.host = host or settings.db_host
+        self.port = port or settings.db_port
+        self.database = database or settings.db_name
+        self.user = user or settings.db_user
+        self.password = password or settings.db_password
+
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.max_inactive_lifetime = max_inactive_lifetime
+        self.command_timeout = command_timeout
+        self.server_settings = server_settings
+
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+        logger.info(f"Inicializando conexión asíncrona: {self.host}:{self.port}/{self.database}")
+
+    async def get_pool(self) -> asyncpg.Pool:
+        """
+        Obtener pool de conexiones (crear si no existe).
+
+        Returns:
+            Pool de asyncpg
+        """
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                        min_size=self.min_connections,
+                        max_size=self.max_connections,
+                        max_inactive_connection_lifetime=self.max_inactive_lifetime,
+                        command_timeout=self.command_timeout,
+                        server_settings=self.server_settings
+                    )
+                    logger.info(
+                        f"Pool asíncrono creado ({self.min_connections}-{self.max_connections})"
+                    )
+        return self._pool
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Context manager para obtener una conexión del pool.
+
+        Example:
+            async with db.acquire() as conn:
+                await conn.fetch("SELECT 1")
+        """
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Context manager para una conexión dentro de una transacción.
+
+        Hace commit al salir y rollback si hay excepción.
+        """
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def execute(self, query: str, params: Optional[Sequence[Any]] = None) -> str:
+        """
+        Ejecutar una query SQL sin resultados.
+
+        Args:
+            query: Query SQL con placeholders %s
+            params: Parámetros para la query
+
+        Returns:
+            Estado de la sentencia (p.ej. 'INSERT 0 1')
+        """
+        async with self.acquire() as conn:
+            return await conn.execute(_convert(query, params is not None), *(params or ()))
+
+    async def fetch(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        dict_rows: bool = False
+    ) -> List[Any]:
+        """
+        Ejecutar una query y retornar todas las filas.
+
+        Args:
+            query: Query SQL con placeholders %s
+            params: Parámetros para la query
+            dict_rows: Si True, retornar filas como dict
+
+        Returns:
+            Lista de asyncpg.Record (o dicts si dict_rows=True)
+        """
+        async with self.acquire() as conn:
+            rows = await conn.fetch(_convert(query, params is not None), *(params or ()))
+        if dict_rows:
+            return [dict(row) for row in rows]
+        return rows
+
+    async def execute_many(self, query: str, data: List[tuple]):
+        """
+        Ejecutar query con múltiples sets de parámetros en una transacción.
+
+        asyncpg prepara la sentencia una vez y envía todos los sets en
+        pipeline (un solo viaje de ida y vuelta efectivo).
+
+        Args:
+            query: Query SQL con placeholders %s
+            data: Lista de tuplas con parámetros
+        """
+        async with self.transaction() as conn:
+            await conn.executemany(_convert(query), data)
+        logger.info(f"Ejecutados {len(data)} registros (async)")
+
+    async def execute_many_returning(
+        self,
+        query: str,
+        data: List[tuple],
+        page_size: int = 1000
+    ) -> List[asyncpg.Record]:
+        """
+        Ejecutar un INSERT ... RETURNING con múltiples sets de parámetros.
+
+        Igual que DatabaseConnection.execute_many_returning: el INSERT de una
+        fila se reescribe como INSERT multi-fila de `page_size` filas por
+        sentencia, todas en una transacción, y se acumulan las filas retornadas.
+
+        Args:
+            query: INSERT de una fila con cláusula RETURNING (placeholders %s)
+            data: Lista de tuplas con parámetros
+            page_size: Filas por sentencia / viaje al servidor
+
+        Returns:
+            Lista de asyncpg.Record retornados
+
+        Raises:
+            ValueError: Si la sentencia no es un INSERT ... VALUES de una fila
+        """
+        if not data:
+            return []
+
+        statement = parse_insert(query)
+        if statement is None:
+            raise ValueError("execute_many_returning requiere un INSERT ... VALUES (...) de una fila")
+
+        rows: List[asyncpg.Record] = []
+        async with self.transaction() as conn:
+            for start in range(0, len(data), page_size):
+                page = data[start:start + page_size]
+                sql = (
+                    f"INSERT INTO {statement.table} ({', '.join(statement.columns)}) "
+                    f"VALUES {', '.join([statement.template] * len(page))}{statement.tail}"
+                )
+                rows.extend(await conn.fetch(_convert(sql), *(value for row in page for value in row)))
+
+        logger.info(f"Ejecutados {len(data)} registros en batch ({len(rows)} retornados, async)")
+        return rows
+
+    async def copy_records(
+        self,
+        table: str,
+        records: List[tuple],
+        columns: Optional[List[str]] = None,
+        schema: Optional[str] = None
+    ) -> int:
+        """
+        Cargar registros con COPY (protocolo binario).
+
+        Args:
+            table: Tabla destino
+            records: Lista de tuplas en el orden de `columns`
+            columns: Columnas destino (None = todas en orden de la tabla)
+            schema: Esquema de la tabla (None = search_path)
+
+        Returns:
+            Número de registros copiados
+        """
+        async with self.acquire() as conn:
+            status = await conn.copy_records_to_table(
+                table, records=records, columns=columns, schema_name=schema
+            )
+        copied = int(status.split()[-1]) if status else len(records)
+        logger.info(f"COPY {table}: {copied} registros (async)")
+        return copied
+
+    async def iter_query(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        itersize: int = 5000,
+        batches: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Iterar resultados con un cursor del lado del servidor.
+
+        Args:
+            query: Query SQL (SELECT) con placeholders %s
+            params: Parámetros para la query
+            itersize: Filas por viaje al servidor (y tamaño de lote si batches=True)
+            batches: Si True, producir listas de hasta `itersize` filas
+
+        Yields:
+            asyncpg.Record individuales, o listas si batches=True
+
+        Example:
+            async for lote in db.iter_query("SELECT * FROM raw_homicidios", batches=True):
+                await procesar(lote)
+        """
+        sql = _convert(query, params is not None)
+        args = tuple(params or ())
+
+        async with self.transaction() as conn:
+            if batches:
+                cursor = await conn.cursor(sql, *args)
+                while True:
+                    rows = await cursor.fetch(itersize)
+                    if not rows:
+                        break
+                    yield rows
+            else:
+                async for row in conn.cursor(sql, *args, prefetch=itersize):
+                    yield row
+
+    async def test_connection(self) -> bool:
+        """
+        Probar conexión a la base de datos.
+
+        Returns:
+            True si la conexión es exitosa
+        """
+        try:
+            async with self.acquire() as conn:
+                result = await conn.fetchval("SELECT 1")
+            return result == 1
+        except Exception as e:
+            logger.error(f"❌ Error en conexión asíncrona: {e}")
+            return False
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Obtener métricas del pool asíncrono.
+
+        Returns:
+            Diccionario con tamaño, conexiones libres y en uso (vacío si no hay pool)
+        """
+        if self._pool is None:
+            return {}
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "max_connections": self.max_connections,
+        }
+
+    async def close(self):
+        """Cerrar todas las conexiones del pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Pool asíncrono cerrado")
+
+
+class AsyncDWHConnection(AsyncDatabaseConnection):
+    """Gestor asíncrono de conexiones al Data Warehouse."""
+
+    def __init__(self, schema: Optional[str] = None, **kwargs: Any):
+        """
+        Inicializar conexión asíncrona al DWH (usa settings dw_* por defecto).
+
+        Args:
+            schema: Esquema donde buscar las tablas antes que en public
+                (search_path), como en DWHConnection
+            **kwargs: Mismos argumentos que AsyncDatabaseConnection
+        """
+        self.schema = schema
+        if schema:
+            kwargs.setdefault("server_settings", {"search_path": f"{schema},public"})
+        kwargs.setdefault("host", settings.dw_host)
+        kwargs.setdefault("port", settings.dw_port)
+        kwargs.setdefault("database", settings.dw_db)
+        kwargs.setdefault("user", settings.dw_user)
+        kwargs.setdefault("password", settings.dw_password)
+        super().__init__(**kwargs)
+
+
+async def gather_queries(
+    db: AsyncDatabaseConnection,
+    queries: List[Tuple[str, Optional[Sequence[Any]]]]
+) -> List[List[Any]]:
+    """
+    Ejecutar varias queries de lectura concurrentemente sobre el pool.
+
+    Args:
+        db: Conexión asíncrona
+        queries: Lista de tuplas (query, params)
+
+    Returns:
+        Resultados en el mismo orden que `queries`
+    """
+    return await asyncio.gather(*(db.fetch(query, params) for query, params in queries))
+
+
+if __name__ == "__main__":
+    """Ejemplo de uso de AsyncDatabaseConnection."""
+
+    async def main():
+        datalake = AsyncDatabaseConnection()
+        dwh = AsyncDWHConnection()
+
+        print("=" * 70)
+        print("PRUEBA DE CONEXIÓN ASÍNCRONA")
+        print("=" * 70)
+
+        ok_dl, ok_dwh = await asyncio.gather(datalake.test_connection(), dwh.test_connection())
+        print(f"Data Lake: {'✅' if ok_dl else '❌'}  |  DWH: {'✅' if ok_dwh else '❌'}")
+
+        if ok_dl:
+            conteos = await gather_queries(datalake, [
+                ("SELECT COUNT(*) FROM raw_homicidios", None),
+                ("SELECT COUNT(*) FROM raw_divipola_departamentos", None),
+                ("SELECT COUNT(*) FROM raw_divipola_municipios", None),
+            ])
+            print(f"Conteos: {[rows[0][0] for rows in conteos]}")
+
+        await asyncio.gather(datalake.close(), dwh.close())
+        print("\n" + "=" * 70)
+
+    asyncio.run(main())
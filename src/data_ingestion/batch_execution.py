@@ -0,0 +1,223 @@
+"""
+Ejecución por lotes de INSERTs: VALUES multi-fila y COPY.
+
+cursor.executemany de psycopg2 envía una sentencia (un viaje de ida y vuelta)
+por fila. Estas funciones reescriben un INSERT de una fila:
+
+    INSERT INTO t (a, b) VALUES (%s, %s) [ON CONFLICT ...]
+
+a un INSERT multi-fila por página (execute_values), o, si la sentencia no
+tiene cláusulas adicionales (ON CONFLICT, RETURNING...), a un único COPY.
+
+COPY en formato texto solo admite valores escalares (texto, números, fechas,
+UUID); filas con bytes, listas u otros tipos se cargan por VALUES, donde los
+adapta psycopg2.
+"""
+
+import io
+import re
+from datetime import date, time
+from decimal import Decimal
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+from psycopg2.extras import execute_batch, execute_values
+
+_INSERT_RE = re.compile(
+    r"^\s*INSERT\s+INTO\s+(?P<table>[\w.\"]+)\s*"
+    r"\((?P<columns>[^)]*)\)\s*"
+    r"VALUES\s*(?P<template>\((?:[^()]|\([^()]*\))*\))"
+    r"(?P<tail>.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Plantilla apta para COPY: solo placeholders %s, sin expresiones ni DEFAULT
+_PLAIN_TEMPLATE_RE = re.compile(r"^\(\s*%s(\s*,\s*%s)*\s*\)$")
+
+# Tipos cuyo str() es una entrada válida de COPY texto (bool y datetime heredan de int y date)
+_COPY_SCALAR_TYPES = (str, int, float, Decimal, date, time, UUID)
+
+
+class InsertStatement(NamedTuple):
+    """INSERT de una fila descompuesto en sus partes."""
+
+    table: str
+    columns: List[str]
+    template: str
+    tail: str
+
+    @property
+    def supports_copy(self) -> bool:
+        """True si la sentencia puede ejecutarse como COPY sin cambiar su semántica."""
+        return not self.tail.strip() and bool(_PLAIN_TEMPLATE_RE.match(self.template))
+
+    def values_sql(self) -> str:
+        """SQL para execute_values (VALUES %s + cláusulas originales)."""
+        return (
+            f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+            f"VALUES %s{self.tail}"
+        )
+
+
+def parse_insert(query: str) -> Optional[InsertStatement]:
+    """
+    Descomponer un INSERT ... VALUES (...) de una fila.
+
+    Args:
+        query: SQL con placeholders %s
+
+    Returns:
+        InsertStatement, o None si la sentencia no es un INSERT de una fila
+    """
+    match = _INSERT_RE.match(query)
+    if not match:
+        return None
+
+    columns = [c.strip() for c in match.group("columns").split(",") if c.strip()]
+    return InsertStatement(
+        table=match.group("table"),
+        columns=columns,
+        template=match.group("template").strip(),
+        tail=match.group("tail").rstrip().rstrip(";")
+    )
+
+
+def execute_values_batched(
+    cursor,
+    statement: InsertStatement,
+    data: Sequence[tuple],
+    page_size: int = 1000
+) -> int:
+    """
+    Ejecutar un INSERT como sentencias VALUES multi-fila de `page_size` filas.
+
+    Args:
+        cursor: Cursor de psycopg2
+        statement: INSERT descompuesto con parse_insert
+        data: Lista de tuplas con parámetros
+        page_size: Filas por sentencia (un viaje por página)
+
+    Returns:
+        Filas afectadas (suma de todas las páginas)
+    """
+    sql = statement.values_sql()
+    affected = 0
+
+    for start in range(0, len(data), page_size):
+        page = data[start:start + page_size]
+        execute_values(cursor, sql, page, template=statement.template, page_size=len(page))
+        affected += max(cursor.rowcount, 0)
+
+    return affected
+
+
+def execute_values_returning(
+    cursor,
+    statement: InsertStatement,
+    data: Sequence[tuple],
+    page_size: int = 1000
+) -> List[tuple]:
+    """
+    Igual que execute_values_batched, pero acumulando las filas de RETURNING.
+
+    Args:
+        cursor: Cursor de psycopg2
+        statement: INSERT descompuesto con parse_insert (con cláusula RETURNING)
+        data: Lista de tuplas con parámetros
+        page_size: Filas por sentencia (un viaje por página)
+
+    Returns:
+        Filas retornadas por todas las páginas
+    """
+    sql = statement.values_sql()
+    rows: List[tuple] = []
+
+    for start in range(0, len(data), page_size):
+        page = data[start:start + page_size]
+        rows.extend(
+            execute_values(
+                cursor, sql, page, template=statement.template, page_size=len(page), fetch=True
+            )
+        )
+
+    return rows
+
+
+def execute_statement_batched(cursor, query: str, data: Sequence[tuple], page_size: int = 1000) -> int:
+    """
+    Ejecutar cualquier sentencia con varios sets de parámetros, `page_size` por viaje.
+
+    Fallback para sentencias que no son INSERT de una fila (UPDATE, DELETE...).
+
+    Returns:
+        Número de sets de parámetros ejecutados
+    """
+    execute_batch(cursor, query, data, page_size=page_size)
+    return len(data)
+
+
+def rows_support_copy(rows: Iterable[Sequence]) -> bool:
+    """
+    Indicar si todas las filas pueden cargarse con COPY en formato texto.
+
+    Args:
+        rows: Filas (tuplas) a cargar
+
+    Returns:
+        True si todos los valores son None o escalares serializables
+    """
+    return all(
+        value is None or isinstance(value, _COPY_SCALAR_TYPES)
+        for row in rows
+        for value in row
+    )
+
+
+def _copy_value(value) -> str:
+    """Serializar un valor al formato de texto de COPY."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if not isinstance(value, _COPY_SCALAR_TYPES):
+        raise TypeError(
+            f"COPY no soporta valores de tipo {type(value).__name__}; usar execute_many"
+        )
+    text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """
+    Cargar filas con COPY FROM STDIN (formato texto), en un solo viaje.
+
+    Args:
+        cursor: Cursor de psycopg2
+        table: Tabla destino (puede incluir esquema)
+        columns: Columnas destino en el orden de cada fila
+        rows: Filas (tuplas) a copiar
+
+    Returns:
+        Número de filas copiadas
+
+    Raises:
+        TypeError: Si una fila tiene valores no escalares (bytes, listas, dicts...)
+    """
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(_copy_value(v) for v in row))
+        buffer.write("\n")
+        count += 1
+
+    if not count:
+        return 0
+
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return cursor.rowcount if cursor.rowcount >= 0 else count
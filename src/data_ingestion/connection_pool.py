@@ -0,0 +1,283 @@
+"""
+Pool de conexiones thread-safe para PostgreSQL.
+
+Reemplaza a psycopg2.pool.SimpleConnectionPool (no apto para hilos) con un
+pool que:
+- Puede compartirse entre varios hilos
+- Recicla conexiones que superan su tiempo de vida máximo
+- Valida cada conexión al entregarla (pre-ping)
+- Espera con timeout cuando el pool está agotado
+- Expone métricas de uso
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+import psycopg2
+from psycopg2 import extensions, pool
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolTimeoutError(pool.PoolError):
+    """No se obtuvo una conexión del pool dentro del tiempo de espera."""
+
+
+class ManagedConnection(extensions.connection):
+    """Conexión de psycopg2 con los metadatos que necesita el pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.statement_cache = None  # Ver prepared_statements.get_statement_cache
+
+
+class ManagedConnectionPool:
+    """Pool de conexiones thread-safe con reciclaje, pre-ping y métricas."""
+
+    def __init__(
+        self,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        max_lifetime: float = 1800.0,
+        wait_timeout: float = 30.0,
+        pre_ping: bool = True,
+        **conn_params: Any
+    ):
+        """
+        Inicializar pool y abrir las conexiones mínimas.
+
+        Args:
+            min_connections: Conexiones que se abren al crear el pool
+            max_connections: Máximo de conexiones abiertas simultáneamente
+            max_lifetime: Segundos de vida de una conexión antes de reciclarla (0 = sin límite)
+            wait_timeout: Segundos máximos de espera cuando el pool está agotado
+            pre_ping: Si True, validar la conexión con SELECT 1 antes de entregarla
+            **conn_params: Parámetros para psycopg2.connect (host, port, ...)
+        """
+        if max_connections < 1 or min_connections > max_connections:
+            raise ValueError(
+                f"Tamaño de pool inválido: min={min_connections}, max={max_connections}"
+            )
+
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        self.pre_ping = pre_ping
+        self._conn_params = conn_params
+
+        self._cond = threading.Condition()
+        self._idle: Deque[ManagedConnection] = deque()
+        self._in_use: Dict[int, ManagedConnection] = {}
+        self._total = 0  # Conexiones abiertas + huecos reservados
+        self._closed = False
+
+        self._metrics = {
+            "checkouts": 0,
+            "wait_time_total_s": 0.0,
+            "wait_time_max_s": 0.0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "timeouts": 0,
+        }
+
+        for _ in range(min_connections):
+            self._total += 1
+            self._idle.append(self._connect())
+
+    # ------------------------------------------------------------------------
+    # Ciclo de vida de conexiones
+    # ------------------------------------------------------------------------
+
+    def _connect(self) -> ManagedConnection:
+        """Abrir una conexión nueva (el hueco ya debe estar reservado)."""
+        try:
+            conn = psycopg2.connect(connection_factory=ManagedConnection, **self._conn_params)
+        except Exception:
+            with self._cond:
+                if not self._closed:
+                    self._total -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._metrics["connections_created"] += 1
+        return conn
+
+    def _discard(self, conn: ManagedConnection):
+        """Cerrar una conexión y liberar su hueco en el pool."""
+        try:
+            if not conn.closed:
+                conn.close()
+        except psycopg2.Error:
+            pass
+
+        with self._cond:
+            if not self._closed:  # closeall() ya liberó todos los huecos
+                self._total -= 1
+                self._metrics["connections_closed"] += 1
+            self._cond.notify()
+
+    def _expired(self, conn: ManagedConnection) -> bool:
+        """Verificar si la conexión superó su tiempo de vida máximo."""
+        return bool(self.max_lifetime) and time.monotonic() - conn.created_at > self.max_lifetime
+
+    def _ping(self, conn: ManagedConnection) -> bool:
+        """Validar que la conexión sigue viva (p.ej. tras un reinicio de la BD)."""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    # ------------------------------------------------------------------------
+    # API del pool (compatible con psycopg2.pool)
+    # ------------------------------------------------------------------------
+
+    def getconn(self) -> ManagedConnection:
+        """
+        Obtener una conexión válida del pool.
+
+        Returns:
+            Conexión lista para usar
+
+        Raises:
+            PoolTimeoutError: Si no hay conexiones libres tras wait_timeout segundos
+            psycopg2.pool.PoolError: Si el pool está cerrado
+        """
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise pool.PoolError("El pool de conexiones está cerrado")
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._total < self.max_connections:
+                        self._total += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timeout esperando conexión ({self.wait_timeout}s, "
+                            f"{self.max_connections} en uso)"
+                        )
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                conn = self._connect()
+            elif self._expired(conn):
+                logger.debug("Conexión reciclada por tiempo de vida")
+                self._metrics_add("recycled", 1)
+                self._discard(conn)
+                continue
+            elif self.pre_ping and not self._ping(conn):
+                logger.warning("Conexión inválida descartada (pre-ping fallido)")
+                self._metrics_add("ping_failures", 1)
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(conn)] = conn
+                self._metrics["checkouts"] += 1
+                self._metrics["wait_time_total_s"] += waited
+                self._metrics["wait_time_max_s"] = max(self._metrics["wait_time_max_s"], waited)
+            return conn
+
+    def putconn(self, conn: ManagedConnection, close: bool = False):
+        """
+        Devolver una conexión al pool.
+
+        Args:
+            conn: Conexión obtenida con getconn()
+            close: Si True, cerrar la conexión en lugar de reutilizarla
+        """
+        with self._cond:
+            if self._in_use.pop(id(conn), None) is None:
+                raise pool.PoolError("La conexión no pertenece a este pool")
+            closed_pool = self._closed
+
+        if close or closed_pool or conn.closed or self._expired(conn):
+            self._discard(conn)
+            return
+
+        # Nunca devolver al pool una conexión con transacción abierta
+        status = conn.get_transaction_status()
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                self._discard(conn)
+                return
+
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def closeall(self):
+        """Cerrar todas las conexiones (libres y en uso) y el pool."""
+        with self._cond:
+            self._closed = True
+            conns = list(self._idle) + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+            self._total = 0
+            self._cond.notify_all()
+
+        for conn in conns:
+            try:
+                if not conn.closed:
+                    conn.close()
+            except psycopg2.Error:
+                pass
+
+        self._metrics_add("connections_closed", len(conns))
+
+    @property
+    def closed(self) -> bool:
+        """True si el pool fue cerrado con closeall()."""
+        return self._closed
+
+    # ------------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------------
+
+    def _metrics_add(self, key: str, value: float):
+        with self._cond:
+            self._metrics[key] += value
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Obtener métricas del pool.
+
+        Returns:
+            Diccionario con checkouts, tiempos de espera, conexiones en uso,
+            libres, creadas, cerradas, recicladas, pings fallidos y timeouts
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics["in_use"] = len(self._in_use)
+            metrics["idle"] = len(self._idle)
+            metrics["max_connections"] = self.max_connections
+
+        checkouts = metrics["checkouts"]
+        metrics["wait_time_avg_s"] = metrics["wait_time_total_s"] / checkouts if checkouts else 0.0
+        return metrics
@@ -76,11 +76,67 @@ class DataLakeLoader:
         )
         
         try:
-            self.db.execute_query(query, params)
+            self.db.execute_prepared(query, [params])
             logger.info(f"Log de carga registrado: {dataset_name} - {records_loaded} registros")
         except Exception as e:
             logger.error(f"Error registrando log de carga: {e}")
     
+    def _insert_homicidios(self, records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        Insertar homicidios asignando ingest_seq consecutivos.
+        
+        La tabla se bloquea contra otros escritores (las lecturas siguen
+        permitidas) hasta el commit: la secuencia queda densa y el orden de
+        commit coincide con el de ingest_seq, así la carga incremental del DWH
+        nunca ve un ingest_seq mayor antes que uno menor.
+        
+        Args:
+            records: Registros de la API
+            batch_size: Filas por sentencia INSERT
+        
+        Returns:
+            Número de registros insertados
+        """
+        insert_query = """
+            INSERT INTO raw_homicidios (
+                ingest_seq, fecha_hecho, cod_depto, departamento, cod_muni,
+                municipio, zona, sexo, cantidad, source_api
+            ) VALUES %s
+        """
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute("LOCK TABLE raw_homicidios IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute("SELECT COALESCE(MAX(ingest_seq), 0) FROM raw_homicidios")
+            last_seq = cursor.fetchone()[0]
+            
+            # Convertir registros a tuplas
+            values = [
+                (
+                    last_seq + n,
+                    record.get("fecha_hecho"),
+                    int(record.get("cod_depto")) if record.get("cod_depto") else None,
+                    record.get("departamento"),
+                    int(record.get("cod_muni")) if record.get("cod_muni") else None,
+                    record.get("municipio"),
+                    record.get("zona"),
+                    record.get("sexo"),
+                    int(record.get("cantidad", 1)),
+                    "datos_abiertos_api"
+                )
+                for n, record in enumerate(records, start=1)
+            ]
+            
+            execute_values(cursor, insert_query, values, page_size=batch_size)
+            
+            # Alinear la identidad para inserts que usen el valor por defecto
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence('raw_homicidios', 'ingest_seq'), %s)",
+                (last_seq + len(values),)
+            )
+        
+        logger.info(f"ingest_seq asignados: {last_seq + 1}..{last_seq + len(values)}")
+        return len(values)
+    
     def load_homicidios_initial(self, batch_size: int = 1000) -> int:
         """
         Carga inicial completa de homicidios.
@@ -110,37 +166,10 @@ class DataLakeLoader:
             
             logger.info(f"Extraídos {len(records)} registros de la API")
             
-            # Preparar datos para inserción
-            insert_query = """
-                INSERT INTO raw_homicidios (
-                    fecha_hecho, cod_depto, departamento, cod_muni,
-                    municipio, zona, sexo, cantidad, source_api
-                ) VALUES %s
-                ON CONFLICT DO NOTHING
-            """
-            
-            # Convertir registros a tuplas
-            values = [
-                (
-                    record.get("fecha_hecho"),
-                    int(record.get("cod_depto")) if record.get("cod_depto") else None,
-                    record.get("departamento"),
-                    int(record.get("cod_muni")) if record.get("cod_muni") else None,
-                    record.get("municipio"),
-                    record.get("zona"),
-                    record.get("sexo"),
-                    int(record.get("cantidad", 1)),
-                    "datos_abiertos_api"
-                )
-                for record in records
-            ]
-            
             # Insertar en lotes
-            logger.info(f"Insertando {len(values)} registros en base de datos...")
+            logger.info(f"Insertando {len(records)} registros en base de datos...")
             
-            with self.db.get_cursor() as cursor:
-                execute_values(cursor, insert_query, values, page_size=batch_size)
-                inserted_count = cursor.rowcount
+            inserted_count = self._insert_homicidios(records, batch_size)
             
             logger.info(f"✅ Carga inicial completada: {inserted_count} registros insertados")
             
@@ -202,32 +231,7 @@ class DataLakeLoader:
             logger.info(f"Extraídos {len(records)} registros nuevos")
             
             # Insertar registros
-            insert_query = """
-                INSERT INTO raw_homicidios (
-                    fecha_hecho, cod_depto, departamento, cod_muni,
-                    municipio, zona, sexo, cantidad, source_api
-                ) VALUES %s
-                ON CONFLICT DO NOTHING
-            """
-            
-            values = [
-                (
-                    record.get("fecha_hecho"),
-                    int(record.get("cod_depto")) if record.get("cod_depto") else None,
-                    record.get("departamento"),
-                    int(record.get("cod_muni")) if record.get("cod_muni") else None,
-                    record.get("municipio"),
-                    record.get("zona"),
-                    record.get("sexo"),
-                    int(record.get("cantidad", 1)),
-                    "datos_abiertos_api"
-                )
-                for record in records
-            ]
-            
-            with self.db.get_cursor() as cursor:
-                execute_values(cursor, insert_query, values, page_size=batch_size)
-                inserted_count = cursor.rowcount
+            inserted_count = self._insert_homicidios(records, batch_size)
             
             logger.info(f"✅ Carga incremental completada: {inserted_count} registros nuevos")
             
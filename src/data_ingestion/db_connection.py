@@ -1,16 +1,28 @@
 """
 Gestor de conexiones a PostgreSQL para el Data Lake.
 
-Proporciona pool de conexiones, context managers y manejo de transacciones.
+Proporciona pool de conexiones thread-safe (compartido vía PoolManager),
+context managers y manejo de transacciones.
 """
 
 from contextlib import contextmanager
-from typing import Optional, Generator
+from typing import Any, Dict, Iterator, Optional, Generator, Sequence
 import psycopg2
-from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 
 from src.config.settings import settings
+from src.data_ingestion.batch_execution import (
+    copy_rows,
+    execute_statement_batched,
+    execute_values_batched,
+    execute_values_returning,
+    parse_insert,
+    rows_support_copy,
+)
+from src.data_ingestion.connection_pool import ManagedConnectionPool
+from src.data_ingestion.pool_manager import pool_manager
+from src.data_ingestion.prepared_statements import get_statement_cache
+from src.data_ingestion.query_instrumentation import get_cursor_factory
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,7 +39,13 @@ class DatabaseConnection:
         user: Optional[str] = None,
         password: Optional[str] = None,
         min_connections: int = 1,
-        max_connections: int = 10
+        max_connections: int = 10,
+        max_lifetime: float = 1800.0,
+        wait_timeout: float = 30.0,
+        pre_ping: bool = True,
+        statement_cache_size: int = 64,
+        pool_name: str = "datalake",
+        options: Optional[str] = None
     ):
         """
         Inicializar gestor de conexiones.
@@ -40,6 +58,13 @@ class DatabaseConnection:
             password: Contraseña
             min_connections: Mínimo de conexiones en el pool
             max_connections: Máximo de conexiones en el pool
+            max_lifetime: Segundos antes de reciclar una conexión (0 = sin límite)
+            wait_timeout: Segundos máximos de espera por una conexión libre
+            pre_ping: Si True, validar cada conexión antes de entregarla
+            statement_cache_size: Máximo de sentencias preparadas por conexión
+            pool_name: Nombre del pool en el PoolManager (compartido por destino)
+            options: Opciones de sesión de PostgreSQL (p. ej. '-c search_path=...');
+                usar un pool_name propio, el pool no distingue por opciones
         """
         # Usar valores de .env si no se especifican
         self.host = host or settings.db_host
@@ -48,39 +73,59 @@ class DatabaseConnection:
         self.user = user or settings.db_user
         self.password = password or settings.db_password
         
-        self.connection_pool: Optional[pool.SimpleConnectionPool] = None
+        self.connection_pool: Optional[ManagedConnectionPool] = None
         self.min_connections = min_connections
         self.max_connections = max_connections
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        self.pre_ping = pre_ping
+        self.statement_cache_size = statement_cache_size
+        self.pool_name = pool_name
+        self.options = options
         
         logger.info(f"Inicializando conexión a PostgreSQL: {self.host}:{self.port}/{self.database}")
     
-    def _create_pool(self):
-        """Crear pool de conexiones."""
-        try:
-            self.connection_pool = pool.SimpleConnectionPool(
-                self.min_connections,
-                self.max_connections,
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            logger.info(f"Pool de conexiones creado ({self.min_connections}-{self.max_connections})")
-        except psycopg2.Error as e:
-            logger.error(f"Error creando pool de conexiones: {e}")
-            raise
+    @property
+    def conn_params(self) -> Dict[str, Any]:
+        """Parámetros de conexión para psycopg2.connect."""
+        params = {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password
+        }
+        if self.options:
+            params['options'] = self.options
+        return params
     
-    def get_pool(self) -> pool.SimpleConnectionPool:
+    def get_pool(self) -> ManagedConnectionPool:
         """
         Obtener pool de conexiones (crear si no existe).
         
+        El pool es compartido por todas las instancias que apuntan a la misma
+        base de datos (ver PoolManager).
+        
         Returns:
             Pool de conexiones
         """
-        if self.connection_pool is None:
-            self._create_pool()
-        return self.connection_pool
+        pool = self.connection_pool
+        if pool is None or pool.closed:
+            try:
+                pool = pool_manager.get_pool(
+                    self.pool_name,
+                    self.conn_params,
+                    min_connections=self.min_connections,
+                    max_connections=self.max_connections,
+                    max_lifetime=self.max_lifetime,
+                    wait_timeout=self.wait_timeout,
+                    pre_ping=self.pre_ping
+                )
+            except psycopg2.Error as e:
+                logger.error(f"Error creando pool de conexiones: {e}")
+                raise
+            self.connection_pool = pool
+        return pool
     
     @contextmanager
     def get_connection(self, dict_cursor: bool = False) -> Generator:
@@ -100,12 +145,11 @@ class DatabaseConnection:
         """
         pool = self.get_pool()
         conn = None
+        broken = False
         
         try:
             conn = pool.getconn()
-            
-            if dict_cursor:
-                conn.cursor_factory = RealDictCursor
+            conn.cursor_factory = RealDictCursor if dict_cursor else None
             
             logger.debug("Conexión obtenida del pool")
             yield conn
@@ -113,12 +157,18 @@ class DatabaseConnection:
         except psycopg2.Error as e:
             logger.error(f"Error en conexión: {e}")
             if conn:
-                conn.rollback()
+                # Conexiones rotas (BD reiniciada, red caída) no vuelven al pool
+                broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+                if not conn.closed:
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        broken = True
             raise
         
         finally:
             if conn:
-                pool.putconn(conn)
+                pool.putconn(conn, close=broken)
                 logger.debug("Conexión devuelta al pool")
     
     @contextmanager
@@ -126,6 +176,10 @@ class DatabaseConnection:
         """
         Context manager para obtener un cursor directamente.
         
+        El cursor está instrumentado (ver query_instrumentation): cada
+        sentencia registra duración, filas y origen, y las lentas van al
+        slow-query log.
+        
         Args:
             dict_cursor: Si True, usar RealDictCursor
         
@@ -138,7 +192,7 @@ class DatabaseConnection:
                 results = cursor.fetchall()
         """
         with self.get_connection(dict_cursor=dict_cursor) as conn:
-            cursor = conn.cursor()
+            cursor = conn.cursor(cursor_factory=get_cursor_factory(dict_cursor))
             try:
                 yield cursor
                 conn.commit()
@@ -176,26 +230,187 @@ class DatabaseConnection:
             
             return None
     
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        itersize: int = 5000,
+        dict_cursor: bool = False,
+        batches: bool = False
+    ) -> Iterator:
+        """
+        Iterar resultados con un cursor del lado del servidor (named cursor).
+        
+        A diferencia de execute_query, no materializa todo el resultado en
+        memoria: las filas se traen del servidor de a `itersize`. La conexión
+        queda tomada del pool hasta agotar (o cerrar) el iterador.
+        
+        Args:
+            query: Query SQL (SELECT)
+            params: Parámetros para la query
+            itersize: Filas por viaje al servidor (y tamaño de lote si batches=True)
+            dict_cursor: Si True, retornar filas como dict
+            batches: Si True, producir listas de hasta `itersize` filas
+        
+        Yields:
+            Filas individuales, o listas de filas si batches=True
+        
+        Example:
+            for lote in db.iter_query("SELECT * FROM raw_homicidios", batches=True):
+                procesar(lote)
+        """
+        from uuid import uuid4
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor(
+                name=f"iter_{uuid4().hex}",
+                cursor_factory=RealDictCursor if dict_cursor else None
+            )
+            cursor.itersize = itersize
+            
+            try:
+                cursor.execute(query, params)
+                
+                if batches:
+                    while True:
+                        rows = cursor.fetchmany(itersize)
+                        if not rows:
+                            break
+                        yield rows
+                else:
+                    yield from cursor
+                
+                conn.commit()
+            
+            finally:
+                try:
+                    cursor.close()
+                except psycopg2.Error:
+                    pass
+    
     def execute_many(
         self,
         query: str,
-        data: list
-    ):
+        data: list,
+        page_size: int = 1000,
+        use_copy: bool = True
+    ) -> int:
         """
         Ejecutar query con múltiples sets de parámetros (INSERT batch).
         
+        Un INSERT de una fila se reescribe como INSERT multi-fila de
+        `page_size` filas por sentencia; si no tiene cláusulas adicionales
+        (ON CONFLICT, RETURNING...) y todos los valores son escalares, se
+        ejecuta como un único COPY. Otras sentencias se envían agrupadas de a
+        `page_size` por viaje.
+        
         Args:
             query: Query SQL con placeholders
             data: Lista de tuplas con parámetros
+            page_size: Filas por sentencia / viaje al servidor
+            use_copy: Si False, nunca usar COPY
+        
+        Returns:
+            Número de filas afectadas
         
         Example:
             query = "INSERT INTO table (col1, col2) VALUES (%s, %s)"
             data = [(1, 'a'), (2, 'b'), (3, 'c')]
             db.execute_many(query, data)
         """
+        if not data:
+            return 0
+        
+        statement = parse_insert(query)
+        
         with self.get_cursor() as cursor:
-            cursor.executemany(query, data)
-            logger.info(f"Ejecutados {len(data)} inserts en batch")
+            if statement is None:
+                affected = execute_statement_batched(cursor, query, data, page_size)
+                mode = "batch"
+            elif use_copy and statement.supports_copy and rows_support_copy(data):
+                affected = copy_rows(cursor, statement.table, statement.columns, data)
+                mode = "COPY"
+            else:
+                affected = execute_values_batched(cursor, statement, data, page_size)
+                mode = "VALUES multi-fila"
+            
+            logger.info(f"Ejecutados {len(data)} registros en batch ({mode}, {affected} afectados)")
+            return affected
+    
+    def execute_many_returning(self, query: str, data: list, page_size: int = 1000) -> list:
+        """
+        Ejecutar un INSERT ... RETURNING con múltiples sets de parámetros.
+        
+        Usa INSERT multi-fila de `page_size` filas por sentencia y acumula
+        las filas retornadas.
+        
+        Args:
+            query: INSERT de una fila con cláusula RETURNING
+            data: Lista de tuplas con parámetros
+            page_size: Filas por sentencia / viaje al servidor
+        
+        Returns:
+            Lista de filas retornadas
+        
+        Raises:
+            ValueError: Si la sentencia no es un INSERT ... VALUES de una fila
+        
+        Example:
+            query = "INSERT INTO dim_sexo (sexo) VALUES (%s) ON CONFLICT DO NOTHING RETURNING sexo_key, sexo"
+            nuevos = db.execute_many_returning(query, [('Hombre',), ('Mujer',)])
+        """
+        if not data:
+            return []
+        
+        statement = parse_insert(query)
+        if statement is None:
+            raise ValueError("execute_many_returning requiere un INSERT ... VALUES (...) de una fila")
+        
+        with self.get_cursor() as cursor:
+            rows = execute_values_returning(cursor, statement, data, page_size)
+            logger.info(f"Ejecutados {len(data)} registros en batch ({len(rows)} retornados)")
+            return rows
+    
+    def copy_rows(self, table: str, columns: Sequence[str], rows: list) -> int:
+        """
+        Cargar filas con COPY FROM STDIN.
+        
+        Args:
+            table: Tabla destino
+            columns: Columnas destino en el orden de cada fila
+            rows: Lista de tuplas
+        
+        Returns:
+            Número de filas copiadas
+        """
+        with self.get_cursor() as cursor:
+            copied = copy_rows(cursor, table, columns, rows)
+            logger.info(f"COPY {table}: {copied} registros")
+            return copied
+    
+    def execute_prepared(
+        self,
+        query: str,
+        data: list,
+        page_size: int = 1000
+    ):
+        """
+        Ejecutar una sentencia preparada con múltiples sets de parámetros.
+        
+        La sentencia se prepara una sola vez por conexión (caché LRU por
+        texto SQL) y los EXECUTE se envían de a `page_size` por viaje. Pensado
+        para sentencias cortas que se repiten en cada lote (checkpoint,
+        rechazos, logs); las cargas paginadas van por execute_many.
+        
+        Args:
+            query: Query SQL con placeholders %s
+            data: Lista de tuplas con parámetros
+            page_size: Sentencias por viaje al servidor
+        """
+        with self.get_cursor() as cursor:
+            statements = get_statement_cache(cursor.connection, self.statement_cache_size)
+            statements.execute_batch(cursor, query, data, page_size=page_size)
+            logger.debug(f"Ejecutados {len(data)} registros con sentencia preparada")
     
     def test_connection(self) -> bool:
         """
@@ -219,22 +434,54 @@ class DatabaseConnection:
             logger.error(f"❌ Error en conexión a base de datos: {e}")
             return False
     
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Obtener métricas del pool de conexiones.
+        
+        Returns:
+            Diccionario con checkouts, tiempo de espera, conexiones en uso,
+            conexiones creadas, etc. (vacío si el pool no existe)
+        """
+        if self.connection_pool is None:
+            return {}
+        return self.connection_pool.get_metrics()
+    
     def close_all_connections(self):
         """Cerrar todas las conexiones del pool."""
         if self.connection_pool:
-            self.connection_pool.closeall()
+            metrics = self.connection_pool.get_metrics()
+            logger.info(
+                f"Métricas del pool: {metrics['checkouts']} checkouts, "
+                f"{metrics['connections_created']} conexiones creadas, "
+                f"espera máx {metrics['wait_time_max_s']:.3f}s"
+            )
+            pool_manager.close_pool(self.pool_name, self.conn_params)
             logger.info("Todas las conexiones cerradas")
             self.connection_pool = None
 
 
-# Instancia global para Data Lake
-datalake_db = DatabaseConnection(
-    host=settings.db_host,
-    port=settings.db_port,
-    database=settings.db_name,
-    user=settings.db_user,
-    password=settings.db_password
-)
+# Instancia global para Data Lake (se crea en el primer acceso)
+_datalake_db: Optional[DatabaseConnection] = None
+
+
+def get_datalake_db() -> DatabaseConnection:
+    """
+    Obtener la instancia global de conexión al Data Lake.
+    
+    Returns:
+        DatabaseConnection con los settings db_*
+    """
+    global _datalake_db
+    if _datalake_db is None:
+        _datalake_db = DatabaseConnection()
+    return _datalake_db
+
+
+def __getattr__(name: str) -> Any:
+    # Compatibilidad: `from src.data_ingestion.db_connection import datalake_db`
+    if name == "datalake_db":
+        return get_datalake_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
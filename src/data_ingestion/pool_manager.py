@@ -0,0 +1,117 @@
+"""
+Gestor único de pools de conexiones.
+
+Centraliza los pools del Data Lake y del Data Warehouse: cada base de datos
+tiene un solo ManagedConnectionPool por proceso, compartido por todas las
+instancias de DatabaseConnection / DWHConnection que apunten a ella. Así los
+loaders, hilos y scripts reutilizan conexiones en lugar de abrir las suyas.
+"""
+
+import threading
+from typing import Any, Dict, Tuple
+
+from src.data_ingestion.connection_pool import ManagedConnectionPool
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PoolKey = Tuple[str, str, int, str, str]
+
+
+class PoolManager:
+    """Registro thread-safe de pools de conexiones por base de datos."""
+
+    def __init__(self):
+        """Inicializar gestor (los pools se crean bajo demanda)."""
+        self._pools: Dict[PoolKey, ManagedConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name: str, conn_params: Dict[str, Any]) -> PoolKey:
+        """Clave del pool: nombre lógico + destino de la conexión."""
+        return (
+            name,
+            str(conn_params.get("host")),
+            int(conn_params.get("port") or 5432),
+            str(conn_params.get("database")),
+            str(conn_params.get("user")),
+        )
+
+    def get_pool(
+        self,
+        name: str,
+        conn_params: Dict[str, Any],
+        **pool_options: Any
+    ) -> ManagedConnectionPool:
+        """
+        Obtener el pool de una base de datos (crearlo si no existe o está cerrado).
+
+        Args:
+            name: Nombre lógico del pool ('datalake', 'dwh', ...)
+            conn_params: Parámetros de psycopg2.connect (host, port, database, user, password)
+            **pool_options: Opciones de ManagedConnectionPool para crearlo
+                (min_connections, max_connections, max_lifetime, wait_timeout, pre_ping)
+
+        Returns:
+            Pool compartido para esa base de datos
+        """
+        key = self.make_key(name, conn_params)
+
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None or pool.closed:
+                pool = ManagedConnectionPool(**pool_options, **conn_params)
+                self._pools[key] = pool
+                logger.info(
+                    f"Pool '{name}' creado "
+                    f"({pool.min_connections}-{pool.max_connections}) → "
+                    f"{key[1]}:{key[2]}/{key[3]}"
+                )
+            return pool
+
+    def close_pool(self, name: str, conn_params: Dict[str, Any]):
+        """
+        Cerrar y eliminar el pool de una base de datos.
+
+        Args:
+            name: Nombre lógico del pool
+            conn_params: Parámetros de conexión usados para crearlo
+        """
+        with self._lock:
+            pool = self._pools.pop(self.make_key(name, conn_params), None)
+        if pool is not None:
+            pool.closeall()
+
+    def close_all(self):
+        """Cerrar todos los pools."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.closeall()
+        logger.info(f"{len(pools)} pools de conexiones cerrados")
+
+    def reset(self):
+        """
+        Olvidar los pools sin cerrarlos.
+
+        Usar en procesos hijos (fork): las conexiones heredadas pertenecen al
+        proceso padre y no deben usarse ni cerrarse desde el hijo.
+        """
+        with self._lock:
+            self._pools.clear()
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtener métricas de todos los pools.
+
+        Returns:
+            Diccionario {nombre: métricas del pool}
+        """
+        with self._lock:
+            pools = list(self._pools.items())
+        return {key[0]: pool.get_metrics() for key, pool in pools}
+
+
+# Instancia global (no abre conexiones hasta el primer get_pool)
+pool_manager = PoolManager()
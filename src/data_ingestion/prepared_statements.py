@@ -0,0 +1,164 @@
+"""
+Caché de sentencias preparadas por conexión.
+
+La primera vez que una conexión ve un SQL se ejecuta PREPARE; las siguientes
+solo EXECUTE, evitando que PostgreSQL vuelva a parsear y planificar la misma
+sentencia en cada lote. Cada conexión mantiene un LRU de sentencias: al
+superar el máximo se hace DEALLOCATE de la menos usada recientemente.
+
+Las sentencias preparadas no son transaccionales: sobreviven a ROLLBACK y
+solo desaparecen al cerrar la conexión, por eso el caché vive en la conexión.
+
+Se usa para las sentencias cortas que se repiten en cada lote o paso
+(checkpoint, rechazos, logs de carga). Los INSERT paginados de execute_many
+no la usan: cada página de 1000 filas ya es una sola sentencia y prepararla
+no mostró diferencia medible en scripts/benchmark_execute_many.py.
+"""
+
+import itertools
+import re
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from psycopg2.extras import execute_batch
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Placeholders de psycopg2: %s (posicional) y %% (literal)
+_PLACEHOLDER_RE = re.compile(r"%(%|s|\()")
+
+# Nombres únicos en el proceso: dos cachés pueden compartir una sesión
+_statement_ids = itertools.count(1)
+
+
+def to_server_placeholders(query: str) -> Tuple[str, int]:
+    """
+    Convertir placeholders de psycopg2 (%s) a parámetros de servidor ($1, $2...).
+
+    Args:
+        query: SQL con placeholders %s
+
+    Returns:
+        Tupla (SQL con $n, número de parámetros)
+
+    Raises:
+        ValueError: Si el SQL usa placeholders con nombre (%(nombre)s)
+    """
+    count = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal count
+        token = match.group(1)
+        if token == "%":
+            return "%"
+        if token == "(":
+            raise ValueError("Las sentencias preparadas solo soportan placeholders %s")
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER_RE.sub(replace, query), count
+
+
+class PreparedStatementCache:
+    """Caché LRU de sentencias preparadas de una conexión."""
+
+    def __init__(self, max_size: int = 64):
+        """
+        Inicializar caché.
+
+        Args:
+            max_size: Máximo de sentencias preparadas por conexión
+        """
+        self.max_size = max_size
+        self._statements: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def prepare(self, cursor, query: str) -> Tuple[str, int]:
+        """
+        Obtener el nombre de la sentencia preparada para `query` (PREPARE si no existe).
+
+        Args:
+            cursor: Cursor de la conexión dueña del caché
+            query: SQL con placeholders %s
+
+        Returns:
+            Tupla (nombre de la sentencia, número de parámetros)
+        """
+        cached = self._statements.get(query)
+        if cached is not None:
+            self._statements.move_to_end(query)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        server_query, param_count = to_server_placeholders(query)
+
+        name = f"etl_stmt_{next(_statement_ids)}"
+        cursor.execute(f"PREPARE {name} AS {server_query}")
+
+        # Registrar solo si PREPARE tuvo éxito
+        self._statements[query] = (name, param_count)
+
+        if len(self._statements) > self.max_size:
+            _, (old_name, _) = self._statements.popitem(last=False)
+            cursor.execute(f"DEALLOCATE {old_name}")
+            logger.debug(f"Sentencia preparada {old_name} desalojada del caché")
+
+        return name, param_count
+
+    def execute(self, cursor, query: str, params: Optional[tuple] = None):
+        """
+        Ejecutar una sentencia preparada con un set de parámetros.
+
+        Args:
+            cursor: Cursor de la conexión dueña del caché
+            query: SQL con placeholders %s
+            params: Parámetros de la sentencia
+        """
+        name, param_count = self.prepare(cursor, query)
+        cursor.execute(self._execute_sql(name, param_count), params)
+
+    def execute_batch(self, cursor, query: str, data: List[tuple], page_size: int = 1000):
+        """
+        Ejecutar una sentencia preparada con múltiples sets de parámetros.
+
+        Los EXECUTE se agrupan de a `page_size` por viaje al servidor.
+
+        Args:
+            cursor: Cursor de la conexión dueña del caché
+            query: SQL con placeholders %s
+            data: Lista de tuplas con parámetros
+            page_size: Sentencias EXECUTE por viaje al servidor
+        """
+        name, param_count = self.prepare(cursor, query)
+        execute_batch(cursor, self._execute_sql(name, param_count), data, page_size=page_size)
+
+    @staticmethod
+    def _execute_sql(name: str, param_count: int) -> str:
+        if not param_count:
+            return f"EXECUTE {name}"
+        return f"EXECUTE {name} ({', '.join(['%s'] * param_count)})"
+
+
+def get_statement_cache(conn, max_size: int = 64) -> PreparedStatementCache:
+    """
+    Obtener (o crear) el caché de sentencias preparadas de una conexión.
+
+    Args:
+        conn: Conexión ManagedConnection
+        max_size: Tamaño máximo del caché si hay que crearlo
+
+    Returns:
+        Caché de la conexión
+    """
+    cache = conn.statement_cache
+    if cache is None:
+        cache = PreparedStatementCache(max_size=max_size)
+        conn.statement_cache = cache
+    return cache
@@ -0,0 +1,325 @@
+"""
+Instrumentación de queries SQL.
+
+Los cursores instrumentados miden cada sentencia (duración, filas afectadas
+y punto del código que la originó) y acumulan estadísticas por sentencia
+normalizada en `query_stats`. Las sentencias que superan
+`settings.slow_query_threshold_ms` se registran en el slow-query log, con
+un EXPLAIN (ANALYZE, BUFFERS) opcional para los SELECT.
+
+DatabaseConnection.get_cursor (y por herencia DWHConnection) usa estos
+cursores cuando `settings.query_instrumentation` está activo.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+
+from src.config.settings import settings
+from src.utils.logger import get_logger, setup_logger
+
+logger = get_logger(__name__)
+
+# Frames que no cuentan como "origen" de una query
+_INTERNAL_FILES = {
+    "query_instrumentation.py",
+    "db_connection.py",
+    "dwh_connection.py",
+    "batch_execution.py",
+    "prepared_statements.py",
+    "contextlib.py",
+}
+_PSYCOPG2_DIR = os.path.dirname(psycopg2.__file__)
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|-?\b\d+(?:\.\d+)?\b")
+_VALUES_RE = re.compile(r"\bVALUES\b.*", re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# CTEs que modifican datos: WITH x AS (INSERT/UPDATE/DELETE ...) SELECT ...
+_MODIFYING_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+# Solo se normalizan los primeros caracteres: los INSERT multi-fila pueden
+# medir cientos de KB y la clave no necesita más
+_NORMALIZE_PREFIX = 2000
+_KEY_LENGTH = 200
+
+_slow_logger = None
+_slow_logger_lock = threading.Lock()
+
+
+def normalize_sql(query: Any) -> str:
+    """
+    Normalizar una sentencia para agrupar estadísticas.
+
+    Colapsa espacios, reemplaza literales por `?` y recorta las listas
+    VALUES, de modo que el mismo INSERT con distintos datos cae en la misma
+    clave.
+
+    Args:
+        query: SQL (str o bytes, ya con los parámetros interpolados o no)
+
+    Returns:
+        Clave normalizada
+    """
+    if isinstance(query, bytes):
+        query = query[:_NORMALIZE_PREFIX].decode("utf-8", errors="replace")
+    else:
+        query = str(query)[:_NORMALIZE_PREFIX]
+
+    query = _VALUES_RE.sub("VALUES ...", query)
+    query = _LITERAL_RE.sub("?", query)
+    query = _WHITESPACE_RE.sub(" ", query).strip()
+    return query[:_KEY_LENGTH]
+
+
+def find_call_site() -> str:
+    """
+    Encontrar el primer frame fuera de las capas de conexión y de psycopg2.
+
+    Returns:
+        Origen como 'archivo.py:línea (función)'
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            os.path.basename(filename) not in _INTERNAL_FILES
+            and not filename.startswith(_PSYCOPG2_DIR)
+        ):
+            return f"{os.path.basename(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "desconocido"
+
+
+def _get_slow_logger():
+    """Logger del slow-query log (se crea con la primera query lenta)."""
+    global _slow_logger
+    if _slow_logger is None:
+        with _slow_logger_lock:
+            if _slow_logger is None:
+                _slow_logger = setup_logger(
+                    "slow_queries",
+                    log_file=settings.slow_query_log_file
+                )
+    return _slow_logger
+
+
+class QueryStats:
+    """Acumulador thread-safe de estadísticas por sentencia normalizada."""
+
+    def __init__(self):
+        """Inicializar acumulador vacío."""
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+
+    def record(self, query: Any, duration: float, rows: int, call_site: str):
+        """
+        Registrar una ejecución.
+
+        Args:
+            query: SQL ejecutado
+            duration: Duración en segundos
+            rows: Filas afectadas / retornadas (-1 si no aplica)
+            call_site: Origen de la query
+        """
+        key = normalize_sql(query)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = {
+                    "query": key,
+                    "calls": 0,
+                    "total_s": 0.0,
+                    "max_s": 0.0,
+                    "rows": 0,
+                    "call_sites": set(),
+                }
+                self._stats[key] = entry
+            entry["calls"] += 1
+            entry["total_s"] += duration
+            entry["max_s"] = max(entry["max_s"], duration)
+            entry["rows"] += max(rows, 0)
+            entry["call_sites"].add(call_site)
+
+    def reset(self):
+        """Descartar las estadísticas acumuladas."""
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.perf_counter()
+
+    def summary(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Obtener estadísticas ordenadas por tiempo total (descendente).
+
+        Args:
+            top: Máximo de sentencias a retornar (None = todas)
+
+        Returns:
+            Lista de diccionarios con query, calls, total_s, avg_s, max_s,
+            rows y call_sites
+        """
+        with self._lock:
+            entries = [
+                {**entry, "call_sites": sorted(entry["call_sites"])}
+                for entry in self._stats.values()
+            ]
+
+        for entry in entries:
+            entry["avg_s"] = entry["total_s"] / entry["calls"]
+
+        entries.sort(key=lambda e: e["total_s"], reverse=True)
+        return entries[:top] if top else entries
+
+    def log_summary(self, top: int = 10, log=None):
+        """
+        Escribir en el log un resumen de la ejecución (top sentencias por tiempo).
+
+        Args:
+            top: Número de sentencias a mostrar
+            log: Logger a usar (por defecto el de este módulo)
+        """
+        log = log or logger
+        entries = self.summary()
+        if not entries:
+            log.info("📊 Sin queries instrumentadas en esta ejecución")
+            return
+
+        total_calls = sum(e["calls"] for e in entries)
+        total_time = sum(e["total_s"] for e in entries)
+        wall_time = time.perf_counter() - self.started_at
+
+        log.info("=" * 70)
+        log.info(
+            f"📊 QUERIES: {total_calls:,} sentencias, {len(entries)} distintas, "
+            f"{total_time:.2f}s en BD de {wall_time:.2f}s totales"
+        )
+        for entry in entries[:top]:
+            share = 100 * entry["total_s"] / total_time if total_time else 0.0
+            log.info(
+                f"  {entry['total_s']:8.3f}s {share:5.1f}% | {entry['calls']:6,}x | "
+                f"prom {entry['avg_s'] * 1000:8.2f}ms | máx {entry['max_s'] * 1000:8.2f}ms | "
+                f"{entry['rows']:10,} filas | {entry['query'][:80]}"
+            )
+            log.info(f"      ↳ {', '.join(entry['call_sites'][:3])}")
+        log.info("=" * 70)
+
+
+# Estadísticas globales del proceso
+query_stats = QueryStats()
+
+
+class _InstrumentedMixin:
+    """Mide execute / executemany / copy_expert y reporta queries lentas."""
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._record(query, vars, time.perf_counter() - start)
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._record(query, None, time.perf_counter() - start)
+
+    def copy_expert(self, sql, file, size=8192):
+        start = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            self._record(sql, None, time.perf_counter() - start)
+
+    def _record(self, query, vars, duration: float):
+        call_site = find_call_site()
+        query_stats.record(query, duration, self.rowcount, call_site)
+
+        if duration * 1000 >= settings.slow_query_threshold_ms:
+            self._log_slow_query(query, vars, duration, call_site)
+
+    def _log_slow_query(self, query, vars, duration: float, call_site: str):
+        slow_logger = _get_slow_logger()
+        slow_logger.warning(
+            f"🐢 Query lenta ({duration * 1000:.1f}ms, {self.rowcount} filas) "
+            f"desde {call_site}: {normalize_sql(query)}"
+        )
+
+        if settings.slow_query_explain:
+            plan = self._explain(query, vars)
+            if plan:
+                slow_logger.warning("Plan de ejecución:\n" + plan)
+
+    def _explain(self, query, vars) -> Optional[str]:
+        """
+        Capturar EXPLAIN (ANALYZE, BUFFERS) de una query lenta.
+
+        ANALYZE vuelve a ejecutar la sentencia, por eso solo se aplica a
+        SELECT / WITH sin CTEs que modifiquen datos, y sus efectos (p. ej.
+        funciones llamadas desde el SELECT) se deshacen siempre con ROLLBACK
+        TO SAVEPOINT.
+        """
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", errors="replace")
+        if not _EXPLAINABLE_RE.match(query) or _MODIFYING_RE.search(query):
+            return None
+
+        conn = self.connection
+        if conn.get_transaction_status() == extensions.TRANSACTION_STATUS_INERROR:
+            return None
+
+        # Cursor sin instrumentar para no medir el propio EXPLAIN; el savepoint
+        # descarta lo que haya hecho la re-ejecución y evita que un EXPLAIN
+        # fallido aborte la transacción en curso
+        with conn.cursor(cursor_factory=extensions.cursor) as cursor:
+            try:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            except psycopg2.Error as e:
+                logger.debug(f"No se pudo capturar EXPLAIN: {e}")
+                return None
+
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", vars)
+                return "\n".join(row[0] for row in cursor.fetchall())
+            except psycopg2.Error as e:
+                logger.debug(f"No se pudo capturar EXPLAIN: {e}")
+                return None
+            finally:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+                except psycopg2.Error:
+                    pass
+
+
+class InstrumentedCursor(_InstrumentedMixin, extensions.cursor):
+    """Cursor estándar (tuplas) instrumentado."""
+
+
+class InstrumentedDictCursor(_InstrumentedMixin, RealDictCursor):
+    """RealDictCursor instrumentado."""
+
+
+def get_cursor_factory(dict_cursor: bool = False):
+    """
+    Cursor factory según configuración.
+
+    Args:
+        dict_cursor: Si True, resultados como dict
+
+    Returns:
+        Clase de cursor instrumentada, o la estándar si la instrumentación
+        está desactivada
+    """
+    if not settings.query_instrumentation:
+        return RealDictCursor if dict_cursor else extensions.cursor
+    return InstrumentedDictCursor if dict_cursor else InstrumentedCursor
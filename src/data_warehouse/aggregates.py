@@ -0,0 +1,151 @@
+"""
+Tablas agregadas del Data Warehouse (agg_homicidios_*).
+
+Cada tabla guarda los totales de fact_homicidios por un grupo (mes,
+departamento, municipio, sexo) y las vistas v_homicidios_* leen de ellas,
+así una consulta del dashboard no re-agrega la tabla de hechos completa.
+
+Mantenimiento incremental: fact_homicidios solo recibe inserciones, así que
+basta sumar a los grupos los hechos con homicidio_key posterior al último
+agregado. Cada tabla guarda esa posición en agg_checkpoint y la actualiza en
+la misma transacción que los totales, por lo que un refresco fallido o
+repetido no cuenta hechos dos veces. Sin checkpoint (primera ejecución), o si
+el refresco incremental falla, la tabla se recalcula completa.
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AggregateSpec(NamedTuple):
+    """Tabla agregada y su agrupación sobre fact_homicidios (alias h)."""
+
+    table: str
+    key_columns: str     # Columnas de agrupación en la tabla agregada
+    select_keys: str     # Expresiones equivalentes sobre los hechos
+    primary_key: str     # Llave primaria de la tabla agregada (ON CONFLICT)
+    join: str = ""
+
+
+# Tablas agregadas detrás de las vistas v_homicidios_*
+AGGREGATES: Dict[str, AggregateSpec] = {
+    'mes': AggregateSpec(
+        'agg_homicidios_por_mes',
+        'año, mes, nombre_mes',
+        'f.año, f.mes, f.nombre_mes',
+        'año, mes',
+        'JOIN dim_fecha f ON h.fecha_key = f.fecha_key',
+    ),
+    'departamento': AggregateSpec('agg_homicidios_por_departamento', 'cod_depto', 'h.cod_depto', 'cod_depto'),
+    'municipio': AggregateSpec('agg_homicidios_por_municipio', 'cod_mpio', 'h.cod_mpio', 'cod_mpio'),
+    'sexo': AggregateSpec('agg_homicidios_por_sexo', 'sexo_key', 'h.sexo_key', 'sexo_key'),
+}
+
+
+class AggregateRefresher:
+    """Refresco incremental (o completo) de las tablas agg_homicidios_*."""
+
+    def __init__(self, dwh: DatabaseConnection, aggregates: Optional[Dict[str, AggregateSpec]] = None):
+        """
+        Inicializar refrescador.
+
+        Args:
+            dwh: Conexión al Data Warehouse
+            aggregates: Tablas a mantener (default: AGGREGATES)
+        """
+        self.dwh = dwh
+        self.aggregates = aggregates or AGGREGATES
+
+    def _upsert_query(self, spec: AggregateSpec) -> str:
+        """INSERT de los totales del rango (desde, hasta] de homicidio_key, sumando a los existentes."""
+        return f"""
+            INSERT INTO {spec.table} ({spec.key_columns}, total_homicidios, total_victimas)
+            SELECT {spec.select_keys}, COUNT(*), SUM(h.cantidad)
+            FROM fact_homicidios h
+            {spec.join}
+            WHERE h.homicidio_key > %s AND h.homicidio_key <= %s
+            GROUP BY {spec.select_keys}
+            ON CONFLICT ({spec.primary_key}) DO UPDATE SET
+                total_homicidios = {spec.table}.total_homicidios + EXCLUDED.total_homicidios,
+                total_victimas = {spec.table}.total_victimas + EXCLUDED.total_victimas
+        """
+
+    def refresh_table(self, name: str, full: bool = False) -> int:
+        """
+        Refrescar una tabla agregada en una sola transacción.
+
+        Args:
+            name: Agregado ('mes', 'departamento', 'municipio', 'sexo')
+            full: Si True, vaciar y recalcular la tabla completa
+
+        Returns:
+            Número de grupos insertados o actualizados
+        """
+        spec = self.aggregates[name]
+
+        with self.dwh.get_cursor() as cursor:
+            # Serializa refrescos concurrentes de la misma tabla
+            cursor.execute(f"LOCK TABLE {spec.table} IN SHARE ROW EXCLUSIVE MODE")
+
+            cursor.execute("SELECT COALESCE(MAX(homicidio_key), 0) FROM fact_homicidios")
+            hasta = cursor.fetchone()[0]
+
+            cursor.execute("SELECT last_homicidio_key FROM agg_checkpoint WHERE table_name = %s", (spec.table,))
+            row = cursor.fetchone()
+
+            if full or row is None:
+                cursor.execute(f"TRUNCATE {spec.table}")
+                desde = 0
+            else:
+                desde = row[0]
+
+            groups = 0
+            if hasta > desde:
+                cursor.execute(self._upsert_query(spec), (desde, hasta))
+                groups = cursor.rowcount
+
+            cursor.execute(
+                """
+                INSERT INTO agg_checkpoint (table_name, last_homicidio_key, refreshed_at)
+                VALUES (%s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    last_homicidio_key = EXCLUDED.last_homicidio_key,
+                    refreshed_at = EXCLUDED.refreshed_at
+                """,
+                (spec.table, hasta)
+            )
+
+        modo = "completo" if desde == 0 else "incremental"
+        logger.info(f"{spec.table}: {groups} grupos ({modo}, homicidio_key ({desde}, {hasta}])")
+        return groups
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """
+        Refrescar todas las tablas agregadas.
+
+        Si el refresco incremental de una tabla falla se recalcula completa.
+
+        Args:
+            full: Si True, recalcular todas las tablas completas
+
+        Returns:
+            Diccionario {tabla: grupos insertados o actualizados}
+        """
+        logger.info(f"Refrescando tablas agregadas ({'completo' if full else 'incremental'})...")
+        results = {}
+
+        for name, spec in self.aggregates.items():
+            try:
+                results[spec.table] = self.refresh_table(name, full)
+            except Exception as e:
+                if full:
+                    raise
+                logger.warning(f"⚠️  Refresco incremental de {spec.table} falló ({e}); recalculando completa")
+                results[spec.table] = self.refresh_table(name, full=True)
+
+        logger.info("✅ Tablas agregadas actualizadas")
+        return results
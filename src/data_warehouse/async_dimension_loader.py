@@ -0,0 +1,223 @@
+"""
+Carga asíncrona de las dimensiones del DWH (asyncpg).
+
+Con ETL_ASYNC_DIMENSIONS=true los pasos dim_* del DAG de DWHETLLoader envían
+sus corrutinas a un único event loop (un hilo daemon) en vez de ocupar cada
+uno una conexión psycopg2 bloqueante: las lecturas del Data Lake y los
+upserts del DWH de las cuatro dimensiones se solapan sobre dos pools asyncpg
+chicos.
+
+Los pasos, dependencias, reintentos y conteos de etl_log no cambian: cada
+paso sigue siendo un Step del DAG que espera su corrutina con run(), y el
+SQL es el mismo de la carga síncrona (constantes DIM_* de dwh_etl_loader).
+"""
+
+import asyncio
+import threading
+from datetime import date
+from typing import Any, Coroutine, Optional, Tuple, TypeVar
+
+from src.data_ingestion.async_db_connection import AsyncDatabaseConnection, AsyncDWHConnection
+from src.data_warehouse.dwh_etl_loader import (
+    DIM_DEPARTAMENTO_EXTRACT,
+    DIM_DEPARTAMENTO_UPSERT,
+    DIM_FECHA_INSERT,
+    DIM_MUNICIPIO_EXTRACT,
+    DIM_MUNICIPIO_UPSERT,
+    DIM_SEXO_UPSERT,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Conexiones por pool: cuatro pasos de dimensión como máximo a la vez
+DATALAKE_POOL_SIZE = 2
+DWH_POOL_SIZE = 4
+
+
+class AsyncDimensionLoader:
+    """Upserts de dimensiones sobre asyncpg para un DWHETLLoader."""
+
+    def __init__(self, loader):
+        """
+        Inicializar pools asíncronos (se conectan al primer uso).
+
+        Args:
+            loader: DWHETLLoader dueño de esta carga; aporta el esquema
+                destino, el caché de llaves y los conteos de etl_log
+        """
+        self.loader = loader
+        self.datalake = AsyncDatabaseConnection(max_connections=DATALAKE_POOL_SIZE)
+        self.dwh = AsyncDWHConnection(schema=loader.schema, max_connections=DWH_POOL_SIZE)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop compartido por todos los pasos (se arranca al primer uso)."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="etl-async-dims",
+                    daemon=True
+                )
+                self._thread.start()
+                logger.info("🔄 Event loop de dimensiones asíncronas iniciado")
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Ejecutar una corrutina en el event loop y esperar su resultado.
+
+        Se llama desde los hilos del DAG; las excepciones de la corrutina se
+        propagan al paso (y a sus reintentos).
+
+        Example:
+            dims.run(dims.load_dim_departamento())
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    async def load_dim_departamento(self) -> int:
+        """
+        Cargar dim_departamento desde el Data Lake.
+
+        Returns:
+            Número de registros insertados o actualizados
+        """
+        logger.info("Cargando dim_departamento (async)...")
+
+        departamentos = await self.datalake.fetch(DIM_DEPARTAMENTO_EXTRACT)
+        if not departamentos:
+            logger.warning("No hay departamentos en Data Lake")
+            return 0
+
+        data = [tuple(d) for d in departamentos]
+        rows = await self.dwh.execute_many_returning(DIM_DEPARTAMENTO_UPSERT, data)
+        return self.loader._record_upsert_rows('dim_departamento', rows, len(data))
+
+    async def load_dim_municipio(self) -> int:
+        """
+        Cargar dim_municipio desde el Data Lake.
+
+        Returns:
+            Número de registros insertados o actualizados
+        """
+        logger.info("Cargando dim_municipio (async)...")
+
+        municipios = await self.datalake.fetch(DIM_MUNICIPIO_EXTRACT)
+        if not municipios:
+            logger.warning("No hay municipios en Data Lake")
+            return 0
+
+        data = [tuple(m) for m in municipios]
+        rows = await self.dwh.execute_many_returning(DIM_MUNICIPIO_UPSERT, data)
+        return self.loader._record_upsert_rows('dim_municipio', rows, len(data))
+
+    async def load_dim_sexo(self, seq_range: Optional[Tuple[int, int]] = None) -> int:
+        """
+        Cargar dim_sexo desde el Data Lake.
+
+        Args:
+            seq_range: Rango (desde, hasta] de ingest_seq a revisar (carga
+                incremental); None recorre raw_homicidios completa
+
+        Returns:
+            Número de registros nuevos
+        """
+        logger.info("Cargando dim_sexo (async)...")
+
+        conditions = ["sexo IS NOT NULL"]
+        if seq_range:
+            conditions.append("ingest_seq > %s AND ingest_seq <= %s")
+
+        sexos = await self.datalake.fetch(
+            f"""
+            SELECT DISTINCT sexo
+            FROM raw_homicidios
+            WHERE {' AND '.join(conditions)}
+            ORDER BY sexo
+            """,
+            seq_range
+        )
+
+        if not sexos:
+            if not seq_range:
+                logger.warning("No hay sexos en Data Lake")
+            return self.loader._record_dim_counts('dim_sexo', 0, 0, 0)
+
+        data = [tuple(s) for s in sexos]
+        nuevos = await self.dwh.execute_many_returning(DIM_SEXO_UPSERT, data)
+        self.loader.dim_cache.add('sexo', [tuple(n) for n in nuevos])
+
+        return self.loader._record_dim_counts('dim_sexo', len(nuevos), 0, len(data) - len(nuevos))
+
+    async def load_dim_fecha(self, seq_range: Optional[Tuple[int, int]] = None) -> int:
+        """
+        Cargar las fechas que falten en dim_fecha.
+
+        El rango sale de raw_homicidios (solo de las filas de seq_range en la
+        carga incremental, unido al de dim_fecha), igual que
+        DWHETLLoader.load_dim_fecha; ambas consultas de rango van en paralelo.
+
+        Args:
+            seq_range: Rango (desde, hasta] de ingest_seq (carga incremental)
+
+        Returns:
+            Número de fechas nuevas
+        """
+        logger.info("Cargando dim_fecha (async)...")
+
+        if seq_range:
+            nuevas_rango, actual = await asyncio.gather(
+                self.datalake.fetch(
+                    """
+                    SELECT MIN(fecha_hecho), MAX(fecha_hecho)
+                    FROM raw_homicidios
+                    WHERE ingest_seq > %s AND ingest_seq <= %s
+                    """,
+                    seq_range
+                ),
+                self.dwh.fetch("SELECT MIN(fecha), MAX(fecha) FROM dim_fecha")
+            )
+            nuevas_min, nuevas_max = nuevas_rango[0]
+
+            if nuevas_min is None:
+                return self.loader._record_dim_counts('dim_fecha', 0, 0, 0)
+
+            dim_min, dim_max = actual[0]
+            start_date = min(nuevas_min, dim_min) if dim_min else nuevas_min
+            end_date = max(nuevas_max, dim_max) if dim_max else nuevas_max
+        else:
+            result = await self.datalake.fetch("SELECT MIN(fecha_hecho), MAX(fecha_hecho) FROM raw_homicidios")
+            min_fecha, max_fecha = result[0]
+            start_date = min_fecha or date(2000, 1, 1)
+            end_date = max_fecha or date.today()
+
+        logger.info(f"Generando fechas faltantes desde {start_date} hasta {end_date}")
+
+        nuevas = await self.dwh.fetch(DIM_FECHA_INSERT, (start_date, end_date))
+        self.loader.dim_cache.add('fecha', [tuple(n) for n in nuevas])
+
+        dias = max((end_date - start_date).days + 1, 0)
+        return self.loader._record_dim_counts('dim_fecha', len(nuevas), 0, max(dias - len(nuevas), 0))
+
+    def close(self):
+        """Cerrar ambos pools y detener el event loop."""
+        if self._loop is None:
+            return
+
+        async def _close_pools():
+            await asyncio.gather(self.datalake.close(), self.dwh.close())
+
+        self.run(_close_pools())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+        logger.info("Event loop de dimensiones asíncronas detenido")
@@ -0,0 +1,204 @@
+"""
+Carga masiva de la tabla de hechos sin mantenimiento de índices.
+
+Durante una carga inicial cada fila insertada actualiza todos los índices
+secundarios y verifica cada llave foránea de fact_homicidios. En modo bulk
+las definiciones se leen del catálogo (pg_indexes / pg_constraint), se
+eliminan antes de cargar y se recrean al final: los índices en paralelo (una
+conexión por índice), las llaves foráneas como NOT VALID + VALIDATE (una sola
+pasada por constraint) y luego ANALYZE. Cada paso se reporta con su duración.
+
+Un fallo al recrear (p. ej. una fila huérfana que hace fallar VALIDATE) no
+corta la reconstrucción: se recrea todo lo posible, se ejecuta ANALYZE y al
+final se lanza RuntimeError. Las FKs que no validan quedan NOT VALID hasta
+que validate_pending() las valide.
+
+Example:
+    with FactIndexRebuild(dwh) as rebuild:
+        cargar_hechos_con_copy()
+    rebuild.timings  # {'drop': 0.01, 'index idx_fact_fecha': 1.2, ...}
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+import psycopg2
+
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FactIndexRebuild:
+    """Context manager: elimina índices secundarios y FKs y los recrea al salir."""
+
+    def __init__(self, dwh: DatabaseConnection, table: str = "fact_homicidios", parallel: int = 4):
+        """
+        Inicializar reconstrucción.
+
+        Args:
+            dwh: Conexión al Data Warehouse
+            table: Tabla de hechos
+            parallel: Índices a construir en simultáneo (limitado por el pool)
+        """
+        self.dwh = dwh
+        self.table = table
+        self.parallel = parallel
+        self.indexes: List[Tuple[str, str]] = []
+        self.foreign_keys: List[Tuple[str, str]] = []
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, step: str, func, *args):
+        inicio = time.perf_counter()
+        result = func(*args)
+        self.timings[step] = time.perf_counter() - inicio
+        logger.info(f"⏱️  {step}: {self.timings[step]:.2f}s")
+        return result
+
+    def capture(self):
+        """Leer del catálogo las definiciones de índices secundarios y FKs."""
+        # Índices que no respaldan una constraint (PK/UNIQUE se mantienen)
+        self.indexes = self.dwh.execute_query(
+            """
+            SELECT i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+            ORDER BY i.relname
+            """,
+            params=(self.table,),
+            fetch=True
+        )
+        self.foreign_keys = self.dwh.execute_query(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            ORDER BY conname
+            """,
+            params=(self.table,),
+            fetch=True
+        )
+        logger.info(
+            f"{self.table}: {len(self.indexes)} índices secundarios y "
+            f"{len(self.foreign_keys)} llaves foráneas a reconstruir"
+        )
+
+    def drop(self):
+        """Eliminar índices secundarios y FKs (una transacción)."""
+        with self.dwh.get_cursor() as cursor:
+            for name, _ in self.foreign_keys:
+                cursor.execute(f'ALTER TABLE {self.table} DROP CONSTRAINT "{name}"')
+            for name, _ in self.indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+    def _create_index(self, definition: str) -> float:
+        inicio = time.perf_counter()
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(definition)
+        return time.perf_counter() - inicio
+
+    def _create_indexes(self) -> List[str]:
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, self.parallel)) as executor:
+            futures = {
+                executor.submit(self._create_index, definition): name
+                for name, definition in self.indexes
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    self.timings[f"index {name}"] = future.result()
+                except psycopg2.Error as e:
+                    errors.append(f"index {name}: {e}")
+                    continue
+                logger.info(f"⏱️  index {name}: {self.timings[f'index {name}']:.2f}s")
+        return errors
+
+    def _validate_foreign_keys(self, names: List[str]) -> List[str]:
+        # Cada VALIDATE es independiente: una FK con huérfanos no frena al resto
+        errors = []
+        for name in names:
+            try:
+                self._timed(f"validate {name}", self.dwh.execute_query,
+                            f'ALTER TABLE {self.table} VALIDATE CONSTRAINT "{name}"')
+            except psycopg2.Error as e:
+                errors.append(f"validate {name}: {e}")
+        return errors
+
+    def _restore_foreign_keys(self) -> List[str]:
+        # NOT VALID evita revisar la tabla al crear; VALIDATE la revisa una vez
+        with self.dwh.get_cursor() as cursor:
+            for name, definition in self.foreign_keys:
+                cursor.execute(f'ALTER TABLE {self.table} ADD CONSTRAINT "{name}" {definition} NOT VALID')
+
+        return self._validate_foreign_keys([name for name, _ in self.foreign_keys])
+
+    def validate_pending(self):
+        """
+        Validar las FKs de la tabla que quedaron NOT VALID.
+
+        Una carga bulk cuyo VALIDATE falló deja la tabla con datos y FKs sin
+        validar; una carga posterior (con ON CONFLICT) no las revisaría.
+
+        Raises:
+            RuntimeError: Si alguna FK sigue sin validar
+        """
+        pending = self.dwh.execute_query(
+            """
+            SELECT conname
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f' AND NOT convalidated
+            ORDER BY conname
+            """,
+            params=(self.table,),
+            fetch=True
+        )
+        if not pending:
+            return
+
+        logger.info(f"{self.table}: validando {len(pending)} llaves foráneas pendientes")
+        errors = self._validate_foreign_keys([name for name, in pending])
+        if errors:
+            raise RuntimeError(f"{self.table} tiene FKs sin validar: " + "; ".join(errors))
+
+    def rebuild(self):
+        """
+        Recrear índices (en paralelo) y FKs, y actualizar estadísticas.
+
+        Raises:
+            RuntimeError: Si algún índice o FK no se pudo recrear o validar
+        """
+        errors = self._timed("indexes (paralelo)", self._create_indexes)
+        errors += self._timed("foreign keys", self._restore_foreign_keys)
+        self._timed("analyze", self.dwh.execute_query, f"ANALYZE {self.table}")
+
+        if errors:
+            for error in errors:
+                logger.error(f"❌ {self.table}: {error}")
+            raise RuntimeError(
+                f"Reconstrucción de {self.table} incompleta ({len(errors)} errores): "
+                + "; ".join(errors)
+            )
+
+    def __enter__(self) -> "FactIndexRebuild":
+        self.capture()
+        self._timed("drop", self.drop)
+        self._inicio_carga = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings["load"] = time.perf_counter() - self._inicio_carga
+        logger.info(f"⏱️  load: {self.timings['load']:.2f}s")
+
+        # Reconstruir siempre: la tabla no debe quedar sin índices ni FKs
+        inicio = time.perf_counter()
+        self.rebuild()
+        self.timings["rebuild"] = time.perf_counter() - inicio
+
+        resumen = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.timings.items())
+        logger.info(f"✅ Reconstrucción de {self.table} completada: {resumen}")
+        return False
@@ -0,0 +1,290 @@
+"""
+Panel diario municipio × sexo (agg_diario_municipio).
+
+Serie de tiempo densa con una fila por (cod_mpio, sexo_key, fecha) para cada
+municipio de dim_municipio, cada sexo de dim_sexo y cada fecha de dim_fecha,
+incluidos los días sin homicidios (totales en 0). Es la entrada de los modelos
+y del EDA, que así no repiten GROUP BY + reindexado en cada notebook.
+
+Mantenimiento incremental (refresh):
+    1. Combinaciones municipio × sexo nuevas en las dimensiones: se rellenan
+       para las fechas que ya tenía el panel.
+    2. Fechas de dim_fecha fuera del rango del panel: se insertan densas con
+       sus totales.
+    3. Hechos nuevos (homicidio_key posterior a agg_checkpoint) de fechas que
+       ya estaban en el panel: se suman a sus filas.
+Todo en una transacción junto con el checkpoint; sin checkpoint, o si el
+refresco incremental falla, el panel se recalcula completo.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PANEL_TABLE = "agg_diario_municipio"
+
+# Filas densas (municipio × sexo × fecha) con los totales de los hechos
+# hasta cierto homicidio_key; {fechas} filtra dim_fecha (alias f) y {extra}
+# agrega condiciones sobre municipio/sexo
+_DENSE_INSERT = f"""
+    INSERT INTO {PANEL_TABLE} (cod_mpio, sexo_key, fecha, total_homicidios, total_victimas)
+    SELECT
+        m.cod_mpio,
+        s.sexo_key,
+        f.fecha,
+        COALESCE(h.total_homicidios, 0),
+        COALESCE(h.total_victimas, 0)
+    FROM dim_municipio m
+    CROSS JOIN dim_sexo s
+    CROSS JOIN dim_fecha f
+    LEFT JOIN (
+        SELECT h.cod_mpio, h.sexo_key, h.fecha_key,
+               COUNT(*) AS total_homicidios, SUM(h.cantidad) AS total_victimas
+        FROM fact_homicidios h
+        JOIN dim_fecha f ON f.fecha_key = h.fecha_key
+        WHERE h.homicidio_key <= %(hasta)s AND {{fechas}}
+        GROUP BY h.cod_mpio, h.sexo_key, h.fecha_key
+    ) h ON h.cod_mpio = m.cod_mpio AND h.sexo_key = s.sexo_key AND h.fecha_key = f.fecha_key
+    WHERE {{fechas}} {{extra}}
+    ORDER BY m.cod_mpio, s.sexo_key, f.fecha
+"""
+
+# Totales de hechos nuevos sumados a filas existentes del panel
+_DELTA_UPSERT = f"""
+    INSERT INTO {PANEL_TABLE} (cod_mpio, sexo_key, fecha, total_homicidios, total_victimas)
+    SELECT h.cod_mpio, h.sexo_key, f.fecha, COUNT(*), SUM(h.cantidad)
+    FROM fact_homicidios h
+    JOIN dim_fecha f ON h.fecha_key = f.fecha_key
+    WHERE h.homicidio_key > %(desde)s AND h.homicidio_key <= %(hasta)s
+      AND f.fecha BETWEEN %(primera_fecha)s AND %(ultima_fecha)s
+    GROUP BY h.cod_mpio, h.sexo_key, f.fecha
+    ON CONFLICT (cod_mpio, sexo_key, fecha) DO UPDATE SET
+        total_homicidios = {PANEL_TABLE}.total_homicidios + EXCLUDED.total_homicidios,
+        total_victimas = {PANEL_TABLE}.total_victimas + EXCLUDED.total_victimas
+"""
+
+
+class DailyPanelRefresher:
+    """Refresco incremental (o completo) de agg_diario_municipio."""
+
+    def __init__(self, dwh: DatabaseConnection):
+        """
+        Inicializar refrescador.
+
+        Args:
+            dwh: Conexión al Data Warehouse
+        """
+        self.dwh = dwh
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Actualizar el panel diario.
+
+        Args:
+            full: Si True, vaciar y recalcular el panel completo
+
+        Returns:
+            Número de filas insertadas o actualizadas
+        """
+        try:
+            return self._refresh(full)
+        except Exception as e:
+            if full:
+                raise
+            logger.warning(f"⚠️  Refresco incremental de {PANEL_TABLE} falló ({e}); recalculando completo")
+            return self._refresh(full=True)
+
+    def _refresh(self, full: bool) -> int:
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {PANEL_TABLE} IN SHARE ROW EXCLUSIVE MODE")
+
+            cursor.execute("SELECT COALESCE(MAX(homicidio_key), 0) FROM fact_homicidios")
+            hasta = cursor.fetchone()[0]
+
+            cursor.execute("SELECT last_homicidio_key FROM agg_checkpoint WHERE table_name = %s", (PANEL_TABLE,))
+            row = cursor.fetchone()
+
+            full = full or row is None
+            params = {'desde': 0 if full else row[0], 'hasta': hasta, 'ultima_fecha': None}
+
+            if full:
+                cursor.execute(f"TRUNCATE {PANEL_TABLE}")
+            else:
+                # El panel es denso: la serie de cualquier combinación existente
+                # llega a la última fecha (búsqueda por la llave primaria)
+                cursor.execute(f"""
+                    SELECT MIN(fecha), MAX(fecha) FROM {PANEL_TABLE}
+                    WHERE (cod_mpio, sexo_key) = (
+                        SELECT cod_mpio, sexo_key FROM {PANEL_TABLE} LIMIT 1
+                    )
+                """)
+                params['primera_fecha'], params['ultima_fecha'] = cursor.fetchone()
+
+            rows = 0
+
+            if params['ultima_fecha'] is None:
+                # Panel vacío: todo es fecha nueva
+                cursor.execute(_DENSE_INSERT.format(fechas="TRUE", extra=""), params)
+                rows += cursor.rowcount
+            else:
+                # 1. Combinaciones municipio × sexo que aún no están en el panel
+                #    (hechos hasta el checkpoint; el paso 3 suma los posteriores)
+                combinacion_nueva = f"""
+                    NOT EXISTS (
+                        SELECT 1 FROM {PANEL_TABLE} p
+                        WHERE p.cod_mpio = m.cod_mpio AND p.sexo_key = s.sexo_key
+                          AND p.fecha = %(primera_fecha)s
+                    )
+                """
+                cursor.execute(
+                    f"SELECT m.cod_mpio, s.sexo_key FROM dim_municipio m CROSS JOIN dim_sexo s WHERE {combinacion_nueva}",
+                    params
+                )
+                nuevas = cursor.fetchall()
+                if nuevas:
+                    # Lista literal y no el NOT EXISTS: con estadísticas del
+                    # panel al día el anti-join se estima en 1 fila y el plan
+                    # (nested loop contra los hechos agregados) no termina
+                    cursor.execute(
+                        _DENSE_INSERT.format(
+                            fechas="f.fecha BETWEEN %(primera_fecha)s AND %(ultima_fecha)s",
+                            extra="AND (m.cod_mpio, s.sexo_key) IN "
+                                  "(SELECT * FROM unnest(%(nuevas_mpio)s::int[], %(nuevas_sexo)s::int[]))"
+                        ),
+                        dict(
+                            params,
+                            hasta=params['desde'],
+                            nuevas_mpio=[cod_mpio for cod_mpio, _ in nuevas],
+                            nuevas_sexo=[sexo_key for _, sexo_key in nuevas]
+                        )
+                    )
+                    rows += cursor.rowcount
+
+                # 2. Fechas nuevas (posteriores o anteriores al rango del panel), densas
+                cursor.execute(
+                    _DENSE_INSERT.format(
+                        fechas="(f.fecha > %(ultima_fecha)s OR f.fecha < %(primera_fecha)s)",
+                        extra=""
+                    ),
+                    params
+                )
+                rows += cursor.rowcount
+
+                # 3. Hechos nuevos de fechas que ya estaban en el panel
+                cursor.execute(_DELTA_UPSERT, params)
+                rows += cursor.rowcount
+
+            cursor.execute(
+                """
+                INSERT INTO agg_checkpoint (table_name, last_homicidio_key, refreshed_at)
+                VALUES (%s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    last_homicidio_key = EXCLUDED.last_homicidio_key,
+                    refreshed_at = EXCLUDED.refreshed_at
+                """,
+                (PANEL_TABLE, hasta)
+            )
+
+        modo = "completo" if full else "incremental"
+        logger.info(f"✅ {PANEL_TABLE}: {rows} filas ({modo}, homicidio_key ({params['desde']}, {hasta}])")
+        return rows
+
+
+def read_daily_panel(
+    dwh: DatabaseConnection,
+    cod_mpios: Optional[Sequence[int]] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    por_sexo: bool = True,
+    measure: str = "total_homicidios"
+) -> Dict[str, Any]:
+    """
+    Leer el panel diario como arrays de numpy (una fila por serie).
+
+    Requiere numpy (incluido en la imagen de Jupyter, no en la del ETL).
+
+    Args:
+        dwh: Conexión al Data Warehouse
+        cod_mpios: Municipios a leer (default: todos)
+        desde: Primera fecha (inclusive, opcional)
+        hasta: Última fecha (inclusive, opcional)
+        por_sexo: Si False, sumar los sexos (una serie por municipio)
+        measure: 'total_homicidios' o 'total_victimas'
+
+    Returns:
+        Diccionario con:
+            fechas: array datetime64[D] (n_fechas,)
+            cod_mpio: array (n_series,)
+            sexo_key: array (n_series,), solo si por_sexo
+            valores: array int64 (n_series, n_fechas)
+
+    Example:
+        panel = read_daily_panel(dwh, cod_mpios=[5001, 11001], desde=date(2020, 1, 1))
+        panel['valores'].sum(axis=1)  # total por serie
+    """
+    import numpy as np
+
+    if measure not in ("total_homicidios", "total_victimas"):
+        raise ValueError(f"Medida no soportada: {measure}")
+
+    conditions: List[str] = []
+    params: List[Any] = []
+
+    if cod_mpios is not None:
+        conditions.append("cod_mpio = ANY(%s)")
+        params.append(list(cod_mpios))
+    if desde:
+        conditions.append("fecha >= %s")
+        params.append(desde)
+    if hasta:
+        conditions.append("fecha <= %s")
+        params.append(hasta)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    series_keys = "cod_mpio, sexo_key" if por_sexo else "cod_mpio"
+
+    rows = dwh.execute_query(
+        f"""
+        SELECT {series_keys}, fecha, SUM({measure})
+        FROM {PANEL_TABLE}
+        {where}
+        GROUP BY {series_keys}, fecha
+        ORDER BY {series_keys}, fecha
+        """,
+        params=tuple(params),
+        fetch=True
+    )
+
+    n_keys = 2 if por_sexo else 1
+    if not rows:
+        empty = {
+            'fechas': np.array([], dtype='datetime64[D]'),
+            'cod_mpio': np.array([], dtype=np.int64),
+            'valores': np.zeros((0, 0), dtype=np.int64),
+        }
+        if por_sexo:
+            empty['sexo_key'] = np.array([], dtype=np.int64)
+        return empty
+
+    # Panel denso: todas las series tienen las mismas fechas, en orden
+    primera_serie = rows[0][:n_keys]
+    n_fechas = next(
+        (i for i, row in enumerate(rows) if row[:n_keys] != primera_serie),
+        len(rows)
+    )
+    n_series = len(rows) // n_fechas
+
+    valores = np.fromiter((row[-1] for row in rows), dtype=np.int64, count=len(rows))
+    result = {
+        'fechas': np.array([row[n_keys] for row in rows[:n_fechas]], dtype='datetime64[D]'),
+        'cod_mpio': np.array([row[0] for row in rows[::n_fechas]], dtype=np.int64),
+        'valores': valores.reshape(n_series, n_fechas),
+    }
+    if por_sexo:
+        result['sexo_key'] = np.array([row[1] for row in rows[::n_fechas]], dtype=np.int64)
+
+    return result
@@ -0,0 +1,187 @@
+"""
+Caché de llaves de dimensiones del Data Warehouse.
+
+Mantiene en memoria el mapeo llave natural → llave subrogada de cada
+dimensión (fecha → fecha_key, sexo → sexo_key) durante una ejecución del
+ETL, para que los lotes de hechos resuelvan llaves con búsquedas en un
+diccionario en vez de releer la dimensión completa en cada lote.
+
+Cada dimensión guarda un sello de versión (COUNT(*), MAX(llave)). Si una
+búsqueda falla, se compara el sello con el de la base de datos y, si otro
+proceso modificó la dimensión, se recarga. Las llaves que inserta el propio
+ETL se agregan con add() a partir del RETURNING del upsert.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DimensionSpec(NamedTuple):
+    """Tabla y columnas de una dimensión."""
+
+    table: str
+    natural_key: str
+    surrogate_key: str
+
+
+# Dimensiones con llave subrogada usadas por la tabla de hechos
+DIMENSIONS: Dict[str, DimensionSpec] = {
+    'fecha': DimensionSpec('dim_fecha', 'fecha', 'fecha_key'),
+    'sexo': DimensionSpec('dim_sexo', 'sexo', 'sexo_key'),
+}
+
+Version = Tuple[int, int]
+
+
+class DimensionKeyCache:
+    """Mapeos llave natural → llave subrogada, cargados una vez por ejecución."""
+
+    def __init__(self, dwh: DatabaseConnection, dimensions: Optional[Dict[str, DimensionSpec]] = None):
+        """
+        Inicializar caché (las dimensiones se cargan en el primer uso).
+
+        Args:
+            dwh: Conexión al Data Warehouse
+            dimensions: Dimensiones a cachear (default: DIMENSIONS)
+        """
+        self.dwh = dwh
+        self.dimensions = dimensions or DIMENSIONS
+        self._keys: Dict[str, Dict[Any, int]] = {}
+        self._versions: Dict[str, Version] = {}
+        # Llaves ya buscadas sin éxito con la versión actual (evita releer el sello)
+        self._missing: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _read_version(self, spec: DimensionSpec) -> Version:
+        result = self.dwh.execute_query(
+            f"SELECT COUNT(*), COALESCE(MAX({spec.surrogate_key}), 0) FROM {spec.table}",
+            fetch=True
+        )
+        count, max_key = result[0]
+        return int(count), int(max_key)
+
+    def _load(self, name: str):
+        spec = self.dimensions[name]
+        version = self._read_version(spec)
+        rows = self.dwh.execute_query(
+            f"SELECT {spec.natural_key}, {spec.surrogate_key} FROM {spec.table}",
+            fetch=True
+        )
+        # Actualizar en el lugar: quien tenga el dict de get_keys ve la recarga
+        keys = self._keys.setdefault(name, {})
+        keys.clear()
+        keys.update(rows)
+        self._versions[name] = version
+        self._missing[name] = set()
+        self.reloads += 1
+        logger.debug(f"Caché de {spec.table}: {len(rows)} llaves cargadas")
+
+    def get_keys(self, name: str) -> Dict[Any, int]:
+        """
+        Obtener el mapeo completo de una dimensión (cargarlo si hace falta).
+
+        Args:
+            name: Nombre de la dimensión ('fecha', 'sexo')
+
+        Returns:
+            Diccionario llave natural → llave subrogada
+        """
+        with self._lock:
+            if name not in self._keys:
+                self._load(name)
+            return self._keys[name]
+
+    def lookup(self, name: str, natural_key: Any) -> Optional[int]:
+        """
+        Resolver una llave; ante un fallo, recargar si la dimensión cambió.
+
+        Args:
+            name: Nombre de la dimensión
+            natural_key: Valor de la llave natural
+
+        Returns:
+            Llave subrogada, o None si no existe
+        """
+        keys = self.get_keys(name)
+        key = keys.get(natural_key)
+        if key is not None or natural_key is None:
+            return key
+
+        if natural_key in self._missing[name]:
+            return None
+
+        if self.refresh_if_stale(name):
+            key = self._keys[name].get(natural_key)
+        if key is None:
+            self._missing[name].add(natural_key)
+        return key
+
+    def refresh_if_stale(self, name: str) -> bool:
+        """
+        Recargar una dimensión si su sello de versión cambió en la base de datos.
+
+        Args:
+            name: Nombre de la dimensión
+
+        Returns:
+            True si se recargó
+        """
+        with self._lock:
+            if name not in self._keys:
+                self._load(name)
+                return True
+
+            if self._read_version(self.dimensions[name]) == self._versions[name]:
+                return False
+
+            logger.info(f"Dimensión {self.dimensions[name].table} modificada externamente, recargando caché")
+            self._load(name)
+            return True
+
+    def add(self, name: str, rows: Iterable[Tuple[int, Any]]):
+        """
+        Registrar llaves insertadas por el ETL (filas de RETURNING llave, natural).
+
+        Solo actualiza dimensiones ya cargadas; el sello avanza con las filas
+        nuevas para que no dispare una recarga innecesaria.
+
+        Args:
+            name: Nombre de la dimensión
+            rows: Tuplas (llave subrogada, llave natural)
+        """
+        with self._lock:
+            keys = self._keys.get(name)
+            if keys is None:
+                return
+
+            count, max_key = self._versions[name]
+            for surrogate, natural in rows:
+                if natural not in keys:
+                    count += 1
+                keys[natural] = surrogate
+                max_key = max(max_key, surrogate)
+                self._missing[name].discard(natural)
+            self._versions[name] = (count, max_key)
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Descartar el caché de una dimensión (o de todas).
+
+        Args:
+            name: Dimensión a descartar (None = todas)
+        """
+        with self._lock:
+            if name is None:
+                self._keys.clear()
+                self._versions.clear()
+                self._missing.clear()
+            else:
+                self._keys.pop(name, None)
+                self._versions.pop(name, None)
+                self._missing.pop(name, None)
@@ -3,52 +3,252 @@ Data Warehouse ETL Loader.
 Carga datos del Data Lake al Data Warehouse (modelo estrella).
 """
 
-from datetime import datetime, date
-from typing import Optional, Dict, List
-from uuid import UUID
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, date, timedelta
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Optional, Dict, List, NamedTuple, Tuple
 
+from src.config.settings import settings
 from src.data_ingestion.db_connection import DatabaseConnection
+from src.data_ingestion.pool_manager import pool_manager
+from src.data_warehouse.aggregates import AggregateRefresher
+from src.data_warehouse.bulk_load import FactIndexRebuild
+from src.data_warehouse.daily_panel import DailyPanelRefresher
+from src.data_warehouse.dimension_cache import DimensionKeyCache
 from src.data_warehouse.dwh_connection import DWHConnection
+from src.data_warehouse.shadow_rebuild import ShadowRebuild
+from src.etl.dag import SKIPPED, SUCCESS, Step, StepDAG, StepResult
 from src.utils.logger import get_logger
+from src.utils.memory import current_rss_mb, peak_rss_mb
+
+if TYPE_CHECKING:
+    from src.data_warehouse.async_dimension_loader import AsyncDimensionLoader
 
 logger = get_logger(__name__)
 
+# Columnas de dim_fecha y su cálculo a partir de una fecha `d`
+# (generate_series); 1=Lunes ... 7=Domingo, semana ISO
+DIM_FECHA_COLUMNS = """
+    fecha, año, mes, dia, trimestre, semana_año, dia_semana,
+    nombre_mes, nombre_dia_semana, es_fin_semana
+"""
+
+DIM_FECHA_ATTRIBUTES = """
+    d::date,
+    EXTRACT(YEAR FROM d),
+    EXTRACT(MONTH FROM d),
+    EXTRACT(DAY FROM d),
+    EXTRACT(QUARTER FROM d),
+    EXTRACT(WEEK FROM d),
+    EXTRACT(ISODOW FROM d),
+    (ARRAY['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+           'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+    )[EXTRACT(MONTH FROM d)],
+    (ARRAY['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+    )[EXTRACT(ISODOW FROM d)],
+    EXTRACT(ISODOW FROM d) IN (6, 7)
+"""
+
+# Fechas de [%s, %s] que faltan en dim_fecha, con atributos calculados en
+# PostgreSQL para todo el rango en una sola sentencia
+DIM_FECHA_INSERT = f"""
+    INSERT INTO dim_fecha ({DIM_FECHA_COLUMNS})
+    SELECT {DIM_FECHA_ATTRIBUTES}
+    FROM generate_series(%s::date, %s::date, INTERVAL '1 day') AS d
+    WHERE NOT EXISTS (
+        SELECT 1 FROM dim_fecha f WHERE f.fecha = d::date
+    )
+    ON CONFLICT (fecha) DO NOTHING
+    RETURNING fecha_key, fecha
+"""
+
+# Extracción del Data Lake y upsert condicional de las dimensiones (los
+# comparten DWHETLLoader y AsyncDimensionLoader). El upsert solo reescribe
+# filas distintas de las existentes; RETURNING (xmax = 0) separa inserciones
+DIM_DEPARTAMENTO_EXTRACT = """
+    SELECT DISTINCT ON (cod_dpto)
+        cod_dpto as cod_depto,
+        nom_dpto as nom_depto,
+        latitud as depto_latitud,
+        longitud as depto_longitud
+    FROM raw_divipola_departamentos
+    WHERE cod_dpto IS NOT NULL
+    ORDER BY cod_dpto
+"""
+
+DIM_DEPARTAMENTO_UPSERT = """
+    INSERT INTO dim_departamento (cod_depto, nom_depto, latitud, longitud)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (cod_depto) DO UPDATE SET
+        nom_depto = EXCLUDED.nom_depto,
+        latitud = EXCLUDED.latitud,
+        longitud = EXCLUDED.longitud
+    WHERE (dim_departamento.nom_depto, dim_departamento.latitud, dim_departamento.longitud)
+        IS DISTINCT FROM (EXCLUDED.nom_depto, EXCLUDED.latitud, EXCLUDED.longitud)
+    RETURNING (xmax = 0)
+"""
+
+DIM_MUNICIPIO_EXTRACT = """
+    SELECT DISTINCT ON (cod_mpio)
+        cod_mpio,
+        cod_dpto as cod_depto,
+        nom_mpio,
+        tipo as tipo_mpio,
+        latitud as mpio_latitud,
+        longitud as mpio_longitud
+    FROM raw_divipola_municipios
+    WHERE cod_mpio IS NOT NULL
+    ORDER BY cod_mpio
+"""
+
+DIM_MUNICIPIO_UPSERT = """
+    INSERT INTO dim_municipio (cod_mpio, cod_depto, nom_mpio, tipo, latitud, longitud)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (cod_mpio) DO UPDATE SET
+        cod_depto = EXCLUDED.cod_depto,
+        nom_mpio = EXCLUDED.nom_mpio,
+        tipo = EXCLUDED.tipo,
+        latitud = EXCLUDED.latitud,
+        longitud = EXCLUDED.longitud
+    WHERE (dim_municipio.cod_depto, dim_municipio.nom_mpio, dim_municipio.tipo,
+           dim_municipio.latitud, dim_municipio.longitud)
+        IS DISTINCT FROM (EXCLUDED.cod_depto, EXCLUDED.nom_mpio, EXCLUDED.tipo,
+                          EXCLUDED.latitud, EXCLUDED.longitud)
+    RETURNING (xmax = 0)
+"""
+
+# RETURNING alimenta el caché de llaves
+DIM_SEXO_UPSERT = """
+    INSERT INTO dim_sexo (sexo)
+    VALUES (%s)
+    ON CONFLICT (sexo) DO NOTHING
+    RETURNING sexo_key, sexo
+"""
+
+# Columnas de fact_homicidios que llena _load_fact_batch (en orden)
+FACT_COLUMNS = ('fecha_key', 'cod_depto', 'cod_mpio', 'sexo_key', 'zona', 'cantidad', 'source_id')
+
+
+class UpsertCounts(NamedTuple):
+    """Filas de una dimensión por resultado del upsert."""
+    
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+# Motivos de rechazo de una fila de hechos (fact_rejects.reason)
+REJECT_FECHA = 'fecha_desconocida'
+REJECT_SEXO = 'sexo_desconocido'
+
+# Tabla origen de la marca de agua en etl_checkpoint
+CHECKPOINT_SOURCE = 'raw_homicidios'
+
+# Pasos del DAG de carga (ver _run_steps)
+DIMENSION_STEPS = ('dim_departamento', 'dim_municipio', 'dim_sexo', 'dim_fecha')
+FACT_STEPS = ('fact_rejects', 'fact_homicidios')
+# Pasos que no suman a los conteos por tabla (tablas derivadas, reconstrucción)
+UNCOUNTED_STEPS = ('agg_homicidios', 'agg_diario_municipio', 'shadow_indexes', 'swap')
+
+# Intervalo de cada partición de la carga paralela de hechos
+PARTITION_INTERVALS = {
+    'year': '1 year',
+    'month': '1 month',
+}
+
 
 class DWHETLLoader:
     """Cargador ETL para Data Warehouse."""
     
-    def __init__(self):
-        """Inicializar loader."""
+    # Dimensiones que pueden cargarse con AsyncDimensionLoader
+    # (ETL_ASYNC_DIMENSIONS); False si la subclase no las pasa por Python
+    ASYNC_DIMENSIONS = True
+    
+    def __init__(self, schema: Optional[str] = None):
+        """
+        Inicializar loader.
+        
+        Args:
+            schema: Esquema del DWH donde cargar (None = tablas vivas). La
+                reconstrucción blue/green carga así el esquema sombra
+        """
+        self.schema = schema
         self.datalake = DatabaseConnection()  # Conexión al Data Lake
-        self.dwh = DWHConnection()  # Conexión al Data Warehouse
+        self.dwh = DWHConnection(schema=schema)  # Conexión al Data Warehouse
+        self.dim_cache = DimensionKeyCache(self.dwh)  # Llaves de dimensiones por ejecución
+        self.aggregates = AggregateRefresher(self.dwh)  # Tablas agg_homicidios_*
+        self.daily_panel = DailyPanelRefresher(self.dwh)  # Panel agg_diario_municipio
+        self.dim_counts: Dict[str, UpsertCounts] = {}  # Resultado de upserts por dimensión (etl_log)
+        self._async_dimensions = None  # AsyncDimensionLoader, creado al primer uso
         logger.info("DWHETLLoader inicializado")
     
     # ========================================================================
     # DIMENSIONES
     # ========================================================================
     
+    def _record_dim_counts(self, table: str, inserted: int, updated: int, unchanged: int) -> int:
+        """
+        Guardar y loguear el resultado del upsert de una dimensión.
+        
+        Returns:
+            Número de registros escritos (insertados + actualizados)
+        """
+        self.dim_counts[table] = UpsertCounts(inserted, updated, unchanged)
+        logger.info(f"✅ {table}: {inserted} nuevos, {updated} actualizados, {unchanged} sin cambios")
+        return inserted + updated
+    
+    def _upsert_dimension(self, table: str, query: str, data: list) -> int:
+        """
+        Ejecutar un upsert condicional (RETURNING xmax = 0) y contar resultados.
+        
+        Las filas iguales a las existentes no se reescriben (WHERE ... IS
+        DISTINCT FROM en el DO UPDATE), así que no vuelven en RETURNING.
+        
+        Returns:
+            Número de registros escritos (insertados + actualizados)
+        """
+        rows = self.dwh.execute_many_returning(query, data)
+        return self._record_upsert_rows(table, rows, len(data))
+    
+    def _record_upsert_rows(self, table: str, rows: list, total: int) -> int:
+        """
+        Contar el resultado de un upsert condicional a partir de sus filas RETURNING (xmax = 0).
+        
+        Args:
+            table: Dimensión
+            rows: Filas retornadas (una por fila insertada o actualizada)
+            total: Filas enviadas al upsert
+        
+        Returns:
+            Número de registros escritos (insertados + actualizados)
+        """
+        inserted = sum(1 for (is_insert,) in rows if is_insert)
+        return self._record_dim_counts(table, inserted, len(rows) - inserted, total - len(rows))
+    
+    @property
+    def async_dimensions(self) -> "AsyncDimensionLoader":
+        """Cargador asíncrono de dimensiones de este loader (mismo esquema)."""
+        if self._async_dimensions is None:
+            # Import diferido: asyncpg solo se carga si ETL_ASYNC_DIMENSIONS está activo
+            from src.data_warehouse.async_dimension_loader import AsyncDimensionLoader
+            self._async_dimensions = AsyncDimensionLoader(self)
+        return self._async_dimensions
+    
     def load_dim_departamento(self) -> int:
         """
         Cargar dimensión de departamentos desde Data Lake.
         
+        Solo escribe los departamentos nuevos o con algún atributo distinto.
+        
         Returns:
-            Número de registros cargados
+            Número de registros insertados o actualizados
         """
         logger.info("Cargando dim_departamento...")
         
         # Extraer departamentos únicos del Data Lake
-        query_extract = """
-            SELECT DISTINCT
-                cod_dpto as cod_depto,
-                nom_dpto as nom_depto,
-                latitud as depto_latitud,
-                longitud as depto_longitud
-            FROM raw_divipola_departamentos
-            ORDER BY cod_dpto
-        """
-        
         departamentos = self.datalake.execute_query(
-            query_extract,
+            DIM_DEPARTAMENTO_EXTRACT,
             fetch=True,
             dict_cursor=True
         )
@@ -57,16 +257,7 @@ class DWHETLLoader:
             logger.warning("No hay departamentos en Data Lake")
             return 0
         
-        # Insertar en DWH (UPSERT)
-        query_insert = """
-            INSERT INTO dim_departamento (cod_depto, nom_depto, latitud, longitud)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (cod_depto) DO UPDATE SET
-                nom_depto = EXCLUDED.nom_depto,
-                latitud = EXCLUDED.latitud,
-                longitud = EXCLUDED.longitud
-        """
-        
+        # Insertar en DWH (UPSERT solo si cambió; xmax = 0 identifica inserciones)
         data = [
             (
                 d['cod_depto'],
@@ -77,35 +268,22 @@ class DWHETLLoader:
             for d in departamentos
         ]
         
-        self.dwh.execute_many(query_insert, data)
-        
-        logger.info(f"✅ dim_departamento: {len(data)} registros cargados")
-        return len(data)
+        return self._upsert_dimension('dim_departamento', DIM_DEPARTAMENTO_UPSERT, data)
     
     def load_dim_municipio(self) -> int:
         """
         Cargar dimensión de municipios desde Data Lake.
         
+        Solo escribe los municipios nuevos o con algún atributo distinto.
+        
         Returns:
-            Número de registros cargados
+            Número de registros insertados o actualizados
         """
         logger.info("Cargando dim_municipio...")
         
         # Extraer municipios del Data Lake
-        query_extract = """
-            SELECT DISTINCT
-                cod_mpio,
-                cod_dpto as cod_depto,
-                nom_mpio,
-                tipo as tipo_mpio,
-                latitud as mpio_latitud,
-                longitud as mpio_longitud
-            FROM raw_divipola_municipios
-            ORDER BY cod_mpio
-        """
-        
         municipios = self.datalake.execute_query(
-            query_extract,
+            DIM_MUNICIPIO_EXTRACT,
             fetch=True,
             dict_cursor=True
         )
@@ -114,18 +292,7 @@ class DWHETLLoader:
             logger.warning("No hay municipios en Data Lake")
             return 0
         
-        # Insertar en DWH (UPSERT)
-        query_insert = """
-            INSERT INTO dim_municipio (cod_mpio, cod_depto, nom_mpio, tipo, latitud, longitud)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (cod_mpio) DO UPDATE SET
-                cod_depto = EXCLUDED.cod_depto,
-                nom_mpio = EXCLUDED.nom_mpio,
-                tipo = EXCLUDED.tipo,
-                latitud = EXCLUDED.latitud,
-                longitud = EXCLUDED.longitud
-        """
-        
+        # Insertar en DWH (UPSERT solo si cambió; xmax = 0 identifica inserciones)
         data = [
             (
                 m['cod_mpio'],
@@ -138,40 +305,39 @@ class DWHETLLoader:
             for m in municipios
         ]
         
-        self.dwh.execute_many(query_insert, data)
-        
-        logger.info(f"✅ dim_municipio: {len(data)} registros cargados")
-        return len(data)
+        return self._upsert_dimension('dim_municipio', DIM_MUNICIPIO_UPSERT, data)
     
-    def load_dim_sexo(self) -> int:
+    def load_dim_sexo(self, seq_range: Optional[Tuple[int, int]] = None) -> int:
         """
         Cargar dimensión de sexo desde Data Lake.
         
+        Args:
+            seq_range: Rango (desde, hasta] de ingest_seq a revisar (carga
+                incremental); None recorre raw_homicidios completa
+        
         Returns:
-            Número de registros cargados
+            Número de registros nuevos
         """
         logger.info("Cargando dim_sexo...")
         
-        # Extraer sexos únicos del Data Lake
-        query_extract = """
+        conditions = ["sexo IS NOT NULL"]
+        if seq_range:
+            conditions.append("ingest_seq > %s AND ingest_seq <= %s")
+        
+        # Extraer sexos únicos del Data Lake (o solo de las filas nuevas)
+        query_extract = f"""
             SELECT DISTINCT sexo
             FROM raw_homicidios
-            WHERE sexo IS NOT NULL
+            WHERE {' AND '.join(conditions)}
             ORDER BY sexo
         """
         
-        sexos = self.datalake.execute_query(query_extract, fetch=True, dict_cursor=False)
+        sexos = self.datalake.execute_query(query_extract, params=seq_range, fetch=True, dict_cursor=False)
         
         if not sexos:
-            logger.warning("No hay sexos en Data Lake")
-            return 0
-        
-        # Insertar en DWH (UPSERT)
-        query_insert = """
-            INSERT INTO dim_sexo (sexo)
-            VALUES (%s)
-            ON CONFLICT (sexo) DO NOTHING
-        """
+            if not seq_range:
+                logger.warning("No hay sexos en Data Lake")
+            return self._record_dim_counts('dim_sexo', 0, 0, 0)
         
         # Manejar tanto tuplas como dicts
         data = []
@@ -183,25 +349,54 @@ class DWHETLLoader:
             else:
                 data.append((str(s),))
         
-        self.dwh.execute_many(query_insert, data)
+        # Insertar en DWH (UPSERT); RETURNING alimenta el caché de llaves
+        nuevos = self.dwh.execute_many_returning(DIM_SEXO_UPSERT, data)
+        self.dim_cache.add('sexo', nuevos)
         
-        logger.info(f"✅ dim_sexo: {len(data)} registros cargados")
-        return len(data)
+        return self._record_dim_counts('dim_sexo', len(nuevos), 0, len(data) - len(nuevos))
     
-    def load_dim_fecha(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    def load_dim_fecha(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        seq_range: Optional[Tuple[int, int]] = None
+    ) -> int:
         """
         Cargar dimensión de fechas.
-        Genera fechas desde start_date hasta end_date.
+        Inserta las fechas entre start_date y end_date que falten en dim_fecha.
         
         Args:
             start_date: Fecha inicial (default: fecha mínima en homicidios)
             end_date: Fecha final (default: fecha máxima en homicidios)
+            seq_range: Rango (desde, hasta] de ingest_seq (carga incremental):
+                el rango de fechas sale solo de esas filas, unido al de
+                dim_fecha para que la dimensión quede sin huecos
         
         Returns:
-            Número de registros cargados
+            Número de fechas nuevas
         """
         logger.info("Cargando dim_fecha...")
         
+        if seq_range and not (start_date and end_date):
+            result = self.datalake.execute_query(
+                """
+                SELECT MIN(fecha_hecho), MAX(fecha_hecho)
+                FROM raw_homicidios
+                WHERE ingest_seq > %s AND ingest_seq <= %s
+                """,
+                params=seq_range,
+                fetch=True
+            )
+            nuevas_min, nuevas_max = result[0]
+            
+            if nuevas_min is None:
+                return self._record_dim_counts('dim_fecha', 0, 0, 0)
+            
+            actual = self.dwh.execute_query("SELECT MIN(fecha), MAX(fecha) FROM dim_fecha", fetch=True)
+            dim_min, dim_max = actual[0]
+            start_date = min(nuevas_min, dim_min) if dim_min else nuevas_min
+            end_date = max(nuevas_max, dim_max) if dim_max else nuevas_max
+        
         # Si no se especifican fechas, obtener del Data Lake
         if not start_date or not end_date:
             query_dates = """
@@ -220,84 +415,77 @@ class DWHETLLoader:
                 start_date = date(2000, 1, 1)
                 end_date = date.today()
         
-        logger.info(f"Generando fechas desde {start_date} hasta {end_date}")
-        
-        # Generar todas las fechas en el rango
-        from datetime import timedelta
+        logger.info(f"Generando fechas faltantes desde {start_date} hasta {end_date}")
         
-        current_date = start_date
-        fechas_data = []
+        # Solo fechas que aún no están en dim_fecha; RETURNING alimenta el caché de llaves
+        nuevas = self.dwh.execute_query(DIM_FECHA_INSERT, params=(start_date, end_date), fetch=True)
+        self.dim_cache.add('fecha', nuevas)
         
-        while current_date <= end_date:
-            # Calcular atributos de fecha
-            año = current_date.year
-            mes = current_date.month
-            dia = current_date.day
-            trimestre = (mes - 1) // 3 + 1
-            semana_año = current_date.isocalendar()[1]
-            dia_semana = current_date.isoweekday()  # 1=Lunes, 7=Domingo
-            
-            # Nombres
-            nombres_mes = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-                          'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
-            nombres_dia = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-            
-            nombre_mes = nombres_mes[mes - 1]
-            nombre_dia_semana = nombres_dia[dia_semana - 1]
-            
-            # Flags
-            es_fin_semana = dia_semana in [6, 7]  # Sábado o Domingo
-            
-            fechas_data.append((
-                current_date,
-                año,
-                mes,
-                dia,
-                trimestre,
-                semana_año,
-                dia_semana,
-                nombre_mes,
-                nombre_dia_semana,
-                es_fin_semana
-            ))
-            
-            current_date += timedelta(days=1)
-        
-        # Insertar en DWH (UPSERT)
-        query_insert = """
-            INSERT INTO dim_fecha (
-                fecha, año, mes, dia, trimestre, semana_año, dia_semana,
-                nombre_mes, nombre_dia_semana, es_fin_semana
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (fecha) DO NOTHING
-        """
-        
-        self.dwh.execute_many(query_insert, fechas_data)
-        
-        logger.info(f"✅ dim_fecha: {len(fechas_data)} registros cargados")
-        return len(fechas_data)
+        dias = max((end_date - start_date).days + 1, 0)
+        return self._record_dim_counts('dim_fecha', len(nuevas), 0, max(dias - len(nuevas), 0))
     
     # ========================================================================
     # TABLA DE HECHOS
     # ========================================================================
     
-    def load_fact_homicidios_initial(self, batch_size: int = 5000) -> int:
+    def load_fact_homicidios_initial(
+        self,
+        batch_size: int = 5000,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        max_seq: Optional[int] = None,
+        use_copy: bool = False,
+        sin_fecha: bool = False
+    ) -> int:
         """
         Carga inicial completa de fact_homicidios.
         
+        Lee raw_homicidios con un cursor del lado del servidor y escribe cada
+        lote en el DWH antes de leer el siguiente: la memoria queda acotada
+        por batch_size y no por el tamaño del histórico.
+        
+        Sin partición (desde/hasta/sin_fecha), al terminar guarda max_seq
+        como checkpoint de la carga incremental.
+        
         Args:
-            batch_size: Tamaño de lote para inserts
+            batch_size: Filas por lote (lectura e inserción)
+            desde: Cargar solo fecha_hecho >= desde (partición, opcional)
+            hasta: Cargar solo fecha_hecho < hasta (partición, opcional)
+            max_seq: Cargar solo ingest_seq <= max_seq (default: posición actual del Data Lake)
+            use_copy: Insertar con COPY (modo bulk: tabla vacía, sin ON CONFLICT)
+            sin_fecha: Cargar solo las filas con fecha_hecho NULL (partición
+                que las demás no cubren; todas terminan en fact_rejects)
         
         Returns:
             Número de registros cargados
         """
-        logger.info("🔄 Carga inicial de fact_homicidios...")
+        if sin_fecha:
+            rango = " [sin fecha]"
+        else:
+            rango = f" [{desde} → {hasta})" if desde or hasta else ""
+        logger.info(f"🔄 Carga inicial de fact_homicidios{rango}...")
+        
+        if max_seq is None:
+            max_seq = self.get_datalake_position()
+        
+        # Filtros: posición fija (filas ingeridas durante la carga quedan para
+        # la incremental) y, si es una partición, rango de fechas
+        conditions = ["ingest_seq <= %s"]
+        params = [max_seq]
+        
+        if sin_fecha:
+            conditions.append("fecha_hecho IS NULL")
+        if desde:
+            conditions.append("fecha_hecho >= %s")
+            params.append(desde)
+        if hasta:
+            conditions.append("fecha_hecho < %s")
+            params.append(hasta)
         
         # Extraer homicidios del Data Lake
-        query_extract = """
+        query_extract = f"""
             SELECT 
-                id,
+                ingest_seq,
                 fecha_hecho,
                 cod_depto,
                 cod_muni,
@@ -305,58 +493,179 @@ class DWHETLLoader:
                 zona,
                 cantidad
             FROM raw_homicidios
-            ORDER BY fecha_hecho, id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY fecha_hecho, ingest_seq
         """
         
-        homicidios = self.datalake.execute_query(
+        total_read = 0
+        total_loaded = 0
+        
+        lotes = self.datalake.iter_query(
             query_extract,
-            fetch=True,
-            dict_cursor=True
+            params=tuple(params),
+            itersize=batch_size,
+            dict_cursor=True,
+            batches=True
+        )
+        
+        for n_batch, batch in enumerate(lotes, start=1):
+            loaded = self._load_fact_batch(batch, use_copy)
+            total_read += len(batch)
+            total_loaded += loaded
+            logger.info(
+                f"Batch {n_batch}{rango}: {loaded} registros cargados "
+                f"({total_read} leídos, RSS {current_rss_mb():.1f} MB)"
+            )
+        
+        if not rango:
+            self.save_checkpoint(max_seq)
+        
+        if not total_read:
+            if not sin_fecha:
+                logger.warning(f"No hay homicidios en Data Lake{rango}")
+            return 0
+        
+        logger.info(
+            f"✅ fact_homicidios{rango}: {total_loaded} registros cargados "
+            f"(pico de memoria {peak_rss_mb():.1f} MB)"
+        )
+        return total_loaded
+    
+    def get_fact_partitions(self, partition: str = 'year') -> List[Tuple[date, date]]:
+        """
+        Rangos [desde, hasta) de fecha_hecho con datos en el Data Lake.
+        
+        Args:
+            partition: Granularidad de los rangos ('year' o 'month')
+        
+        Returns:
+            Lista de tuplas (desde, hasta) ordenadas
+        """
+        if partition not in PARTITION_INTERVALS:
+            raise ValueError(f"Partición no soportada: {partition} (usar year o month)")
+        
+        query = """
+            SELECT DISTINCT
+                date_trunc(%s, fecha_hecho)::date AS desde,
+                (date_trunc(%s, fecha_hecho) + %s::interval)::date AS hasta
+            FROM raw_homicidios
+            WHERE fecha_hecho IS NOT NULL
+            ORDER BY desde
+        """
+        
+        rows = self.datalake.execute_query(
+            query,
+            params=(partition, partition, PARTITION_INTERVALS[partition]),
+            fetch=True
         )
+        return [(desde, hasta) for desde, hasta in rows]
+    
+    def load_fact_homicidios_parallel(
+        self,
+        workers: int,
+        partition: str = 'year',
+        batch_size: int = 5000,
+        use_copy: bool = False
+    ) -> int:
+        """
+        Carga inicial de fact_homicidios en paralelo, un proceso por partición.
+        
+        Cada worker abre sus propias conexiones al Data Lake y al DWH y carga
+        un rango de fecha_hecho de forma independiente. Las dimensiones deben
+        estar cargadas antes (los workers solo resuelven llaves). Las filas
+        sin fecha_hecho no caen en ningún rango: se cargan aparte, en este
+        proceso, y van a fact_rejects antes de guardar el checkpoint.
+        
+        Args:
+            workers: Número de procesos
+            partition: Granularidad de los rangos ('year' o 'month')
+            batch_size: Filas por lote dentro de cada worker
+            use_copy: Insertar con COPY (modo bulk)
         
-        if not homicidios:
+        Returns:
+            Número de registros cargados
+        
+        Raises:
+            RuntimeError: Si alguna partición falla (las demás quedan cargadas)
+        """
+        partitions = self.get_fact_partitions(partition)
+        max_seq = self.get_datalake_position()
+        
+        # Sin esto el checkpoint pasaría por encima de ellas sin rechazarlas
+        self.load_fact_homicidios_initial(batch_size, max_seq=max_seq, use_copy=use_copy, sin_fecha=True)
+        
+        if not partitions:
             logger.warning("No hay homicidios en Data Lake")
+            self.save_checkpoint(max_seq)
             return 0
         
-        logger.info(f"Extraídos {len(homicidios)} registros del Data Lake")
+        logger.info(
+            f"🔄 Carga inicial paralela de fact_homicidios: "
+            f"{len(partitions)} particiones ({partition}), {workers} workers"
+        )
         
-        # Cargar en batches
         total_loaded = 0
+        failed = []
+        
+        # spawn: los hijos no heredan conexiones ni locks del proceso padre
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as executor:
+            futures = {
+                executor.submit(
+                    _load_fact_partition, desde, hasta, batch_size, max_seq, use_copy, self.schema
+                ): (desde, hasta)
+                for desde, hasta in partitions
+            }
+            
+            for future in as_completed(futures):
+                desde, hasta = futures[future]
+                try:
+                    loaded = future.result()
+                    total_loaded += loaded
+                    logger.info(f"✅ Partición [{desde} → {hasta}): {loaded} registros")
+                except Exception as e:
+                    failed.append(f"[{desde} → {hasta}): {e}")
+                    logger.error(f"❌ Partición [{desde} → {hasta}) falló: {e}")
+        
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} de {len(partitions)} particiones fallaron "
+                f"({total_loaded} registros cargados): " + "; ".join(failed)
+            )
         
-        for i in range(0, len(homicidios), batch_size):
-            batch = homicidios[i:i + batch_size]
-            loaded = self._load_fact_batch(batch)
-            total_loaded += loaded
-            logger.info(f"Batch {i//batch_size + 1}: {loaded} registros cargados")
+        self.save_checkpoint(max_seq)
         
-        logger.info(f"✅ fact_homicidios: {total_loaded} registros cargados")
+        logger.info(f"✅ fact_homicidios: {total_loaded} registros cargados en paralelo")
         return total_loaded
     
-    def load_fact_homicidios_incremental(self) -> int:
+    def load_fact_homicidios_incremental(
+        self,
+        batch_size: int = 5000,
+        seq_range: Optional[Tuple[int, int]] = None
+    ) -> int:
         """
         Carga incremental de fact_homicidios.
-        Solo carga registros nuevos desde la última carga.
+        Solo carga los registros ingeridos en el Data Lake después del checkpoint
+        (rango de ingest_seq) y luego avanza el checkpoint.
+        
+        Args:
+            batch_size: Filas por lote (lectura e inserción)
+            seq_range: Rango (desde, hasta] de ingest_seq (default: get_incremental_range())
         
         Returns:
             Número de registros cargados
         """
         logger.info("🔄 Carga incremental de fact_homicidios...")
         
-        # Obtener última fecha cargada en DWH
-        query_last_date = """
-            SELECT MAX(f.loaded_at) as ultima_carga
-            FROM fact_homicidios f
-        """
-        
-        result = self.dwh.execute_query(query_last_date, fetch=True)
-        ultima_carga = result[0][0] if result and result[0][0] else datetime(2000, 1, 1)
+        desde_seq, hasta_seq = seq_range or self.get_incremental_range()
         
-        logger.info(f"Última carga en DWH: {ultima_carga}")
+        if hasta_seq <= desde_seq:
+            logger.info("✅ No hay registros nuevos para cargar")
+            return 0
         
-        # Extraer solo registros nuevos del Data Lake
+        # Extraer solo registros nuevos del Data Lake (rango del índice de ingest_seq)
         query_extract = """
             SELECT 
-                id,
+                ingest_seq,
                 fecha_hecho,
                 cod_depto,
                 cod_muni,
@@ -364,57 +673,146 @@ class DWHETLLoader:
                 zona,
                 cantidad
             FROM raw_homicidios
-            WHERE loaded_at > %s
-            ORDER BY fecha_hecho, id
+            WHERE ingest_seq > %s AND ingest_seq <= %s
+            ORDER BY ingest_seq
         """
         
-        homicidios = self.datalake.execute_query(
+        total_read = 0
+        loaded = 0
+        
+        lotes = self.datalake.iter_query(
             query_extract,
-            params=(ultima_carga,),
-            fetch=True,
-            dict_cursor=True
+            params=(desde_seq, hasta_seq),
+            itersize=batch_size,
+            dict_cursor=True,
+            batches=True
         )
         
-        if not homicidios:
-            logger.info("✅ No hay registros nuevos para cargar")
-            return 0
+        for batch in lotes:
+            total_read += len(batch)
+            loaded += self._load_fact_batch(batch)
         
-        logger.info(f"Extraídos {len(homicidios)} registros nuevos")
+        logger.info(f"Extraídos {total_read} registros nuevos")
         
-        # Cargar batch
-        loaded = self._load_fact_batch(homicidios)
+        self.save_checkpoint(hasta_seq)
         
         logger.info(f"✅ fact_homicidios incremental: {loaded} registros cargados")
         return loaded
     
-    def _load_fact_batch(self, homicidios: List[Dict]) -> int:
+    # ========================================================================
+    # CHECKPOINT (posición del Data Lake ya cargada)
+    # ========================================================================
+    
+    def get_datalake_position(self) -> int:
+        """
+        Último ingest_seq de raw_homicidios en el Data Lake.
+        
+        Returns:
+            ingest_seq máximo, o 0 si la tabla está vacía
+        """
+        result = self.datalake.execute_query(
+            "SELECT COALESCE(MAX(ingest_seq), 0) FROM raw_homicidios",
+            fetch=True
+        )
+        return int(result[0][0])
+    
+    def get_checkpoint(self) -> Optional[int]:
+        """
+        Último ingest_seq cargado en el DWH.
+        
+        Returns:
+            ingest_seq del checkpoint, o None si aún no existe
+        """
+        result = self.dwh.execute_query(
+            "SELECT last_ingest_seq FROM etl_checkpoint WHERE source_name = %s",
+            params=(CHECKPOINT_SOURCE,),
+            fetch=True
+        )
+        return int(result[0][0]) if result else None
+    
+    def save_checkpoint(self, ingest_seq: int):
+        """
+        Guardar el último ingest_seq cargado en el DWH.
+        
+        Args:
+            ingest_seq: Posición del Data Lake ya procesada
+        """
+        self.dwh.execute_prepared(
+            """
+            INSERT INTO etl_checkpoint (source_name, last_ingest_seq, updated_at)
+            VALUES (%s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (source_name) DO UPDATE SET
+                last_ingest_seq = EXCLUDED.last_ingest_seq,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [(CHECKPOINT_SOURCE, ingest_seq)]
+        )
+        logger.info(f"Checkpoint {CHECKPOINT_SOURCE}: ingest_seq {ingest_seq}")
+    
+    def get_incremental_range(self) -> Tuple[int, int]:
+        """
+        Rango (desde, hasta] de ingest_seq pendiente de cargar.
+        
+        Sin checkpoint (instalaciones anteriores a etl_checkpoint) se deriva
+        una vez del criterio anterior: filas del Data Lake con loaded_at hasta
+        MAX(fact_homicidios.loaded_at).
+        
+        Returns:
+            Tupla (checkpoint, posición actual del Data Lake)
+        """
+        desde_seq = self.get_checkpoint()
+        
+        if desde_seq is None:
+            result = self.dwh.execute_query("SELECT MAX(loaded_at) FROM fact_homicidios", fetch=True)
+            ultima_carga = result[0][0] if result else None
+            
+            if ultima_carga:
+                result = self.datalake.execute_query(
+                    "SELECT COALESCE(MAX(ingest_seq), 0) FROM raw_homicidios WHERE loaded_at <= %s",
+                    params=(ultima_carga,),
+                    fetch=True
+                )
+                desde_seq = int(result[0][0])
+            else:
+                desde_seq = 0
+            
+            logger.warning(f"Sin checkpoint en etl_checkpoint; derivado de loaded_at: ingest_seq {desde_seq}")
+            self.save_checkpoint(desde_seq)
+        
+        hasta_seq = self.get_datalake_position()
+        logger.info(f"Rango incremental: ingest_seq ({desde_seq}, {hasta_seq}]")
+        return desde_seq, hasta_seq
+    
+    def _load_fact_batch(self, homicidios: List[Dict], use_copy: bool = False) -> int:
         """
         Cargar un batch de homicidios a fact table.
         
         Args:
             homicidios: Lista de registros de homicidios
+            use_copy: Insertar con COPY en vez de INSERT ... ON CONFLICT
         
         Returns:
-            Número de registros cargados
+            Número de registros cargados (sin los que ya existían)
         """
-        # Obtener mapeos de dimensiones
-        fecha_keys = self._get_fecha_keys()
-        sexo_keys = self._get_sexo_keys()
+        # Mapeos de dimensiones (en memoria, cargados una vez por ejecución)
+        fecha_keys = self.dim_cache.get_keys('fecha')
+        sexo_keys = self.dim_cache.get_keys('sexo')
         
-        # Preparar datos para inserción
+        # Preparar datos para inserción; las filas sin llave van a fact_rejects
         fact_data = []
+        rejects = []
         
         for h in homicidios:
-            # Lookup de keys
-            fecha_key = fecha_keys.get(h['fecha_hecho'])
-            sexo_key = sexo_keys.get(h['sexo'])
+            # Lookup de keys (ante un fallo, lookup recarga si la dimensión cambió)
+            fecha_key = fecha_keys.get(h['fecha_hecho']) or self.dim_cache.lookup('fecha', h['fecha_hecho'])
+            sexo_key = sexo_keys.get(h['sexo']) or self.dim_cache.lookup('sexo', h['sexo'])
             
             if not fecha_key:
-                logger.warning(f"Fecha no encontrada en dim_fecha: {h['fecha_hecho']}")
+                rejects.append((h['ingest_seq'], REJECT_FECHA, h['fecha_hecho']))
                 continue
             
             if not sexo_key:
-                logger.warning(f"Sexo no encontrado en dim_sexo: {h['sexo']}")
+                rejects.append((h['ingest_seq'], REJECT_SEXO, h['sexo']))
                 continue
             
             fact_data.append((
@@ -424,46 +822,162 @@ class DWHETLLoader:
                 sexo_key,
                 h['zona'],
                 h['cantidad'] or 1,
-                h['id']  # source_id
+                h['ingest_seq']  # source_id
             ))
         
+        if rejects:
+            self._save_rejects(rejects)
+        
         if not fact_data:
             return 0
         
-        # Insertar en fact table
+        if use_copy:
+            return self.dwh.copy_rows('fact_homicidios', FACT_COLUMNS, fact_data)
+        
+        # Insertar en fact table (source_id ya cargado: se omite)
         query_insert = """
             INSERT INTO fact_homicidios (
                 fecha_key, cod_depto, cod_mpio, sexo_key, zona, cantidad, source_id
             )
             VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
+            ON CONFLICT (source_id) DO NOTHING
+        """
+        
+        return self.dwh.execute_many(query_insert, fact_data)
+    
+    # ========================================================================
+    # RECHAZOS (fact_rejects)
+    # ========================================================================
+    
+    def _save_rejects(self, rejects: List[Tuple[int, str, object]]):
+        """
+        Registrar filas rechazadas de un batch y loguear un resumen.
+        
+        Se llama en cada lote con pocas filas: el upsert se prepara una vez
+        por conexión y los EXECUTE van en un solo viaje.
+        
+        Args:
+            rejects: Tuplas (ingest_seq, motivo, valor de la llave no encontrada)
         """
+        rejected_at = datetime.now()
         
-        self.dwh.execute_many(query_insert, fact_data)
+        query_insert = """
+            INSERT INTO fact_rejects (source_id, reason, valor, rejected_at)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (source_id) DO UPDATE SET
+                reason = EXCLUDED.reason,
+                valor = EXCLUDED.valor,
+                attempts = fact_rejects.attempts + 1,
+                rejected_at = EXCLUDED.rejected_at
+        """
         
-        return len(fact_data)
+        self.dwh.execute_prepared(
+            query_insert,
+            [
+                (source_id, reason, None if valor is None else str(valor), rejected_at)
+                for source_id, reason, valor in rejects
+            ]
+        )
+        
+        motivos = Counter(reason for _, reason, _ in rejects)
+        logger.warning(
+            f"⚠️  {len(rejects)} registros rechazados → fact_rejects ("
+            + ", ".join(f"{reason}: {n}" for reason, n in motivos.items()) + ")"
+        )
     
-    def _get_fecha_keys(self) -> Dict[date, int]:
-        """Obtener mapeo de fecha -> fecha_key."""
-        query = "SELECT fecha_key, fecha FROM dim_fecha"
-        results = self.dwh.execute_query(query, fetch=True)
-        return {row[1]: row[0] for row in results}
+    def reprocess_rejects(self, batch_size: int = 5000) -> int:
+        """
+        Reintentar la carga de las filas de fact_rejects.
+        
+        Relee las filas rechazadas del Data Lake (por ingest_seq) y las pasa
+        por _load_fact_batch: las que ahora resuelven sus llaves se cargan y
+        salen de fact_rejects; las demás quedan con attempts incrementado.
+        
+        Args:
+            batch_size: Filas por lote
+        
+        Returns:
+            Número de registros cargados
+        """
+        pendientes = self.dwh.execute_query(
+            "SELECT source_id FROM fact_rejects ORDER BY source_id",
+            fetch=True
+        )
+        
+        if not pendientes:
+            return 0
+        
+        logger.info(f"🔄 Reprocesando {len(pendientes)} registros de fact_rejects...")
+        
+        inicio = datetime.now()
+        source_ids = [row[0] for row in pendientes]
+        loaded = 0
+        
+        lotes = self.datalake.iter_query(
+            """
+            SELECT 
+                ingest_seq,
+                fecha_hecho,
+                cod_depto,
+                cod_muni,
+                sexo,
+                zona,
+                cantidad
+            FROM raw_homicidios
+            WHERE ingest_seq = ANY(%s)
+            ORDER BY ingest_seq
+            """,
+            params=(source_ids,),
+            itersize=batch_size,
+            dict_cursor=True,
+            batches=True
+        )
+        
+        for batch in lotes:
+            loaded += self._load_fact_batch(batch)
+        
+        # Rechazadas otra vez en este intento tienen rejected_at >= inicio;
+        # el resto se cargó (o ya no existe en el Data Lake)
+        self.dwh.execute_query(
+            "DELETE FROM fact_rejects WHERE source_id = ANY(%s) AND rejected_at < %s",
+            params=(source_ids, inicio)
+        )
+        
+        logger.info(f"✅ fact_rejects: {loaded} de {len(source_ids)} registros cargados")
+        return loaded
     
-    def _get_sexo_keys(self) -> Dict[str, int]:
-        """Obtener mapeo de sexo -> sexo_key."""
-        query = "SELECT sexo_key, sexo FROM dim_sexo"
-        results = self.dwh.execute_query(query, fetch=True)
-        return {row[1]: row[0] for row in results}
+    def _count_rejects_since(self, started_at: datetime) -> int:
+        """Filas rechazadas (nuevas o reintentadas) desde started_at."""
+        try:
+            result = self.dwh.execute_query(
+                "SELECT COUNT(*) FROM fact_rejects WHERE rejected_at >= %s",
+                params=(started_at,),
+                fetch=True
+            )
+            return int(result[0][0])
+        except Exception as e:
+            logger.warning(f"No se pudo contar fact_rejects: {e}")
+            return 0
     
     # ========================================================================
     # ORQUESTACIÓN
     # ========================================================================
     
-    def load_all_initial(self) -> Dict[str, int]:
+    def load_all_initial(self, workers: int = 1, partition: str = 'year', bulk: bool = False) -> Dict[str, int]:
         """
         Carga inicial completa del DWH.
         Carga todas las dimensiones y luego la tabla de hechos.
         
+        Los pasos se ejecutan como DAG (ver _run_steps): sexo y fecha en
+        paralelo con la geografía, hechos cuando están las cuatro
+        dimensiones, agregados y panel diario en paralelo al final.
+        
+        Args:
+            workers: Procesos para la tabla de hechos (1 = secuencial)
+            partition: Granularidad de las particiones si workers > 1 ('year' o 'month')
+            bulk: Cargar hechos con COPY sin índices secundarios ni FKs y
+                reconstruirlos al final (requiere fact_homicidios vacía)
+        
         Returns:
             Diccionario con conteo de registros por tabla
         """
@@ -473,18 +987,12 @@ class DWHETLLoader:
         
         started_at = datetime.now()
         results = {}
+        self.dim_counts = {}
         
         try:
-            # 1. Cargar dimensiones (orden importante por FKs)
-            results['dim_departamento'] = self.load_dim_departamento()
-            results['dim_municipio'] = self.load_dim_municipio()
-            results['dim_sexo'] = self.load_dim_sexo()
-            results['dim_fecha'] = self.load_dim_fecha()
-            
-            # 2. Cargar tabla de hechos
-            results['fact_homicidios'] = self.load_fact_homicidios_initial()
+            self._run_steps('initial_load', self._initial_steps(workers, partition, bulk), results)
             
-            # 3. Log de auditoría
+            # 4. Log de auditoría
             self._log_etl_process('initial_load', results, started_at, 'success')
             
             logger.info("=" * 70)
@@ -499,6 +1007,75 @@ class DWHETLLoader:
             self._log_etl_process('initial_load', results, started_at, 'failed', str(e))
             raise
     
+    def _initial_steps(self, workers: int, partition: str, bulk: bool) -> List[Step]:
+        """Pasos de la carga inicial completa (ver load_all_initial)."""
+        return self._dimension_steps() + [
+            # 2. Tabla de hechos (bulk sin reintentos, ver _load_facts_step)
+            Step(
+                'fact_homicidios',
+                lambda: self._load_facts_step(workers, partition, bulk),
+                DIMENSION_STEPS,
+                retries=0 if bulk else None
+            ),
+            
+            # 3. Recalcular tablas agregadas y panel diario
+            Step('agg_homicidios', lambda: sum(self.aggregates.refresh(full=True).values()), ('fact_homicidios',)),
+            Step('agg_diario_municipio', lambda: self.daily_panel.refresh(full=True), ('fact_homicidios',)),
+        ]
+    
+    def _dimension_steps(self, seq_range: Optional[Tuple[int, int]] = None) -> List[Step]:
+        """
+        Pasos de las cuatro dimensiones (municipio referencia a departamento).
+        
+        Con ETL_ASYNC_DIMENSIONS cada paso envía su corrutina al event loop de
+        AsyncDimensionLoader: los cuatro comparten un loop y pools asyncpg en
+        vez de ocupar una conexión bloqueante por hilo.
+        
+        Args:
+            seq_range: Rango (desde, hasta] de ingest_seq para sexo y fecha
+                (carga incremental); None revisa raw_homicidios completa
+        """
+        if settings.etl_async_dimensions and self.ASYNC_DIMENSIONS:
+            dims = self.async_dimensions
+            return [
+                Step('dim_departamento', lambda: dims.run(dims.load_dim_departamento())),
+                Step('dim_municipio', lambda: dims.run(dims.load_dim_municipio()), ('dim_departamento',)),
+                Step('dim_sexo', lambda: dims.run(dims.load_dim_sexo(seq_range))),
+                Step('dim_fecha', lambda: dims.run(dims.load_dim_fecha(seq_range))),
+            ]
+        
+        return [
+            Step('dim_departamento', self.load_dim_departamento),
+            Step('dim_municipio', self.load_dim_municipio, ('dim_departamento',)),
+            Step('dim_sexo', lambda: self.load_dim_sexo(seq_range)),
+            Step('dim_fecha', lambda: self.load_dim_fecha(seq_range=seq_range)),
+        ]
+    
+    def _fact_table_empty(self) -> bool:
+        result = self.dwh.execute_query("SELECT NOT EXISTS (SELECT 1 FROM fact_homicidios)", fetch=True)
+        return result[0][0]
+    
+    def _load_facts_step(self, workers: int, partition: str, bulk: bool) -> int:
+        # Una carga bulk fallida no se reintenta en la misma ejecución: el
+        # reintento vería la tabla con datos, cargaría 0 filas con ON CONFLICT
+        # y daría por buena una tabla con FKs sin validar
+        if bulk and self._fact_table_empty():
+            with FactIndexRebuild(self.dwh, parallel=max(workers, 4)):
+                return self._load_facts_initial(workers, partition, use_copy=True)
+        
+        if bulk:
+            logger.warning("⚠️  fact_homicidios no está vacía: modo bulk omitido (carga con ON CONFLICT)")
+        loaded = self._load_facts_initial(workers, partition)
+        
+        # Una carga bulk anterior que falló al validar puede haber dejado FKs NOT VALID
+        FactIndexRebuild(self.dwh).validate_pending()
+        return loaded
+    
+    def _load_facts_initial(self, workers: int, partition: str, use_copy: bool = False) -> int:
+        if workers > 1:
+            return self.load_fact_homicidios_parallel(workers, partition, use_copy=use_copy)
+        return self.load_fact_homicidios_initial(use_copy=use_copy)
+    
     def load_incremental(self) -> Dict[str, int]:
         """
         Carga incremental del DWH.
@@ -513,18 +1090,32 @@ class DWHETLLoader:
         
         started_at = datetime.now()
         results = {}
+        self.dim_counts = {}
         
         try:
-            # 1. Actualizar dimensiones (por si hay nuevos valores)
-            results['dim_departamento'] = self.load_dim_departamento()
-            results['dim_municipio'] = self.load_dim_municipio()
-            results['dim_sexo'] = self.load_dim_sexo()
-            results['dim_fecha'] = self.load_dim_fecha()  # Solo agrega fechas nuevas
+            # Rango de ingest_seq de esta carga: dimensiones y hechos usan el mismo
+            seq_range = self.get_incremental_range()
+            
+            # 1. Actualizar dimensiones: catálogos DIVIPOLA completos; sexo
+            #    y fecha solo a partir de las filas nuevas
+            steps = self._dimension_steps(seq_range) + [
+                # 2. Reintentar rechazos (las dimensiones pueden traer sus
+                #    llaves) y cargar hechos incrementales
+                Step('fact_rejects', self.reprocess_rejects, DIMENSION_STEPS),
+                Step(
+                    'fact_homicidios',
+                    lambda: self.load_fact_homicidios_incremental(seq_range=seq_range),
+                    DIMENSION_STEPS
+                ),
+                
+                # 3. Sumar los hechos nuevos a las tablas agregadas y al panel diario
+                Step('agg_homicidios', lambda: sum(self.aggregates.refresh().values()), FACT_STEPS),
+                Step('agg_diario_municipio', self.daily_panel.refresh, FACT_STEPS),
+            ]
             
-            # 2. Cargar hechos incrementales
-            results['fact_homicidios'] = self.load_fact_homicidios_incremental()
+            self._run_steps('incremental_load', steps, results)
             
-            # 3. Log de auditoría
+            # 4. Log de auditoría
             self._log_etl_process('incremental_load', results, started_at, 'success')
             
             logger.info("=" * 70)
@@ -539,6 +1130,145 @@ class DWHETLLoader:
             self._log_etl_process('incremental_load', results, started_at, 'failed', str(e))
             raise
     
+    def rebuild(self, workers: int = 1, partition: str = 'year') -> Dict[str, int]:
+        """
+        Reconstrucción completa blue/green del DWH.
+        
+        Ejecuta la carga inicial en modo bulk sobre copias vacías de las
+        tablas en un esquema sombra (ver ShadowRebuild), crea sus índices y
+        llaves foráneas, y las intercambia con las vivas en una transacción.
+        Hasta el intercambio los dashboards leen las tablas anteriores; si
+        algo falla antes, quedan intactas y el esquema sombra queda para
+        revisión (la siguiente reconstrucción lo reemplaza).
+        
+        Args:
+            workers: Procesos para la tabla de hechos (1 = secuencial)
+            partition: Granularidad de las particiones si workers > 1 ('year' o 'month')
+        
+        Returns:
+            Diccionario con conteo de registros por tabla
+        """
+        logger.info("=" * 70)
+        logger.info("RECONSTRUCCIÓN COMPLETA (BLUE/GREEN) DEL DATA WAREHOUSE")
+        logger.info("=" * 70)
+        
+        started_at = datetime.now()
+        results = {}
+        
+        shadow = ShadowRebuild(self.dwh, parallel=max(workers, 4))
+        # Mismo tipo de loader (Python o FDW) sobre el esquema sombra
+        shadow_loader = type(self)(schema=shadow.schema)
+        
+        steps = shadow_loader._initial_steps(workers, partition, bulk=True)
+        steps += [
+            # Un reintento no puede repetir CREATE INDEX sobre índices ya creados
+            Step('shadow_indexes', shadow.finalize, tuple(step.name for step in steps), retries=0),
+            Step('swap', shadow.swap, ('shadow_indexes',)),
+        ]
+        
+        try:
+            shadow.prepare()
+            shadow_loader._run_steps('rebuild', steps, results)
+            
+            shadow_loader._log_etl_process('rebuild', results, started_at, 'success')
+            
+            logger.info("=" * 70)
+            logger.info("✅ RECONSTRUCCIÓN COMPLETADA")
+            logger.info(f"Tiempo total: {datetime.now() - started_at}")
+            logger.info("=" * 70)
+            
+            return results
+        
+        except Exception as e:
+            logger.error(f"❌ Error en reconstrucción (tablas vivas sin cambios): {e}")
+            shadow_loader._log_etl_process('rebuild', results, started_at, 'failed', str(e))
+            raise
+        
+        finally:
+            shadow_loader.close_async_dimensions()
+            shadow_loader.dwh.close()
+    
+    def _run_steps(self, process_name: str, steps: List[Step], results: Dict[str, int]):
+        """
+        Ejecutar los pasos como DAG y registrar cada uno en etl_log.
+        
+        Los pasos independientes corren en paralelo (ETL_STEP_WORKERS); un
+        paso que falla se reintenta solo (ETL_STEP_RETRIES) sin repetir los
+        completados, y los que dependen de él se omiten. Antes de lanzarlos
+        se llama a _prepare_steps.
+        
+        Args:
+            process_name: Proceso padre ('initial_load', 'incremental_load')
+            steps: Pasos del DAG
+            results: Diccionario a completar con los registros de cada tabla
+        
+        Raises:
+            RuntimeError: Si algún paso falló o se omitió
+        """
+        self._prepare_steps()
+        
+        dag = StepDAG(
+            steps,
+            max_workers=settings.etl_step_workers,
+            retries=settings.etl_step_retries,
+            retry_delay=settings.etl_step_retry_delay,
+            on_step_done=lambda step_result: self._log_etl_step(process_name, step_result)
+        )
+        
+        for name, step_result in dag.run().items():
+            if step_result.status == SUCCESS and name not in UNCOUNTED_STEPS:
+                results[name] = step_result.records
+        
+        if dag.failed:
+            raise RuntimeError(
+                "Pasos sin completar: " + "; ".join(
+                    f"{name} ({r.status}: {r.error})" for name, r in dag.failed.items()
+                )
+            )
+    
+    def _prepare_steps(self):
+        """
+        Preparar lo que comparten los pasos antes de que corran en paralelo.
+        
+        No hace nada aquí; las subclases lo redefinen (DWHFdwLoader adjunta
+        el Data Lake una sola vez en vez de hacerlo desde cada paso).
+        """
+    
+    def _log_etl_step(self, process_name: str, step_result: StepResult):
+        """Registrar un paso del DAG en etl_log como '<proceso>:<paso>'."""
+        started_at = datetime.fromtimestamp(step_result.started_at)
+        counts = self.dim_counts.get(step_result.name)
+        
+        error_message = step_result.error
+        if step_result.status == SUCCESS and step_result.attempts > 1:
+            error_message = f"Completado en el intento {step_result.attempts}; último error: {step_result.error}"
+        elif step_result.status == SKIPPED:
+            error_message = f"Omitido ({step_result.error})"
+        
+        try:
+            self.dwh.execute_query(
+                """
+                INSERT INTO etl_log (
+                    process_name, records_processed, records_inserted, records_updated,
+                    records_unchanged, started_at, completed_at, status, error_message
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                params=(
+                    f"{process_name}:{step_result.name}",
+                    step_result.records + (counts.unchanged if counts else 0),
+                    counts.inserted if counts else step_result.records,
+                    counts.updated if counts else 0,
+                    counts.unchanged if counts else 0,
+                    started_at,
+                    started_at + timedelta(seconds=step_result.duration),
+                    SUCCESS if step_result.status == SUCCESS else 'failed',
+                    error_message
+                )
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo registrar el paso {step_result.name} en etl_log: {e}")
+    
     def _log_etl_process(
         self,
         process_name: str,
@@ -547,32 +1277,72 @@ class DWHETLLoader:
         status: str,
         error_message: Optional[str] = None
     ):
-        """Registrar proceso ETL en tabla de auditoría."""
-        total_processed = sum(results.values())
+        """
+        Registrar proceso ETL en tabla de auditoría.
+        
+        Los conteos de results son filas escritas; las dimensiones aportan
+        además su desglose (dim_counts) en actualizados y sin cambios.
+        """
+        total_written = sum(results.values())
+        records_updated = sum(c.updated for c in self.dim_counts.values())
+        records_unchanged = sum(c.unchanged for c in self.dim_counts.values())
+        records_failed = self._count_rejects_since(started_at)
         
         query = """
             INSERT INTO etl_log (
                 process_name, records_processed, records_inserted, records_updated,
-                started_at, status, error_message
+                records_unchanged, records_failed, started_at, status, error_message
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         
         self.dwh.execute_query(
             query,
             params=(
                 process_name,
-                total_processed,
-                total_processed,  # Para simplificar, asumimos todos insertados
-                0,
+                total_written + records_unchanged,
+                total_written - records_updated,
+                records_updated,
+                records_unchanged,
+                records_failed,
                 started_at,
                 status,
                 error_message
             )
         )
     
+    def close_async_dimensions(self):
+        """Cerrar los pools y el event loop de AsyncDimensionLoader, si se usó."""
+        if self._async_dimensions is not None:
+            self._async_dimensions.close()
+            self._async_dimensions = None
+    
     def close(self):
         """Cerrar todas las conexiones."""
+        self.close_async_dimensions()
         self.datalake.close_all_connections()
         self.dwh.close()
         logger.info("Conexiones cerradas")
+
+
+def _load_fact_partition(
+    desde: date,
+    hasta: date,
+    batch_size: int,
+    max_seq: int,
+    use_copy: bool,
+    schema: Optional[str]
+) -> int:
+    """
+    Worker de load_fact_homicidios_parallel (se ejecuta en un proceso hijo).
+    
+    Debe ser una función de módulo para que el proceso hijo pueda importarla.
+    """
+    # Pools propios del proceso: nunca reutilizar conexiones de otro proceso
+    pool_manager.reset()
+    
+    loader = DWHETLLoader(schema=schema)
+    try:
+        return loader.load_fact_homicidios_initial(batch_size, desde, hasta, max_seq, use_copy)
+    finally:
+        loader.close()
@@ -0,0 +1,461 @@
+"""
+Data Warehouse ETL Loader set-based (postgres_fdw).
+
+El Data Lake se adjunta al DWH como tablas foráneas (esquema `datalake`) y
+cada dimensión y la tabla de hechos se cargan con un único
+INSERT ... SELECT ... JOIN dim_* ejecutado dentro de PostgreSQL: ninguna
+fila pasa por Python.
+
+Requiere la extensión postgres_fdw en el DWH (ver init-scripts/02) y que el
+servidor del DWH pueda conectarse al del Data Lake (en docker-compose,
+datalake:5432 dentro de la red interna).
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from src.config.settings import settings
+from src.data_warehouse.dwh_etl_loader import (
+    DIM_FECHA_ATTRIBUTES,
+    DIM_FECHA_COLUMNS,
+    REJECT_FECHA,
+    REJECT_SEXO,
+    DWHETLLoader,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FDW_SERVER = "datalake_server"
+FDW_SCHEMA = "datalake"
+FDW_TABLES = ("raw_homicidios", "raw_divipola_departamentos", "raw_divipola_municipios")
+
+
+class DWHFdwLoader(DWHETLLoader):
+    """
+    Cargador ETL que transforma dentro del DWH vía postgres_fdw.
+
+    Reutiliza la orquestación de DWHETLLoader (load_all_initial,
+    load_incremental, rebuild, etl_log); solo cambia cómo se carga cada tabla.
+    """
+
+    # Las dimensiones son INSERT ... SELECT dentro del DWH: no pasan por Python
+    ASYNC_DIMENSIONS = False
+
+    def __init__(self, schema: Optional[str] = None):
+        """Inicializar loader (schema: ver DWHETLLoader)."""
+        super().__init__(schema)
+        self._attached = False
+        self._attach_lock = threading.Lock()
+
+    # ========================================================================
+    # FOREIGN DATA WRAPPER
+    # ========================================================================
+
+    def attach_datalake(self):
+        """
+        Crear (o recrear) el servidor foráneo y las tablas del Data Lake en el DWH.
+
+        Se recrea en cada ejecución para tomar cambios de configuración o de
+        esquema del Data Lake; no tiene costo relevante.
+        """
+        params = {
+            'host': settings.fdw_datalake_host,
+            'port': str(settings.fdw_datalake_port),
+            'dbname': settings.fdw_datalake_db or settings.db_name,
+            'user': settings.fdw_datalake_user or settings.db_user,
+            'password': settings.fdw_datalake_password or settings.db_password,
+        }
+
+        logger.info(
+            f"Adjuntando Data Lake vía postgres_fdw: "
+            f"{params['host']}:{params['port']}/{params['dbname']}"
+        )
+
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS postgres_fdw")
+            cursor.execute(f"DROP SERVER IF EXISTS {FDW_SERVER} CASCADE")
+            cursor.execute(
+                f"""
+                CREATE SERVER {FDW_SERVER}
+                FOREIGN DATA WRAPPER postgres_fdw
+                OPTIONS (host %(host)s, port %(port)s, dbname %(dbname)s, fetch_size '10000')
+                """,
+                params
+            )
+            cursor.execute(
+                f"""
+                CREATE USER MAPPING FOR CURRENT_USER
+                SERVER {FDW_SERVER}
+                OPTIONS (user %(user)s, password %(password)s)
+                """,
+                params
+            )
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {FDW_SCHEMA}")
+            cursor.execute(
+                f"""
+                IMPORT FOREIGN SCHEMA public
+                LIMIT TO ({', '.join(FDW_TABLES)})
+                FROM SERVER {FDW_SERVER} INTO {FDW_SCHEMA}
+                """
+            )
+
+        self._attached = True
+        logger.info(f"✅ Tablas foráneas disponibles en el esquema {FDW_SCHEMA}")
+
+    def _ensure_attached(self):
+        # Los pasos del DAG corren en hilos: DROP/CREATE SERVER e IMPORT
+        # FOREIGN SCHEMA en paralelo chocan entre sí
+        with self._attach_lock:
+            if not self._attached:
+                self.attach_datalake()
+
+    def _execute_count(self, query: str, params: tuple = None) -> int:
+        """Ejecutar una sentencia en el DWH y retornar las filas afectadas."""
+        self._ensure_attached()
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.rowcount
+
+    # ========================================================================
+    # DIMENSIONES
+    # ========================================================================
+
+    def _upsert_dimension_sql(self, table: str, query: str, params: tuple = None) -> int:
+        """
+        Ejecutar un upsert cuyo SELECT final retorna (filas origen, insertadas, actualizadas).
+
+        Returns:
+            Número de registros escritos (insertados + actualizados)
+        """
+        self._ensure_attached()
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(query, params)
+            total, inserted, updated = cursor.fetchone()
+        return self._record_dim_counts(table, inserted, updated, total - inserted - updated)
+
+    def load_dim_departamento(self) -> int:
+        """
+        Cargar dimensión de departamentos (INSERT ... SELECT desde el Data Lake).
+
+        Solo escribe los departamentos nuevos o con algún atributo distinto.
+
+        Returns:
+            Número de registros insertados o actualizados
+        """
+        logger.info("Cargando dim_departamento (fdw)...")
+
+        return self._upsert_dimension_sql('dim_departamento', f"""
+            WITH origen AS (
+                SELECT DISTINCT ON (cod_dpto)
+                    cod_dpto, nom_dpto, latitud, longitud
+                FROM {FDW_SCHEMA}.raw_divipola_departamentos
+                WHERE cod_dpto IS NOT NULL
+                ORDER BY cod_dpto
+            ),
+            upsert AS (
+                INSERT INTO dim_departamento (cod_depto, nom_depto, latitud, longitud)
+                SELECT * FROM origen
+                ON CONFLICT (cod_depto) DO UPDATE SET
+                    nom_depto = EXCLUDED.nom_depto,
+                    latitud = EXCLUDED.latitud,
+                    longitud = EXCLUDED.longitud
+                WHERE (dim_departamento.nom_depto, dim_departamento.latitud, dim_departamento.longitud)
+                    IS DISTINCT FROM (EXCLUDED.nom_depto, EXCLUDED.latitud, EXCLUDED.longitud)
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT COUNT(*) FROM origen),
+                COUNT(*) FILTER (WHERE inserted),
+                COUNT(*) FILTER (WHERE NOT inserted)
+            FROM upsert
+        """)
+
+    def load_dim_municipio(self) -> int:
+        """
+        Cargar dimensión de municipios (INSERT ... SELECT desde el Data Lake).
+
+        Solo escribe los municipios nuevos o con algún atributo distinto.
+
+        Returns:
+            Número de registros insertados o actualizados
+        """
+        logger.info("Cargando dim_municipio (fdw)...")
+
+        return self._upsert_dimension_sql('dim_municipio', f"""
+            WITH origen AS (
+                SELECT DISTINCT ON (cod_mpio)
+                    cod_mpio, cod_dpto, nom_mpio, tipo, latitud, longitud
+                FROM {FDW_SCHEMA}.raw_divipola_municipios
+                WHERE cod_mpio IS NOT NULL
+                ORDER BY cod_mpio
+            ),
+            upsert AS (
+                INSERT INTO dim_municipio (cod_mpio, cod_depto, nom_mpio, tipo, latitud, longitud)
+                SELECT * FROM origen
+                ON CONFLICT (cod_mpio) DO UPDATE SET
+                    cod_depto = EXCLUDED.cod_depto,
+                    nom_mpio = EXCLUDED.nom_mpio,
+                    tipo = EXCLUDED.tipo,
+                    latitud = EXCLUDED.latitud,
+                    longitud = EXCLUDED.longitud
+                WHERE (dim_municipio.cod_depto, dim_municipio.nom_mpio, dim_municipio.tipo,
+                       dim_municipio.latitud, dim_municipio.longitud)
+                    IS DISTINCT FROM (EXCLUDED.cod_depto, EXCLUDED.nom_mpio, EXCLUDED.tipo,
+                                      EXCLUDED.latitud, EXCLUDED.longitud)
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT COUNT(*) FROM origen),
+                COUNT(*) FILTER (WHERE inserted),
+                COUNT(*) FILTER (WHERE NOT inserted)
+            FROM upsert
+        """)
+
+    def load_dim_sexo(self, seq_range: Optional[Tuple[int, int]] = None) -> int:
+        """
+        Cargar dimensión de sexo (valores distintos de raw_homicidios).
+
+        Args:
+            seq_range: Rango (desde, hasta] de ingest_seq a revisar (carga
+                incremental); None recorre raw_homicidios completa
+
+        Returns:
+            Número de registros nuevos
+        """
+        logger.info("Cargando dim_sexo (fdw)...")
+
+        rango = "AND ingest_seq > %s AND ingest_seq <= %s" if seq_range else ""
+
+        return self._upsert_dimension_sql('dim_sexo', f"""
+            WITH origen AS (
+                SELECT DISTINCT sexo
+                FROM {FDW_SCHEMA}.raw_homicidios
+                WHERE sexo IS NOT NULL {rango}
+            ),
+            nuevos AS (
+                INSERT INTO dim_sexo (sexo)
+                SELECT sexo FROM origen
+                ON CONFLICT (sexo) DO NOTHING
+                RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM origen), COUNT(*), 0
+            FROM nuevos
+        """, seq_range)
+
+    def load_dim_fecha(self, start_date=None, end_date=None, seq_range: Optional[Tuple[int, int]] = None) -> int:
+        """
+        Cargar dimensión de fechas con generate_series.
+
+        Args:
+            start_date: Fecha inicial (default: fecha mínima en homicidios)
+            end_date: Fecha final (default: fecha máxima en homicidios)
+            seq_range: Rango (desde, hasta] de ingest_seq (carga incremental):
+                el rango de fechas sale solo de esas filas, unido al de dim_fecha
+
+        Returns:
+            Número de fechas nuevas
+        """
+        logger.info("Cargando dim_fecha (fdw)...")
+
+        if seq_range and not (start_date and end_date):
+            # Sin filas nuevas el rango es el de dim_fecha y no se inserta nada
+            rango = f"""
+                SELECT
+                    LEAST(MIN(h.fecha_hecho), (SELECT MIN(fecha) FROM dim_fecha)) AS desde,
+                    GREATEST(MAX(h.fecha_hecho), (SELECT MAX(fecha) FROM dim_fecha)) AS hasta
+                FROM {FDW_SCHEMA}.raw_homicidios h
+                WHERE h.ingest_seq > %s AND h.ingest_seq <= %s
+            """
+            params = seq_range
+        else:
+            rango = f"""
+                SELECT
+                    COALESCE(%s::date, MIN(fecha_hecho), DATE '2000-01-01') AS desde,
+                    COALESCE(%s::date, MAX(fecha_hecho), CURRENT_DATE) AS hasta
+                FROM {FDW_SCHEMA}.raw_homicidios
+            """
+            params = (start_date, end_date)
+
+        return self._upsert_dimension_sql('dim_fecha', f"""
+            WITH rango AS ({rango}),
+            nuevas AS (
+                INSERT INTO dim_fecha ({DIM_FECHA_COLUMNS})
+                SELECT {DIM_FECHA_ATTRIBUTES}
+                FROM rango, generate_series(rango.desde, rango.hasta, INTERVAL '1 day') AS d
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM dim_fecha f WHERE f.fecha = d::date
+                )
+                ON CONFLICT (fecha) DO NOTHING
+                RETURNING 1
+            )
+            SELECT COALESCE(GREATEST(hasta - desde + 1, 0), 0), (SELECT COUNT(*) FROM nuevas), 0
+            FROM rango
+        """, params)
+
+    # ========================================================================
+    # TABLA DE HECHOS
+    # ========================================================================
+
+    _FACT_INSERT = f"""
+        INSERT INTO fact_homicidios (
+            fecha_key, cod_depto, cod_mpio, sexo_key, zona, cantidad, source_id
+        )
+        SELECT
+            f.fecha_key,
+            h.cod_depto,
+            h.cod_muni,
+            s.sexo_key,
+            h.zona,
+            COALESCE(h.cantidad, 1),
+            h.ingest_seq
+        FROM {FDW_SCHEMA}.raw_homicidios h
+        JOIN dim_fecha f ON f.fecha = h.fecha_hecho
+        JOIN dim_sexo s ON s.sexo = h.sexo
+        {{where}}
+        ON CONFLICT (source_id) DO NOTHING
+    """
+
+    # Filas del mismo rango sin llave de fecha o sexo (las que _FACT_INSERT descarta)
+    _REJECTS_INSERT = f"""
+        INSERT INTO fact_rejects (source_id, reason, valor, rejected_at)
+        SELECT
+            h.ingest_seq,
+            CASE WHEN f.fecha_key IS NULL THEN '{REJECT_FECHA}' ELSE '{REJECT_SEXO}' END,
+            CASE WHEN f.fecha_key IS NULL THEN h.fecha_hecho::text ELSE h.sexo END,
+            %s
+        FROM {FDW_SCHEMA}.raw_homicidios h
+        LEFT JOIN dim_fecha f ON f.fecha = h.fecha_hecho
+        LEFT JOIN dim_sexo s ON s.sexo = h.sexo
+        {{where}} AND (f.fecha_key IS NULL OR s.sexo_key IS NULL)
+        ON CONFLICT (source_id) DO UPDATE SET
+            reason = EXCLUDED.reason,
+            valor = EXCLUDED.valor,
+            attempts = fact_rejects.attempts + 1,
+            rejected_at = EXCLUDED.rejected_at
+    """
+
+    def _load_facts(self, where: str, params: tuple) -> int:
+        """Cargar los hechos de un rango y registrar sus rechazos en fact_rejects."""
+        loaded = self._execute_count(self._FACT_INSERT.format(where=where), params)
+        rejected = self._execute_count(self._REJECTS_INSERT.format(where=where), (datetime.now(), *params))
+
+        if rejected:
+            logger.warning(f"⚠️  {rejected} registros rechazados → fact_rejects")
+        return loaded
+
+    def load_fact_homicidios_initial(
+        self,
+        batch_size: int = 5000,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        max_seq: Optional[int] = None,
+        use_copy: bool = False,
+        sin_fecha: bool = False
+    ) -> int:
+        """
+        Carga inicial de fact_homicidios en una sola sentencia.
+
+        Misma firma que DWHETLLoader.load_fact_homicidios_initial: el rango
+        (desde/hasta/sin_fecha/max_seq) se aplica en el WHERE del
+        INSERT ... SELECT. Sin partición guarda max_seq como checkpoint.
+
+        Args:
+            batch_size: Ignorado (se mantiene por compatibilidad de firma)
+            desde: Cargar solo fecha_hecho >= desde (opcional)
+            hasta: Cargar solo fecha_hecho < hasta (opcional)
+            max_seq: Cargar solo ingest_seq <= max_seq (default: posición actual del Data Lake)
+            use_copy: Ignorado (INSERT ... SELECT ya es una sola sentencia)
+            sin_fecha: Cargar solo las filas con fecha_hecho NULL (todas van a fact_rejects)
+
+        Returns:
+            Número de registros cargados
+        """
+        if sin_fecha:
+            rango = " [sin fecha]"
+        else:
+            rango = f" [{desde} → {hasta})" if desde or hasta else ""
+        logger.info(f"🔄 Carga inicial de fact_homicidios (fdw){rango}...")
+
+        if max_seq is None:
+            max_seq = self.get_datalake_position()
+
+        conditions = ["h.ingest_seq <= %s"]
+        params = [max_seq]
+        if sin_fecha:
+            conditions.append("h.fecha_hecho IS NULL")
+        if desde:
+            conditions.append("h.fecha_hecho >= %s")
+            params.append(desde)
+        if hasta:
+            conditions.append("h.fecha_hecho < %s")
+            params.append(hasta)
+
+        loaded = self._load_facts(f"WHERE {' AND '.join(conditions)}", tuple(params))
+        if not rango:
+            self.save_checkpoint(max_seq)
+
+        logger.info(f"✅ fact_homicidios{rango}: {loaded} registros cargados")
+        return loaded
+
+    def load_fact_homicidios_parallel(
+        self,
+        workers: int,
+        partition: str = 'year',
+        batch_size: int = 5000,
+        use_copy: bool = False
+    ) -> int:
+        """
+        No soportado: los workers de la carga paralela usan DWHETLLoader y
+        perderían el modo set-based. La carga fdw es una sola sentencia.
+
+        Raises:
+            ValueError: Siempre
+        """
+        raise ValueError("La carga paralela no aplica a DWHFdwLoader (la carga es una sola sentencia)")
+
+    def load_fact_homicidios_incremental(
+        self,
+        batch_size: int = 5000,
+        seq_range: Optional[Tuple[int, int]] = None
+    ) -> int:
+        """
+        Carga incremental de fact_homicidios (rango de ingest_seq posterior al checkpoint).
+
+        Args:
+            batch_size: Ignorado (se mantiene por compatibilidad de firma)
+            seq_range: Rango (desde, hasta] de ingest_seq (default: get_incremental_range())
+
+        Returns:
+            Número de registros cargados
+        """
+        logger.info("🔄 Carga incremental de fact_homicidios (fdw)...")
+
+        desde_seq, hasta_seq = seq_range or self.get_incremental_range()
+
+        if hasta_seq <= desde_seq:
+            logger.info("✅ No hay registros nuevos para cargar")
+            return 0
+
+        # Parámetros literales: postgres_fdw envía el rango al Data Lake
+        loaded = self._load_facts("WHERE h.ingest_seq > %s AND h.ingest_seq <= %s", (desde_seq, hasta_seq))
+        self.save_checkpoint(hasta_seq)
+
+        logger.info(f"✅ fact_homicidios incremental: {loaded} registros cargados")
+        return loaded
+
+    # ========================================================================
+    # ORQUESTACIÓN
+    # ========================================================================
+
+    def _load_facts_initial(self, workers: int, partition: str, use_copy: bool = False) -> int:
+        # workers/partition no aplican: un solo INSERT ... SELECT dentro del DWH
+        if workers > 1:
+            logger.warning(f"⚠️  --workers {workers} ignorado en modo fdw (la carga es una sola sentencia)")
+        return self.load_fact_homicidios_initial(use_copy=use_copy)
+
+    def _prepare_steps(self):
+        """Adjuntar el Data Lake una vez por ejecución, antes de lanzar los pasos."""
+        with self._attach_lock:
+            self.attach_datalake()
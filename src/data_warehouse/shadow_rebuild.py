@@ -0,0 +1,293 @@
+"""
+Reconstrucción blue/green del modelo estrella.
+
+Recargar el DWH sobre las tablas vivas deja a los dashboards leyendo tablas a
+medio cargar. En su lugar, ShadowRebuild crea copias vacías de las tablas del
+modelo en un esquema sombra, con solo las constraints que la carga necesita
+(PRIMARY KEY / UNIQUE para ON CONFLICT, CHECK) y secuencias propias. El ETL
+las llena en modo bulk con un search_path que antepone el esquema sombra (ver
+DWHConnection). Al final se crean los índices secundarios y las llaves
+foráneas, se ejecuta ANALYZE y las tablas se intercambian con las vivas en una
+sola transacción (ALTER TABLE ... SET SCHEMA, que conserva nombres de
+índices, constraints y secuencias). Las vistas que leen esas tablas se
+recrean en la misma transacción. Las lecturas solo esperan los locks del
+intercambio.
+
+Example:
+    shadow = ShadowRebuild(dwh)
+    shadow.prepare()
+    DWHETLLoader(schema=shadow.schema).load_all_initial(bulk=True)
+    shadow.finalize()
+    shadow.swap()
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from src.data_ingestion.db_connection import DatabaseConnection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LIVE_SCHEMA = "public"
+SHADOW_SCHEMA = "dwh_shadow"
+# Tablas reemplazadas: se eliminan después del intercambio
+RETIRED_SCHEMA = "dwh_retired"
+
+# Tablas del modelo que se reconstruyen (etl_log queda en vivo). Incluye los
+# checkpoints: su posición solo vale para los hechos con los que se cargaron
+REBUILD_TABLES = (
+    "dim_departamento",
+    "dim_municipio",
+    "dim_sexo",
+    "dim_fecha",
+    "fact_homicidios",
+    "fact_rejects",
+    "etl_checkpoint",
+    "agg_homicidios_por_mes",
+    "agg_homicidios_por_departamento",
+    "agg_homicidios_por_municipio",
+    "agg_homicidios_por_sexo",
+    "agg_checkpoint",
+    "agg_diario_municipio",
+)
+
+# Tablas cuyo contenido se copia de las vivas (semillas que el ETL no recrea)
+SEED_TABLES = ("dim_sexo",)
+
+# Espera máxima por los locks del intercambio (no encolar lecturas detrás)
+SWAP_LOCK_TIMEOUT = "30s"
+
+
+class ShadowRebuild:
+    """Construye las tablas del modelo en un esquema sombra y las intercambia con las vivas."""
+
+    def __init__(
+        self,
+        dwh: DatabaseConnection,
+        schema: str = SHADOW_SCHEMA,
+        tables: Tuple[str, ...] = REBUILD_TABLES,
+        parallel: int = 4
+    ):
+        """
+        Inicializar reconstrucción.
+
+        Args:
+            dwh: Conexión al Data Warehouse (esquema vivo)
+            schema: Esquema sombra
+            tables: Tablas a reconstruir
+            parallel: Índices a construir en simultáneo (limitado por el pool)
+        """
+        self.dwh = dwh
+        self.schema = schema
+        self.tables = tables
+        self.parallel = parallel
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, step: str, func, *args):
+        inicio = time.perf_counter()
+        result = func(*args)
+        self.timings[step] = time.perf_counter() - inicio
+        logger.info(f"⏱️  {step}: {self.timings[step]:.2f}s")
+        return result
+
+    def _constraints(self, table: str, types: str) -> List[Tuple[str, str]]:
+        """Constraints (nombre, definición) de la tabla viva de los tipos pedidos."""
+        return self.dwh.execute_query(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = ANY(%s)
+            ORDER BY conname
+            """,
+            params=(f"{LIVE_SCHEMA}.{table}", list(types)),
+            fetch=True
+        )
+
+    def _indexes(self, table: str) -> List[Tuple[str, str]]:
+        """Índices secundarios de la tabla viva, redefinidos sobre la tabla sombra."""
+        rows = self.dwh.execute_query(
+            """
+            SELECT i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+            ORDER BY i.relname
+            """,
+            params=(f"{LIVE_SCHEMA}.{table}",),
+            fetch=True
+        )
+        # pg_get_indexdef califica siempre la tabla: "... ON public.tabla USING ..."
+        return [
+            (name, definition.replace(f" ON {LIVE_SCHEMA}.{table} ", f" ON {self.schema}.{table} ", 1))
+            for name, definition in rows
+        ]
+
+    def _create_table(self, cursor, table: str):
+        shadow_table = f"{self.schema}.{table}"
+        cursor.execute(
+            f"CREATE TABLE {shadow_table} "
+            f"(LIKE {LIVE_SCHEMA}.{table} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)"
+        )
+
+        # LIKE copia el DEFAULT nextval() de la secuencia viva: usar una propia
+        # con el mismo nombre, que viaja con la tabla en el intercambio
+        cursor.execute(
+            """
+            SELECT a.attname, format_type(a.atttypid, NULL), pg_get_serial_sequence(%s, a.attname)
+            FROM pg_attribute a
+            WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+            """,
+            (f"{LIVE_SCHEMA}.{table}", f"{LIVE_SCHEMA}.{table}")
+        )
+        sequences = [
+            (column, column_type, f"{self.schema}.{sequence.split('.')[-1]}")
+            for column, column_type, sequence in cursor.fetchall()
+            if sequence is not None
+        ]
+        for column, column_type, sequence in sequences:
+            cursor.execute(f"CREATE SEQUENCE {sequence} AS {column_type} OWNED BY {shadow_table}.{column}")
+            cursor.execute(f"ALTER TABLE {shadow_table} ALTER COLUMN {column} SET DEFAULT nextval('{sequence}')")
+
+        if table in SEED_TABLES:
+            cursor.execute(f"INSERT INTO {shadow_table} SELECT * FROM {LIVE_SCHEMA}.{table}")
+            for column, _, sequence in sequences:
+                cursor.execute(
+                    f"SELECT setval('{sequence}', COALESCE(MAX({column}), 0) + 1, false) FROM {shadow_table}"
+                )
+
+        # Llaves primarias, UNIQUE (árbitros de ON CONFLICT) y CHECK
+        for name, definition in self._constraints(table, "puc"):
+            cursor.execute(f'ALTER TABLE {shadow_table} ADD CONSTRAINT "{name}" {definition}')
+
+        cursor.execute(
+            f"SELECT obj_description('{LIVE_SCHEMA}.{table}'::regclass, 'pg_class')"
+        )
+        comment = cursor.fetchone()[0]
+        if comment:
+            cursor.execute(f"COMMENT ON TABLE {shadow_table} IS %s", (comment,))
+
+    def prepare(self):
+        """Crear el esquema sombra con copias vacías de las tablas (sin índices secundarios ni FKs)."""
+        with self.dwh.get_cursor() as cursor:
+            # Un esquema sombra previo es de una reconstrucción fallida
+            cursor.execute(f"DROP SCHEMA IF EXISTS {self.schema} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {self.schema}")
+            for table in self.tables:
+                self._create_table(cursor, table)
+
+        logger.info(f"✅ Esquema sombra {self.schema}: {len(self.tables)} tablas creadas")
+
+    def _create_index(self, definition: str) -> float:
+        inicio = time.perf_counter()
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(definition)
+        return time.perf_counter() - inicio
+
+    def _create_indexes(self) -> int:
+        indexes = [index for table in self.tables for index in self._indexes(table)]
+        with ThreadPoolExecutor(max_workers=max(1, self.parallel)) as executor:
+            futures = {
+                executor.submit(self._create_index, definition): name
+                for name, definition in indexes
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                self.timings[f"index {name}"] = future.result()
+                logger.info(f"⏱️  index {name}: {self.timings[f'index {name}']:.2f}s")
+        return len(indexes)
+
+    def _add_foreign_keys(self) -> int:
+        foreign_keys = [
+            (table, name, definition)
+            for table in self.tables
+            for name, definition in self._constraints(table, "f")
+        ]
+        with self.dwh.get_cursor() as cursor:
+            # Las definiciones nombran las tablas sin esquema: resolver a las sombra
+            cursor.execute(f"SET LOCAL search_path TO {self.schema}, {LIVE_SCHEMA}")
+            for table, name, definition in foreign_keys:
+                cursor.execute(f'ALTER TABLE {self.schema}.{table} ADD CONSTRAINT "{name}" {definition}')
+        return len(foreign_keys)
+
+    def _analyze(self):
+        for table in self.tables:
+            self.dwh.execute_query(f"ANALYZE {self.schema}.{table}")
+
+    def finalize(self) -> int:
+        """
+        Crear índices secundarios (en paralelo) y FKs de las tablas sombra y
+        actualizar estadísticas. Ejecutar después de cargarlas.
+
+        Returns:
+            Número de índices y llaves foráneas creados
+        """
+        created = self._timed("indexes (paralelo)", self._create_indexes)
+        created += self._timed("foreign keys", self._add_foreign_keys)
+        self._timed("analyze", self._analyze)
+        return created
+
+    def _dependent_views(self, cursor) -> List[Tuple[str, str]]:
+        cursor.execute(
+            """
+            SELECT DISTINCT v.oid, v.oid::regclass::text, pg_get_viewdef(v.oid)
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            JOIN pg_class v ON v.oid = r.ev_class
+            WHERE d.classid = 'pg_rewrite'::regclass
+              AND d.refobjid = ANY(%s::regclass[])
+              AND v.relkind = 'v'
+            ORDER BY v.oid
+            """,
+            ([f"{LIVE_SCHEMA}.{table}" for table in self.tables],)
+        )
+        return [(name, definition) for _, name, definition in cursor.fetchall()]
+
+    def _swap(self):
+        with self.dwh.get_cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+            cursor.execute(
+                f"LOCK TABLE {', '.join(f'{LIVE_SCHEMA}.{table}' for table in self.tables)} "
+                f"IN ACCESS EXCLUSIVE MODE"
+            )
+
+            # Definiciones tomadas antes de mover las tablas (nombres sin esquema)
+            views = self._dependent_views(cursor)
+
+            cursor.execute(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {RETIRED_SCHEMA}")
+            for table in self.tables:
+                cursor.execute(f"ALTER TABLE {LIVE_SCHEMA}.{table} SET SCHEMA {RETIRED_SCHEMA}")
+            for table in self.tables:
+                cursor.execute(f"ALTER TABLE {self.schema}.{table} SET SCHEMA {LIVE_SCHEMA}")
+
+            # Las vistas apuntan a las tablas por OID: recrearlas sobre las nuevas
+            for name, definition in views:
+                cursor.execute(f"CREATE OR REPLACE VIEW {name} AS {definition}")
+
+        logger.info(f"🔁 {len(self.tables)} tablas intercambiadas, {len(views)} vistas recreadas")
+
+    def _drop_retired(self):
+        self.dwh.execute_query(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE")
+        self.dwh.execute_query(f"DROP SCHEMA IF EXISTS {self.schema}")
+
+    def swap(self):
+        """
+        Intercambiar las tablas sombra con las vivas en una sola transacción y
+        eliminar las anteriores.
+
+        Si no obtiene los locks en SWAP_LOCK_TIMEOUT la transacción se
+        revierte y las tablas vivas quedan intactas (se puede reintentar).
+        """
+        self._timed("swap", self._swap)
+
+        # El intercambio ya está confirmado: no fallar (ni reintentar) por esto
+        try:
+            self._timed("drop anteriores", self._drop_retired)
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudo eliminar {RETIRED_SCHEMA} (se reemplaza en la próxima reconstrucción): {e}")
+
+        resumen = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.timings.items())
+        logger.info(f"✅ Reconstrucción blue/green completada: {resumen}")
@@ -0,0 +1,201 @@
+"""
+Ejecución de pasos del ETL como grafo de dependencias (DAG).
+
+Cada paso declara de qué pasos depende; los que no dependen entre sí se
+ejecutan en paralelo (hilos). Un paso que falla se reintenta solo él, hasta
+`retries` veces; si se agotan los intentos, los pasos que dependen de él se
+omiten y el resto del grafo continúa. Una nueva llamada a run() ejecuta solo
+los pasos que no terminaron con éxito.
+
+Example:
+    dag = StepDAG([
+        Step('dim_departamento', cargar_departamentos),
+        Step('dim_municipio', cargar_municipios, ('dim_departamento',)),
+        Step('dim_sexo', cargar_sexos),
+        Step('fact_homicidios', cargar_hechos, ('dim_municipio', 'dim_sexo')),
+    ])
+    resultados = dag.run()
+    resultados['fact_homicidios'].status  # 'success'
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SUCCESS = 'success'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class Step(NamedTuple):
+    """Paso del ETL: función sin argumentos que retorna registros procesados."""
+
+    name: str
+    func: Callable[[], Optional[int]]
+    depends_on: Tuple[str, ...] = ()
+    retries: Optional[int] = None  # None: usar los reintentos del DAG
+
+
+class StepResult(NamedTuple):
+    """Resultado de un paso."""
+
+    name: str
+    status: str          # success, failed o skipped
+    records: int
+    attempts: int
+    started_at: float    # time.time() del primer intento
+    duration: float      # Segundos, todos los intentos
+    error: Optional[str] = None
+
+
+class StepDAG:
+    """Grafo de pasos con dependencias, ejecutado con un pool de hilos."""
+
+    def __init__(
+        self,
+        steps: Iterable[Step],
+        max_workers: int = 4,
+        retries: int = 2,
+        retry_delay: float = 5.0,
+        on_step_done: Optional[Callable[[StepResult], None]] = None
+    ):
+        """
+        Inicializar y validar el grafo.
+
+        Args:
+            steps: Pasos del grafo
+            max_workers: Pasos ejecutados en simultáneo
+            retries: Reintentos por paso tras el primer fallo
+            retry_delay: Segundos de espera antes del primer reintento (se
+                multiplica por el número de intento)
+            on_step_done: Callback con cada StepResult (hilo principal)
+
+        Raises:
+            ValueError: Si hay pasos repetidos, dependencias desconocidas o ciclos
+        """
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Paso repetido en el DAG: {step.name}")
+            self.steps[step.name] = step
+
+        self.max_workers = max(1, max_workers)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.on_step_done = on_step_done
+        self.results: Dict[str, StepResult] = {}
+
+        self._validate()
+
+    def _validate(self):
+        for step in self.steps.values():
+            unknown = [dep for dep in step.depends_on if dep not in self.steps]
+            if unknown:
+                raise ValueError(f"Paso {step.name} depende de pasos desconocidos: {unknown}")
+
+        # Orden topológico (Kahn): si quedan pasos sin ordenar hay un ciclo
+        pending = {name: set(step.depends_on) for name, step in self.steps.items()}
+        while pending:
+            ready = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                raise ValueError(f"Ciclo en el DAG entre: {sorted(pending)}")
+            for name in ready:
+                del pending[name]
+            for deps in pending.values():
+                deps.difference_update(ready)
+
+    def _run_step(self, step: Step) -> StepResult:
+        """Ejecutar un paso con reintentos (en un hilo del pool)."""
+        retries = self.retries if step.retries is None else step.retries
+        started_at = time.time()
+        inicio = time.perf_counter()
+        error = None
+
+        for attempt in range(1, retries + 2):
+            try:
+                records = step.func() or 0
+                return StepResult(
+                    step.name, SUCCESS, records, attempt, started_at,
+                    time.perf_counter() - inicio, error
+                )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if attempt > retries:
+                    break
+                logger.warning(
+                    f"⚠️  Paso {step.name} falló (intento {attempt}/{retries + 1}): {error}; reintentando"
+                )
+                time.sleep(self.retry_delay * attempt)
+
+        return StepResult(step.name, FAILED, 0, attempt, started_at, time.perf_counter() - inicio, error)
+
+    def _finish(self, result: StepResult):
+        self.results[result.name] = result
+
+        if result.status == SUCCESS:
+            logger.info(
+                f"✅ Paso {result.name}: {result.records} registros en {result.duration:.2f}s"
+                + (f" ({result.attempts} intentos)" if result.attempts > 1 else "")
+            )
+        elif result.status == FAILED:
+            logger.error(f"❌ Paso {result.name} falló tras {result.attempts} intentos: {result.error}")
+        else:
+            logger.warning(f"⏭️  Paso {result.name} omitido: {result.error}")
+
+        if self.on_step_done:
+            self.on_step_done(result)
+
+    def run(self) -> Dict[str, StepResult]:
+        """
+        Ejecutar los pasos pendientes respetando dependencias.
+
+        Los pasos que ya terminaron con éxito (de una llamada anterior) no
+        se vuelven a ejecutar.
+
+        Returns:
+            Diccionario {paso: StepResult} con todos los pasos del grafo
+        """
+        pending = {
+            name for name in self.steps
+            if name not in self.results or self.results[name].status != SUCCESS
+        }
+        for name in pending:
+            self.results.pop(name, None)
+
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="etl-step") as executor:
+            while pending or running:
+                for name in sorted(pending):
+                    deps = self.steps[name].depends_on
+                    failed = [dep for dep in deps if dep in self.results and self.results[dep].status != SUCCESS]
+
+                    if failed:
+                        pending.discard(name)
+                        self._finish(StepResult(
+                            name, SKIPPED, 0, 0, time.time(), 0.0,
+                            f"dependencia fallida: {', '.join(failed)}"
+                        ))
+                    elif all(dep in self.results for dep in deps):
+                        pending.discard(name)
+                        logger.info(f"▶️  Paso {name}")
+                        running[executor.submit(self._run_step, self.steps[name])] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    self._finish(future.result())
+
+        return dict(self.results)
+
+    @property
+    def failed(self) -> Dict[str, StepResult]:
+        """Pasos fallidos u omitidos en la última ejecución."""
+        return {name: r for name, r in self.results.items() if r.status != SUCCESS}
@@ -9,7 +9,7 @@ import logging
 import sys
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import List, Optional
 
 from src.config.settings import settings
 
@@ -53,6 +53,88 @@ class TextFormatter(logging.Formatter):
         )
 
 
+def _build_handlers(level: str, log_file: Optional[Path], log_format: str) -> List[logging.Handler]:
+    """
+    Crear handlers de consola y de archivo con rotación.
+    
+    El archivo se abre recién con el primer mensaje (delay=True).
+    """
+    # Seleccionar formatter
+    if log_format.lower() == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = TextFormatter()
+    
+    # Handler para consola (siempre en formato texto para legibilidad)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(TextFormatter())
+    handlers: List[logging.Handler] = [console_handler]
+    
+    # Handler para archivo con rotación
+    if log_file:
+        # Asegurar que el directorio existe
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10 * 1024 * 1024,  # 10 MB
+            backupCount=5,
+            encoding="utf-8",
+            delay=True
+        )
+        file_handler.setLevel(getattr(logging, level.upper()))
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    
+    return handlers
+
+
+class LazyHandler(logging.Handler):
+    """
+    Handler compartido por todos los loggers de get_logger.
+    
+    Los handlers reales (consola + archivo) se crean con el primer mensaje
+    emitido, leyendo la configuración en ese momento: importar un módulo no
+    lee settings ni abre archivos, y todos los módulos escriben por un único
+    RotatingFileHandler.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._handlers: Optional[List[logging.Handler]] = None
+        self._min_level = logging.NOTSET
+    
+    def _configure(self):
+        level = settings.log_level
+        self._min_level = getattr(logging, level.upper())
+        self._handlers = _build_handlers(level, settings.log_file, settings.log_format)
+    
+    def emit(self, record: logging.LogRecord):
+        # handle() ya tiene tomado self.lock
+        if self._handlers is None:
+            self._configure()
+        
+        if record.levelno < self._min_level:
+            return
+        
+        for handler in self._handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def flush(self):
+        for handler in self._handlers or ():
+            handler.flush()
+    
+    def close(self):
+        for handler in self._handlers or ():
+            handler.close()
+        super().close()
+
+
+_shared_handler = LazyHandler()
+
+
 def setup_logger(
     name: str,
     level: Optional[str] = None,
@@ -60,7 +142,10 @@ def setup_logger(
     log_format: Optional[str] = None
 ) -> logging.Logger:
     """
-    Configurar y retornar un logger.
+    Configurar y retornar un logger con sus propios handlers.
+    
+    Para loggers con destino propio (p. ej. slow-query log); los módulos
+    deben usar get_logger.
     
     Args:
         name: Nombre del logger
@@ -84,32 +169,8 @@ def setup_logger(
     if logger.handlers:
         return logger
     
-    # Seleccionar formatter
-    if log_format.lower() == "json":
-        formatter = JSONFormatter()
-    else:
-        formatter = TextFormatter()
-    
-    # Handler para consola (siempre en formato texto para legibilidad)
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(TextFormatter())
-    logger.addHandler(console_handler)
-    
-    # Handler para archivo con rotación
-    if log_file:
-        # Asegurar que el directorio existe
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=10 * 1024 * 1024,  # 10 MB
-            backupCount=5,
-            encoding="utf-8"
-        )
-        file_handler.setLevel(getattr(logging, level.upper()))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    for handler in _build_handlers(level, log_file, log_format):
+        logger.addHandler(handler)
     
     return logger
 
@@ -118,6 +179,9 @@ def get_logger(name: str) -> logging.Logger:
     """
     Obtener un logger ya configurado o crear uno nuevo.
     
+    No lee settings ni abre archivos: el nivel y los handlers se resuelven
+    con el primer mensaje (ver LazyHandler).
+    
     Args:
         name: Nombre del logger
     
@@ -126,9 +190,11 @@ def get_logger(name: str) -> logging.Logger:
     """
     logger = logging.getLogger(name)
     
-    # Si no tiene handlers, configurarlo
+    # Si no tiene handlers, conectarlo al handler compartido
     if not logger.handlers:
-        return setup_logger(name)
+        # El filtro por nivel lo aplica LazyHandler según settings.log_level
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(_shared_handler)
     
     return logger
 
@@ -0,0 +1,43 @@
+"""
+Medición de memoria del proceso (RSS) para reportar consumo por lote.
+"""
+
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """
+    Pico de memoria residente del proceso en MB.
+
+    Returns:
+        MB, o 0.0 si la plataforma no lo expone
+    """
+    if resource is None:
+        return 0.0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb() -> float:
+    """
+    Memoria residente actual del proceso en MB.
+
+    Lee /proc/self/statm (Linux); en otras plataformas retorna el pico.
+
+    Returns:
+        MB
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()